@@ -0,0 +1,268 @@
+# --- Headless batch runner: parse whole folders of CRIF / CIBIL reports ---
+import argparse
+import glob
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import pandas as pd
+
+from credit_parser import PARSERS, PDFSource, Report, detect, parse, report_id
+from credit_parser.cache import ReportCache
+from credit_parser.excel import write_workbook
+from credit_parser.incremental import BlockStore
+from credit_parser.isolation import parse_isolated
+from credit_parser.timing import PROFILERS, instrument, stage, logger as timing_logger
+
+
+# ---------- Input Discovery ----------
+def collect_pdfs(inputs):
+    """Expand directories and glob patterns into a sorted, de-duplicated PDF list."""
+    found = set()
+    for item in inputs:
+        if os.path.isdir(item):
+            found.update(str(p) for p in Path(item).rglob("*") if p.suffix.lower() == ".pdf")
+        else:
+            found.update(p for p in glob.glob(item, recursive=True) if p.lower().endswith(".pdf"))
+    return sorted(found)
+
+
+# ---------- Worker ----------
+def parse_file(path, report_type=None, cache_path=None, profile=None, profile_dir=None, blocks_path=None,
+               timeout=None, max_rss_mb=None, output_dir=None):
+    """Parse one PDF; never raises so a bad file cannot stop the run.
+
+    The file is memory-mapped rather than read (see ``credit_parser.source``):
+    hashing, detection and parsing share the one mapping and document.
+
+    With ``cache_path`` set, reports already parsed into that SQLite cache
+    (by an earlier run or the Streamlit app) are reused. With ``blocks_path``
+    set, facilities unchanged since the borrower's last report are reused from
+    that block store and a "Changes" sheet is added (the cache is bypassed,
+    as the changes depend on what was parsed before). Per-stage timings
+    end up in ``result["timings"]``; ``profile`` also dumps a profile per file.
+
+    With ``timeout`` or ``max_rss_mb`` set, the file is parsed in its own
+    child process under those limits (see ``credit_parser.isolation``);
+    ``result["failure"]`` then holds the structured error record and
+    ``result["fallback"]`` tells if the cheaper fallback path was used.
+
+    With ``output_dir`` set the workbook is written here, in the worker, and
+    only its path comes back (``result["output"]``), not the sheets: the
+    parent then holds a small summary per file however many files there are.
+    """
+    started = time.perf_counter()
+    result = {"file": path, "report_type": report_type, "report_id": None, "pages": 0, "sheets": None, "error": None,
+              "failure": None, "fallback": False, "output": None}
+    with instrument(path, profile=profile, profile_dir=profile_dir, log=False) as timings:
+        try:
+            with PDFSource.from_path(path) as source:
+                result["report_id"] = report_id(source)
+                if timeout or max_rss_mb:
+                    # Detection runs in the child too, where a hang is bounded
+                    report = parse_file_isolated(result, source, cache_path, blocks_path, timeout, max_rss_mb)
+                else:
+                    if result["report_type"] is None:
+                        with stage("detect"):
+                            result["report_type"] = detect(source)
+                    if result["report_type"] is None:
+                        raise ValueError("could not detect bureau/format")
+                    if blocks_path:
+                        report = parse(source, result["report_type"], blocks=BlockStore(blocks_path))
+                    elif cache_path:
+                        # Workers are separate processes; only the disk store is shared
+                        cache = ReportCache(max_entries=0, path=cache_path)
+                        report = cache.parse(source, result["report_type"])
+                    else:
+                        report = parse(source, result["report_type"])
+            if report is not None:
+                result["pages"] = report.pages
+                if output_dir:
+                    result["output"] = str(write_per_file(path, report.sheets, output_dir))
+                else:
+                    result["sheets"] = report.sheets
+        except Exception as e:
+            result["error"] = f"{type(e).__name__}: {e}"
+    result["timings"] = timings.as_dict()
+    result["seconds"] = time.perf_counter() - started
+    return result
+
+
+def parse_file_isolated(result, source, cache_path, blocks_path, timeout, max_rss_mb):
+    """``parse_file`` under ``parse_isolated``; fills in ``result`` and returns the Report or None.
+
+    Only the file's path goes to the child, which maps the file itself.
+    """
+    options = {}
+    if blocks_path:
+        options["blocks"] = BlockStore(blocks_path)
+        parser = parse_isolated
+    elif cache_path:
+        parser = ReportCache(max_entries=0, path=cache_path).parse_isolated
+    else:
+        parser = parse_isolated
+    isolated = parser(source, result["report_type"], timeout=timeout, max_rss_mb=max_rss_mb, label=source.path,
+                      **options)
+    result["report_type"] = isolated.report_type
+    result["fallback"] = isolated.fallback
+    if isolated.error:
+        result["failure"] = isolated.error.as_dict()
+        if isolated.report is None:
+            result["error"] = str(isolated.error)
+    return isolated.report
+
+
+# ---------- Output ----------
+def write_per_file(path, sheets, output_dir):
+    out_path = Path(output_dir) / f"Parsed_{Path(path).stem}.xlsx"
+    write_workbook(str(out_path), sheets)
+    return out_path
+
+
+def write_combined(results, output_path):
+    """One workbook: a "Files" index sheet plus every parsed sheet prefixed by file number.
+
+    Sheets are streamed to disk one after another (see ``credit_parser.excel``).
+    """
+    index_rows = [{
+        "No.": n,
+        "File": r["file"],
+        "Report Type": r["report_type"],
+        "Pages": r["pages"],
+        "Seconds": round(r["seconds"], 3),
+        "Status": "Failed" if r["error"] else "Fallback" if r["fallback"] else "OK",
+        # Stage the (first) failure happened in; fallback rows keep the original error
+        "Stage": r["failure"]["stage"] if r["failure"] else r["timings"].get("failed_stage"),
+        "Error": r["error"] or (r["failure"] or {}).get("message"),
+    } for n, r in enumerate(results, start=1)]
+
+    def sheets():
+        yield "Files", pd.DataFrame(index_rows)
+        for n, r in enumerate(results, start=1):
+            if r["sheets"]:
+                yield from ((f"{n} {name}", df) for name, df in r["sheets"].items())
+
+    write_workbook(output_path, sheets())
+
+
+def write_dataset(results, root):
+    """Append parsed reports to the Parquet dataset at ``root``, skipping ones already there."""
+    from credit_parser.dataset import append_reports, existing_report_ids
+
+    seen = existing_report_ids(root)
+    reports = []
+    for r in results:
+        if r["sheets"] and r["report_id"] not in seen:
+            seen.add(r["report_id"])
+            reports.append((r["report_id"], Report(r["report_type"], r["sheets"], r["pages"])))
+    append_reports(root, reports)
+    return len(reports)
+
+
+def write_portfolio(results, path, group=None):
+    """Ingest parsed reports into the SQLite portfolio store at ``path``; returns how many were new."""
+    from credit_parser.portfolio import PortfolioStore
+
+    return PortfolioStore(path).ingest(
+        ((r["report_id"], Report(r["report_type"], r["sheets"], r["pages"])) for r in results if r["sheets"]),
+        group=group)
+
+
+def write_features(results, path):
+    """Per-borrower credit-risk features of the parsed reports as CSV; returns the borrower count."""
+    from credit_parser.features import borrower_features
+
+    features = borrower_features(
+        (r["report_id"], Report(r["report_type"], r["sheets"], r["pages"])) for r in results if r["sheets"])
+    features.to_csv(path)
+    return len(features)
+
+
+# ---------- CLI ----------
+def build_arg_parser():
+    parser = argparse.ArgumentParser(description="Parse CRIF / CIBIL credit report PDFs in bulk.")
+    parser.add_argument("inputs", nargs="+", help="PDF files, directories or glob patterns")
+    out = parser.add_mutually_exclusive_group(required=True)
+    out.add_argument("-o", "--output", help="write one combined workbook to this path")
+    out.add_argument("-d", "--output-dir", help="write one Parsed_<name>.xlsx per input file")
+    out.add_argument("-p", "--parquet", metavar="DATASET_DIR", help="append to a partitioned Parquet dataset (see credit_parser.dataset)")
+    out.add_argument("--portfolio", metavar="SQLITE_PATH", help="ingest into an indexed SQLite portfolio store (see credit_parser.portfolio)")
+    out.add_argument("--features", metavar="CSV_PATH", help="write per-borrower credit-risk features (see credit_parser.features)")
+    parser.add_argument("--group", help="with --portfolio: record every borrower in this run under this group")
+    parser.add_argument("-t", "--type", choices=sorted(PARSERS), help="skip detection and force a parser")
+    parser.add_argument("--cache", metavar="SQLITE_PATH", help="reuse/store parsed reports in this SQLite cache")
+    parser.add_argument("--blocks", metavar="SQLITE_PATH",
+                        help="re-parse only facilities changed since each borrower's last report and add a "
+                             "Changes sheet (reports are compared in the order they are parsed; use -w 1 for name order)")
+    parser.add_argument("--timeout", type=float, metavar="SECONDS",
+                        help="parse each file in its own child process and give up on it after this long")
+    parser.add_argument("--max-rss", type=float, metavar="MB",
+                        help="parse each file in its own child process and kill it past this resident memory")
+    parser.add_argument("--log-timings", action="store_true", help="log per-file stage timings as JSON lines on stderr")
+    parser.add_argument("--profile", choices=PROFILERS, help="write a profile per file")
+    parser.add_argument("--profile-dir", default="profiles", help="where --profile dumps go (default: profiles)")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count(), help="worker processes (default: all cores)")
+    return parser
+
+
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+    files = collect_pdfs(args.inputs)
+    if not files:
+        print("No PDF files found.", file=sys.stderr)
+        return 2
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    if args.log_timings:
+        logging.basicConfig(format="%(message)s")
+        timing_logger.setLevel(logging.INFO)
+
+    started = time.perf_counter()
+    # With -d each worker writes its own workbook; results then carry no sheets
+    results = []
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = [pool.submit(parse_file, f, args.type, args.cache, args.profile, args.profile_dir, args.blocks,
+                               args.timeout, args.max_rss, args.output_dir)
+                   for f in files]
+        for future in as_completed(futures):
+            r = future.result()
+            timing_logger.info(json.dumps(r["timings"]))
+            if r["error"]:
+                print(f"FAILED {r['file']}: {r['error']}", file=sys.stderr)
+            elif r["fallback"]:
+                where = f" in {r['failure']['stage']}" if r["failure"]["stage"] else ""
+                print(f"ok     {r['file']} ({r['report_type']}, fallback after {r['failure']['kind']}{where})")
+            elif args.output_dir:
+                print(f"ok     {r['file']} -> {r['output']}")
+            else:
+                print(f"ok     {r['file']} ({r['report_type']}, {r['pages']} pages)")
+            results.append(r)
+
+    if args.output:
+        results.sort(key=lambda r: r["file"])
+        write_combined(results, args.output)
+    if args.parquet:
+        added = write_dataset(results, args.parquet)
+        print(f"Appended {added} new reports to {args.parquet}")
+    if args.portfolio:
+        added = write_portfolio(results, args.portfolio, args.group)
+        print(f"Ingested {added} new reports into {args.portfolio}")
+    if args.features:
+        borrowers = write_features(results, args.features)
+        print(f"Wrote features for {borrowers} borrowers to {args.features}")
+    elapsed = time.perf_counter() - started
+
+    failed = sum(1 for r in results if r["error"])
+    pages = sum(r["pages"] for r in results)
+    print(f"\nParsed {len(results) - failed}/{len(results)} files ({failed} failed) in {elapsed:.2f}s")
+    print(f"Throughput: {len(results) / elapsed:.2f} files/sec, {pages / elapsed:.2f} pages/sec")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
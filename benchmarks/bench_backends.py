@@ -0,0 +1,83 @@
+"""Text-engine comparison: wall time and peak RSS per backend.
+
+Each (engine, file) pair runs the CIBIL consumer parser in a fresh
+interpreter so RSS is not shared between engines. With no files given, a
+synthetic consumer report is generated. Run from the repo root:
+
+    python benchmarks/bench_backends.py [report.pdf ...] [--type cibil_consumer]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from credit_parser.backends import BACKENDS
+
+CHILD = """
+import json, resource, sys, time
+from credit_parser import parse
+data = open(sys.argv[1], "rb").read()
+started = time.perf_counter()
+report = parse(data, sys.argv[2], backend=sys.argv[3])
+elapsed = time.perf_counter() - started
+rows = sum(len(df) for df in report.sheets.values())
+print(json.dumps({"seconds": elapsed, "rss_mib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, "rows": rows}))
+"""
+
+ACCOUNT_LINES = [
+    "ACCOUNT INFORMATION", "ACCOUNT TYPE: Personal Loan", "OWNERSHIP: Individual",
+    "DATE OPENED: 01/02/2020", "SANCTIONED AMOUNT: 5,00,000", "CURRENT BALANCE: 50,000",
+    "EMI: 5,000", "STATUS: Standard", "DAYS PAST DUE/ASSET CLASSIFICATION (UP TO 36 MONTHS)",
+    "YEAR JAN FEB MAR", "2023 000 030 000",
+]
+
+
+def synthetic_consumer(path, pages=50, accounts_per_page=7):
+    import fitz  # PyMuPDF
+    doc = fitz.open()
+    header = ["CIBIL REPORT", "CONSUMER NAME: SYNTHETIC PERSON", "CREDITVISION® SCORE: 750"]
+    for page_number in range(pages):
+        lines = header if page_number == 0 else []
+        lines = lines + ACCOUNT_LINES * accounts_per_page
+        doc.new_page().insert_text((20, 20), "\n".join(lines), fontsize=7, lineheight=1.2)
+    doc.save(path)
+
+
+def run(path, report_type, backend):
+    out = subprocess.run([sys.executable, "-c", CHILD, path, report_type, backend],
+                         cwd=ROOT, capture_output=True, text=True)
+    if out.returncode:
+        return None, out.stderr.strip().splitlines()[-1]
+    return json.loads(out.stdout.strip().splitlines()[-1]), None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("files", nargs="*")
+    parser.add_argument("--type", default="cibil_consumer")
+    parser.add_argument("--backends", nargs="+", default=sorted(BACKENDS))
+    args = parser.parse_args()
+
+    files = args.files
+    if not files:
+        files = [os.path.join(tempfile.mkdtemp(), "synthetic_consumer.pdf")]
+        synthetic_consumer(files[0])
+
+    print(f"{'file':28} {'backend':14} {'seconds':>8} {'RSS MiB':>8} {'rows':>6}")
+    for path in files:
+        for backend in args.backends:
+            result, error = run(path, args.type, backend)
+            name = os.path.basename(path)[:28]
+            if error:
+                print(f"{name:28} {backend:14} failed: {error}")
+            else:
+                print(f"{name:28} {backend:14} {result['seconds']:8.3f} {result['rss_mib']:8.1f} {result['rows']:6d}")
+
+
+if __name__ == "__main__":
+    main()
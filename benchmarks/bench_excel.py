@@ -0,0 +1,70 @@
+"""Combined-workbook export: pandas ExcelWriter vs. streaming constant_memory writer.
+
+Writes N copies of one parsed report into a single workbook. It compares
+``pd.ExcelWriter`` + ``to_excel`` (every cell kept in memory until save)
+with ``credit_parser.excel.write_workbook``, which streams rows in
+constant_memory mode. Peaks are tracemalloc Python-heap peaks. Run from the
+repo root:
+
+    python benchmarks/bench_excel.py [report.pdf] [--copies 20 100]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from bench_memory import synthetic_crif
+from credit_parser import parse
+from credit_parser.excel import write_workbook
+
+
+def pairs(sheets, copies):
+    for n in range(1, copies + 1):
+        for name, df in sheets.items():
+            yield f"{n} {name}"[:31], df
+
+
+def pandas_writer(path, sheets, copies):
+    with pd.ExcelWriter(path, engine="xlsxwriter") as writer:
+        for name, df in pairs(sheets, copies):
+            df.to_excel(writer, sheet_name=name, index=not isinstance(df.index, pd.RangeIndex))
+
+
+def streaming_writer(path, sheets, copies):
+    write_workbook(path, pairs(sheets, copies))
+
+
+def measure(func, *args):
+    tracemalloc.start()
+    started = time.perf_counter()
+    func(*args)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 2**20
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("file", nargs="?")
+    parser.add_argument("--copies", type=int, nargs="+", default=[20, 100])
+    args = parser.parse_args()
+
+    file_bytes = open(args.file, "rb").read() if args.file else synthetic_crif(40)
+    sheets = parse(file_bytes).sheets
+    print(f"{'copies':>7} {'pandas s':>9} {'peak MiB':>9} {'stream s':>9} {'peak MiB':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for copies in args.copies:
+            old = measure(pandas_writer, os.path.join(tmp, "pandas.xlsx"), sheets, copies)
+            new = measure(streaming_writer, os.path.join(tmp, "stream.xlsx"), sheets, copies)
+            print(f"{copies:7d} {old[0]:9.2f} {old[1]:9.1f} {new[0]:9.2f} {new[1]:9.1f}")
+
+
+if __name__ == "__main__":
+    main()
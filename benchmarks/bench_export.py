@@ -0,0 +1,61 @@
+"""Export cost of parsed reports: Excel workbook vs. Parquet dataset.
+
+Parses one report (a PDF given on the command line, or a synthetic CRIF
+report), then writes N copies of it: as one combined xlsxwriter workbook the
+way ``batch.py -o`` does, and as ``credit_parser.dataset`` Parquet files. It
+also times reading the facilities back from each. Run from the repo root:
+
+    python benchmarks/bench_export.py [report.pdf] [--copies 50]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from batch import write_combined
+from bench_memory import synthetic_crif
+from credit_parser import parse
+from credit_parser.dataset import append_reports, read_table
+
+
+def timed(func, *args, **kwargs):
+    started = time.perf_counter()
+    func(*args, **kwargs)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("file", nargs="?")
+    parser.add_argument("--copies", type=int, default=50)
+    args = parser.parse_args()
+
+    file_bytes = open(args.file, "rb").read() if args.file else synthetic_crif(40)
+    report = parse(file_bytes)
+    facilities = len(report["Loan Details"]) * args.copies
+    results = [{"file": f"report_{n}.pdf", "report_type": report.report_type, "pages": report.pages,
+                "seconds": 0.0, "error": None, "sheets": report.sheets} for n in range(args.copies)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        xlsx = os.path.join(tmp, "combined.xlsx")
+        write_xlsx = timed(write_combined, results, xlsx)
+        # Loan sheets are "<n> Loan Details" in the combined workbook
+        read_xlsx = timed(pd.read_excel, xlsx, sheet_name=[f"{n} Loan Details" for n in range(1, args.copies + 1)])
+
+        root = os.path.join(tmp, "dataset")
+        write_pq = timed(append_reports, root, [(f"{n:064d}", report) for n in range(args.copies)])
+        read_pq = timed(read_table, root, "facilities")
+
+    print(f"{args.copies} reports, {facilities} facilities")
+    print(f"{'':8} {'write s':>8} {'read facilities s':>18}")
+    print(f"{'excel':8} {write_xlsx:8.3f} {read_xlsx:18.3f}")
+    print(f"{'parquet':8} {write_pq:8.3f} {read_pq:18.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Loan-detail parsing cost vs. facility count (10 / 100 / 1000 facilities).
+
+Times the current ``parse_loan_details`` of the CRIF and CIBIL commercial
+parsers on synthetic report text, next to the old accumulate-by-``pd.concat``
+pattern on the same records. Per-facility time should stay flat for the
+record path and grow with N for the concat path. Run from the repo root:
+
+    python benchmarks/bench_facilities.py [--sizes 10 100 1000]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from credit_parser import cibil_commercial, crif
+
+CRIF_FACILITY = """Loan Terms For: ACC{n:06d}
+Type: Term Loan
+DPD/Asset Classification: STD
+Info. as of: 31-12-2023
+Sanctioned Date: 01-01-2020
+Sanctioned Amount: {amount},00,000
+Current Balance: 1,00,000
+Closed Date: -
+Amount Overdue: 0
+Payment History/Asset Classification:
+Jan\nFeb\nMar\nApr\nMay\nJun\nJul\nAug\nSep\nOct\nNov\nDec
+2023\n000\n000\n030\n-\n-\n-\n-\n-\n-\n-\n-\nSTD
+Suit Filed & Wilful Default
+Suit Filed Status: -
+Wilful Defaulter: -
+"""
+
+CIBIL_FACILITY = """10. Credit Facility Details - As Borrower
+Credit Facility {n}
+Type: Cash Credit
+Last Reported Date
+STD
+31-DEC-2023
+01-JAN-2020
+Sanctioned: 01-JAN-2020
+Sanctioned INR: {amount},00,000
+Outstanding Balance: 3,00,000
+Loan Expiry / Maturity: 01-JAN-2025
+Overdue: 0
+Suit Filed: -
+Wilful Default: -
+"""
+
+
+def synthetic_text(template, count):
+    return "".join(template.format(n=n, amount=n % 97 + 1) for n in range(count))
+
+
+def concat_accumulate(records):
+    """The previous one-row-DataFrame-per-facility pattern, for comparison."""
+    df = pd.DataFrame()
+    for details in records:
+        df = pd.concat([df, pd.DataFrame([details])], ignore_index=True)
+    return df
+
+
+def best_of(func, arg, repeat):
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(arg)
+        times.append(time.perf_counter() - started)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'parser':18} {'facilities':>10} {'records ms':>11} {'us/fac':>8} {'concat ms':>10} {'us/fac':>8}")
+    for name, module, template in [("crif", crif, CRIF_FACILITY), ("cibil_commercial", cibil_commercial, CIBIL_FACILITY)]:
+        for size in args.sizes:
+            text = synthetic_text(template, size)
+            records = module.parse_loan_details(text).to_dict("records")
+            new = best_of(module.parse_loan_details, text, args.repeat)
+            old = best_of(concat_accumulate, records, args.repeat)
+            print(f"{name:18} {size:10d} {new * 1000:11.1f} {new / size * 1e6:8.0f} {old * 1000:10.1f} {old / size * 1e6:8.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Borrower feature engine: one report at a time vs. one batch of grouped reductions.
+
+Parses a small synthetic report of each type once, copies them out to
+``--borrowers`` distinct borrowers (each with its own PAN / name), then
+times ``features.report_features`` called report by report against one
+``features.borrower_features`` call over the whole batch. Run from the
+repo root:
+
+    python benchmarks/bench_features.py [--borrowers 500 20000] [--accounts 10]
+"""
+import argparse
+import os
+import sys
+import time
+import warnings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+warnings.filterwarnings("ignore")
+
+import pandas as pd
+from synthetic import GENERATORS
+
+from credit_parser import Report, parse
+from credit_parser.features import borrower_features, report_features
+
+
+def template_reports(accounts):
+    return [parse(generator(accounts), report_type=report_type) for report_type, generator in GENERATORS.values()]
+
+
+def borrower_copy(report, n):
+    """``report`` under a borrower of its own (sheets other than the identity one are shared)."""
+    sheets = dict(report.sheets)
+    if "Borrower Details" in sheets:
+        details = sheets["Borrower Details"].copy()
+        details.loc["PAN"] = f"PAN{n:07d}"
+        details.loc["Company Name"] = f"BORROWER {n}"
+        sheets["Borrower Details"] = details
+    else:
+        sheets["Summary"] = sheets["Summary"].assign(Name=f"BORROWER {n}", PAN=f"PAN{n:07d}")
+    return Report(report.report_type, sheets, report.pages)
+
+
+def batch(templates, n):
+    return [(f"report-{i}", borrower_copy(templates[i % len(templates)], i)) for i in range(n)]
+
+
+def one_by_one(reports):
+    return pd.concat([report_features([pair]) for pair in reports])
+
+
+def plain(df):
+    """Missing values as None so frames built from one report or many compare equal."""
+    df = df.astype(object)
+    return df.where(df.notna(), None)
+
+
+def timed(func, *args):
+    started = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--borrowers", type=int, nargs="+", default=[500, 20000])
+    parser.add_argument("--accounts", type=int, default=10)
+    parser.add_argument("--max-one-by-one", type=int, default=500,
+                        help="skip the report-by-report timing above this many borrowers")
+    args = parser.parse_args()
+
+    templates = template_reports(args.accounts)
+    print(f"{'borrowers':>9} {'one-by-one ms':>14} {'batch ms':>9} {'speed-up':>9} {'borrowers/min':>14}")
+    for n in args.borrowers:
+        reports = batch(templates, n)
+        features = borrower_features(reports)
+        assert len(features) == n
+        new = timed(borrower_features, reports)
+        if n <= args.max_one_by_one:
+            pd.testing.assert_frame_equal(plain(one_by_one(reports)), plain(report_features(reports)))
+            old = timed(one_by_one, reports)
+            print(f"{n:9d} {old * 1000:14.1f} {new * 1000:9.1f} {old / new:8.1f}x {n / new * 60:14,.0f}")
+        else:
+            print(f"{n:9d} {'-':>14} {new * 1000:9.1f} {'-':>9} {n / new * 60:14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""Per-block field-extraction latency: before vs. after precompiled field tables.
+
+"before" re-implements the old per-call ``re.search(pattern_string, ...)``
+extraction, "after" is the current parser function, and "combined" is a
+single alternation regex over the whole block (the rejected single-scan
+design, kept here so the choice can be re-checked). Run from the repo root:
+
+    python benchmarks/bench_fields.py [--number 5000]
+"""
+import argparse
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from credit_parser import cibil_commercial, cibil_consumer, crif
+
+COLAB_BLOCK = """
+ACCOUNT TYPE: Personal Loan
+OWNERSHIP: Individual
+DATE OPENED: 01/02/2020
+DATE CLOSED:
+SANCTIONED AMOUNT: 6,00,000
+CURRENT BALANCE: 50,000
+HIGH CREDIT AMOUNT: 1,000
+CASH LIMIT: 0
+EMI: 5,000
+ACTUAL PAYMENT: 5,000
+PAYMENT FREQUENCY: Monthly
+STATUS: Standard
+DAYS PAST DUE/ASSET CLASSIFICATION (UP TO 36 MONTHS)
+YEAR JAN FEB MAR
+2023 000 030 000
+2022 000 000 090
+"""
+
+FACILITY_BLOCK = """10. Credit Facility Details - As Borrower
+Credit Facility 7
+Type: Cash Credit
+Last Reported Date
+STD
+31-DEC-2023
+01-JAN-2020
+Sanctioned: 01-JAN-2020
+Sanctioned INR: 12,00,000
+Outstanding Balance: 3,00,000
+Loan Expiry / Maturity: 01-JAN-2025
+Overdue: 0
+Suit Filed: -
+Wilful Default: -
+"""
+
+CRIF_SECTION = """Loan Terms For: ACC000001
+Type: Term Loan
+DPD/Asset Classification: STD
+Info. as of: 31-12-2023
+Sanctioned Date: 01-01-2020
+Sanctioned Amount: 18,00,000
+Current Balance: 1,00,000
+Closed Date: -
+Amount Overdue: 0
+Suit Filed Status: -
+Wilful Defaulter: -
+"""
+
+
+# ---------- "before": pattern strings searched on every call ----------
+def colab_before(block):
+    def extract(pattern):
+        m = re.search(pattern, block, re.IGNORECASE)
+        return m.group(1).strip() if m else ''
+    return {key: extract(pattern) for key, pattern in COLAB_PATTERNS.items()}
+
+
+def facility_before(section_a):
+    details = {}
+    for key, pattern in FACILITY_PATTERNS.items():
+        match = re.search(pattern[0], section_a, pattern[1])
+        if match:
+            details[key] = match.group(1).strip()
+    return details
+
+
+def crif_before(section):
+    details = {}
+    for k in crif.LOAN_KEYS:
+        match = re.search(rf'{k}:\s*(.*)', section)
+        details[k] = match.group(1).strip() if match else None
+    return details
+
+
+COLAB_PATTERNS = {k: p.pattern for k, p in cibil_consumer.COLAB_FIELDS.items()}
+FACILITY_PATTERNS = {k: (p.pattern, p.flags) for k, p in cibil_commercial.FACILITY_FIELDS.items()}
+
+
+# ---------- "after": the parsers' precompiled tables ----------
+def colab_after(block):
+    return cibil_consumer.field_values(cibil_consumer.COLAB_FIELDS, block)
+
+
+def facility_after(section_a):
+    return cibil_commercial.extract_facility_details(section_a, 0)
+
+
+def crif_after(section):
+    return crif.field_values(crif.LOAN_FIELDS, section, default=None)
+
+
+# ---------- "combined": one alternation, first hit per field ----------
+def combined_extractor(fields, flags):
+    names = list(fields)
+    combined = re.compile("|".join(f"(?P<f{i}>{p.pattern})" for i, p in enumerate(fields.values())), flags)
+    value_group = {combined.groupindex[f"f{i}"]: combined.groupindex[f"f{i}"] + 1 for i in range(len(names))}
+    label_of = {combined.groupindex[f"f{i}"]: names[i] for i in range(len(names))}
+
+    def extract(text):
+        values = {}
+        for m in combined.finditer(text):
+            for outer, inner in value_group.items():
+                if m.group(outer) is not None:
+                    values.setdefault(label_of[outer], m.group(inner).strip())
+                    break
+        return {name: values.get(name, '') for name in names}
+    return extract
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=5000)
+    args = parser.parse_args()
+
+    cases = [
+        ("colab personal block", COLAB_BLOCK, colab_before, colab_after,
+         combined_extractor(cibil_consumer.COLAB_FIELDS, re.IGNORECASE)),
+        ("commercial facility", FACILITY_BLOCK, facility_before, facility_after, None),
+        ("crif loan section", CRIF_SECTION, crif_before, crif_after,
+         combined_extractor(crif.LOAN_FIELDS, 0)),
+    ]
+    print(f"{'block':22} {'before us':>10} {'after us':>10} {'combined us':>12}")
+    for name, text, before, after, combined in cases:
+        timings = []
+        for func in (before, after, combined):
+            if func is None:
+                timings.append(float("nan"))
+                continue
+            timings.append(min(timeit.repeat(lambda: func(text), number=args.number, repeat=3)) / args.number * 1e6)
+        print(f"{name:22} {timings[0]:10.1f} {timings[1]:10.1f} {timings[2]:12.1f}")
+
+
+if __name__ == "__main__":
+    main()
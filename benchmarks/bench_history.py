@@ -0,0 +1,83 @@
+"""Payment-history decoding: per-loan DataFrame/.loc walk vs. vectorised table.
+
+Times the old ``payment_history_parser`` (a DataFrame per loan, walked cell by
+cell with ``.loc``) against ``history_cells`` plus one vectorised
+``payment_history_frame`` / ``payment_history_metrics`` pass over all loans.
+Run from the repo root:
+
+    python benchmarks/bench_history.py [--loans 100 1000] [--years 3]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from credit_parser.history import history_cells, payment_history_frame, payment_history_metrics
+
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+VALUES = ["000/STD", "030/SMA", "090/SUB", "-", "STD", "000"]
+
+
+def synthetic_history(years, rng):
+    lines = list(MONTHS)
+    for year in range(2023, 2023 - years, -1):
+        lines.append(str(year))
+        lines.extend(rng.choice(VALUES) for _ in MONTHS)
+    return "\n".join(lines)
+
+
+def loc_parser(data):
+    """The pre-vectorisation implementation, kept here for comparison."""
+    lines = [line.strip() for line in data.strip().splitlines() if line.strip()]
+    months = lines[:12]
+    rest = lines[12:]
+    data_dict = {'Month': months}
+    i = 0
+    while i < len(rest):
+        data_dict[rest[i]] = rest[i+1:i+13]
+        i += 13
+    df = pd.DataFrame(data_dict).set_index('Month')
+    out = []
+    for i in df.columns:
+        for j in df.index:
+            if df.loc[j, i] != '-':
+                out.append(j + ' ' + str(i) + ' ' + df.loc[j, i])
+    return out
+
+
+def vectorised(histories):
+    loans = pd.DataFrame({"Payment History/Asset Classification": [history_cells(h) for h in histories]})
+    history = payment_history_frame(loans)
+    return history, payment_history_metrics(history)
+
+
+def timed(func, *args):
+    started = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--loans", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--years", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    print(f"{'loans':>7} {'.loc ms':>10} {'vectorised ms':>14} {'speed-up':>9}")
+    for n in args.loans:
+        histories = [synthetic_history(args.years, rng) for _ in range(n)]
+        assert [loc_parser(h) for h in histories] == [history_cells(h) for h in histories]
+        vectorised(histories)  # warm-up
+        old = timed(lambda: [loc_parser(h) for h in histories])
+        new = timed(vectorised, histories)
+        print(f"{n:7d} {old * 1000:10.1f} {new * 1000:14.1f} {old / new:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Cold-start import time of the parsing engine vs. the Streamlit pages.
+
+Each import runs in a fresh interpreter so nothing is already cached in
+``sys.modules``. Run from the repository root:
+
+    python benchmarks/bench_import.py [--repeat 5]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TARGETS = [
+    "credit_parser",
+    "credit_parser.crif",
+    "credit_parser.cibil_consumer",
+    "credit_parser.cibil_commercial",
+    "crif_analyzer",
+    "cibil_commercial",
+]
+
+SNIPPET = "import time; t = time.perf_counter(); import {mod}; print(time.perf_counter() - t)"
+
+
+def cold_import_seconds(module_name):
+    out = subprocess.run(
+        [sys.executable, "-c", SNIPPET.format(mod=module_name)],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'module':35} {'median ms':>10} {'min ms':>10}")
+    for module_name in TARGETS:
+        try:
+            runs = [cold_import_seconds(module_name) for _ in range(args.repeat)]
+        except subprocess.CalledProcessError as e:
+            print(f"{module_name:35} {'failed':>10}  ({e.stderr.strip().splitlines()[-1]})")
+            continue
+        print(f"{module_name:35} {statistics.median(runs) * 1000:10.1f} {min(runs) * 1000:10.1f}")
+
+
+if __name__ == "__main__":
+    main()
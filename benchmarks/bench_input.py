@@ -0,0 +1,118 @@
+"""PDF input: reading the file into bytes vs. a memory-mapped ``PDFSource``.
+
+Writes a synthetic CRIF report with ``--accounts`` loans to a temporary
+folder, padded with an embedded attachment of ``--padding-mb`` MB (scanned
+reports are mostly image data the parser never reads), then processes it
+the way the batch runner does in each mode, every one in a fresh
+interpreter:
+
+    bytes            f.read(), hash, detect, parse (the previous batch path)
+    mapped           PDFSource.from_path: hash, detect and parse on one mapping / document
+    bytes-isolated   parse_isolated(bytes): the bytes are pickled to the worker
+    mapped-isolated  parse_isolated(path): only the path goes to the worker
+
+and prints peak RSS (Linux), the PDF bytes copied and the documents opened (the
+``bytes_copied`` / ``documents_opened`` counts, see ``credit_parser.source``).
+The mapped modes must copy nothing and open one document. Run from the
+repo root:
+
+    python benchmarks/bench_input.py [--accounts 2000] [--padding-mb 0 200]
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+CHILD = """
+import json, sys, time, warnings
+warnings.filterwarnings("ignore")
+from credit_parser import PDFSource, detect, parse, report_id
+from credit_parser.isolation import parse_isolated
+from credit_parser.timing import instrument
+
+def bytes_path(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    report_id(data)
+    return parse(data, detect(data))
+
+def mapped(path):
+    with PDFSource.from_path(path) as source:
+        report_id(source)
+        return parse(source, detect(source))
+
+def bytes_isolated(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    report_id(data)
+    return parse_isolated(data, timeout=None, max_rss_mb=None).report
+
+def mapped_isolated(path):
+    with PDFSource.from_path(path) as source:
+        report_id(source)
+        return parse_isolated(source, timeout=None, max_rss_mb=None).report
+
+if __name__ == "__main__":
+    mode = {"bytes": bytes_path, "mapped": mapped, "bytes-isolated": bytes_isolated,
+            "mapped-isolated": mapped_isolated}[sys.argv[2]]
+    with instrument(log=False) as timings:
+        started = time.perf_counter()
+        report = mode(sys.argv[1])
+        elapsed = time.perf_counter() - started
+    counts = timings.as_dict()["counts"]
+    # VmHWM, not ru_maxrss: that survives exec, so it would report this benchmark's own peak
+    with open("/proc/self/status") as f:
+        peak = next(int(line.split()[1]) for line in f if line.startswith("VmHWM:"))
+    print(json.dumps({"seconds": elapsed, "rss_mib": peak / 1024,
+                      "copied": counts.get("bytes_copied", 0), "documents": counts.get("documents_opened", 0),
+                      "rows": sum(len(df) for df in report.sheets.values())}))
+"""
+
+MODES = ["bytes", "mapped", "bytes-isolated", "mapped-isolated"]
+
+
+def write_report(path, accounts, padding_mb):
+    import fitz  # PyMuPDF
+    from synthetic import crif_report
+
+    doc = fitz.open(stream=crif_report(accounts), filetype="pdf")
+    if padding_mb:
+        doc.embfile_add("scan.bin", random.Random(0).randbytes(int(padding_mb * 2**20)))
+    doc.save(path)
+
+
+def run(path, mode):
+    out = subprocess.run([sys.executable, "-c", CHILD, path, mode], cwd=ROOT, capture_output=True, text=True,
+                         check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--accounts", type=int, default=2000)
+    parser.add_argument("--padding-mb", type=float, nargs="+", default=[0, 200])
+    args = parser.parse_args()
+
+    print(f"{'file MB':>8} {'mode':>16} {'peak RSS MB':>12} {'copied MB':>10} {'documents':>10} {'seconds':>8}")
+    with tempfile.TemporaryDirectory() as folder:
+        for padding in args.padding_mb:
+            path = os.path.join(folder, f"crif_{padding:g}.pdf")
+            write_report(path, args.accounts, padding)
+            size = os.path.getsize(path) / 2**20
+            results = {mode: run(path, mode) for mode in MODES}
+            assert len({r["rows"] for r in results.values()}) == 1
+            assert results["mapped"]["copied"] == results["mapped-isolated"]["copied"] == 0
+            assert results["mapped"]["documents"] == 1
+            for mode, r in results.items():
+                print(f"{size:8.1f} {mode:>16} {r['rss_mib']:12.1f} {r['copied'] / 2**20:10.1f} "
+                      f"{r['documents']:10d} {r['seconds']:8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Peak Python memory of CRIF parsing vs. page count: full text vs. streamed.
+
+"full text" is the old path (join every page into one string, then parse);
+"streamed" is ``credit_parser.crif.parse_report``. Peaks are measured with
+tracemalloc, so they cover Python objects (page strings, sections, records)
+but not MuPDF's own buffers. Run from the repo root:
+
+    python benchmarks/bench_memory.py [--pages 20 100 200]
+"""
+import argparse
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fitz  # PyMuPDF
+
+from credit_parser import crif
+from credit_parser.pdf import extract_text, open_document
+
+LOAN_LINES = [
+    "Loan Terms For: ACC{n:06d}", "Type: Term Loan", "DPD/Asset Classification: STD",
+    "Info. as of: 31-12-2023", "Sanctioned Date: 01-01-2020", "Sanctioned Amount: 5,00,000",
+    "Current Balance: 1,00,000", "Closed Date: -", "Amount Overdue: 0",
+    "Suit Filed Status: -", "Wilful Defaulter: -",
+]
+
+
+def synthetic_crif(pages, loans_per_page=6):
+    """A minimal CRIF-like PDF: a header page plus pages of loan sections."""
+    doc = fitz.open()
+    doc.new_page().insert_text((20, 20), "CRIF HIGH MARK\nName: SYNTHETIC LTD\nPAN: ABCDE1234F", fontsize=7)
+    n = 0
+    for _ in range(pages - 1):
+        lines = []
+        for _ in range(loans_per_page):
+            lines += [line.format(n=n) for line in LOAN_LINES]
+            n += 1
+        doc.new_page().insert_text((20, 20), "\n".join(lines), fontsize=7, lineheight=1.2)
+    return doc.tobytes()
+
+
+def full_text_parse(file_bytes):
+    doc = open_document(file_bytes)
+    text = extract_text(doc)
+    return crif.parse_loan_details(text)
+
+
+def peak_kib(func, arg):
+    tracemalloc.start()
+    func(arg)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, nargs="+", default=[20, 100, 200])
+    args = parser.parse_args()
+
+    print(f"{'pages':>6} {'full text KiB':>14} {'streamed KiB':>13}")
+    for pages in args.pages:
+        file_bytes = synthetic_crif(pages)
+        print(f"{pages:6d} {peak_kib(full_text_parse, file_bytes):14.0f} {peak_kib(crif.parse_report, file_bytes):13.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Amount / date / DPD normalisation: per-value Python vs. one vectorised pass per column.
+
+Times the old per-value helpers (``clean_amount``'s ``re.sub`` on every
+string, the ``strptime`` try/except cascade of ``personal_row`` and the
+per-cell ``.apply`` regexes of ``parse_borrower_summary``) against
+``frames.to_amount`` / ``to_dates`` + ``format_dates`` / ``dpd_days`` and the vectorised
+``str.extract``, each over a whole column. Run from the repo root:
+
+    python benchmarks/bench_normalize.py [--rows 1000 100000]
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from credit_parser.frames import ASSET_CLASS_DPD, SMA_SUBCLASS_DPD, dpd_days, format_dates, to_amount, to_dates
+
+DPD_CODES = ["000", "030", "000/STD", "030/SMA", "090/SUB", "STD", "SUB", "DBT", "SMA-1", "SMA 2"]
+
+
+def synthetic_columns(n, rng):
+    return pd.DataFrame({
+        "amount": [f"{rng.randint(0, 99)},{rng.randint(0, 99):02d},{rng.randint(0, 999):03d}" for _ in range(n)],
+        "date": [sep.join([f"{rng.randint(1, 28):02d}", f"{rng.randint(1, 12):02d}", str(rng.randint(2000, 2024))])
+                 for sep in (rng.choice("/-") for _ in range(n))],
+        "share": [f"{rng.randint(0, 99)}.{rng.randint(0, 9)} ({rng.randint(0, 100)}%)" for _ in range(n)],
+        "dpd": [rng.choice(DPD_CODES) for _ in range(n)],
+    })
+
+
+# ---------- Per-value (previous implementation, kept for comparison) ----------
+def clean_amount(amount_str):
+    if not amount_str:
+        return 0
+    numeric_str = re.sub(r'[^\d]', '', amount_str)
+    return int(numeric_str) if numeric_str else 0
+
+
+def format_date(sanction_date_str):
+    try:
+        return datetime.strptime(sanction_date_str, "%d/%m/%Y").strftime("%d/%m/%Y")
+    except ValueError:
+        try:
+            return datetime.strptime(sanction_date_str, "%d-%m-%Y").strftime("%d/%m/%Y")
+        except ValueError:
+            return sanction_date_str
+
+
+def dpd_value(code):
+    subclass = re.search(r"SMA[ \-_]?([012])(?!\d)", code)
+    match = re.search(r"(\d+)", code[:subclass.start(1)] + code[subclass.end(1):] if subclass else code)
+    if match:
+        return int(match.group(1))
+    if subclass:
+        return SMA_SUBCLASS_DPD[subclass.group(1)]
+    match = re.search(r"(STD|SMA|SUB|DBT|LOS)", code)
+    return ASSET_CLASS_DPD[match.group(1)] if match else None
+
+
+def per_value(df):
+    return pd.DataFrame({
+        "amount": [clean_amount(v) for v in df["amount"]],
+        "date": [format_date(v) for v in df["date"]],
+        "value": df["share"].apply(lambda x: float(re.search(r'(\d+\.?\d*)', str(x)).group(1))
+                                   if pd.notnull(x) and re.search(r'(\d+\.?\d*)', str(x)) else None),
+        "percent": df["share"].apply(lambda x: int(re.search(r'\((\d+)%\)', str(x)).group(1))
+                                     if pd.notnull(x) and re.search(r'\((\d+)%\)', str(x)) else None),
+        "dpd": [dpd_value(v) for v in df["dpd"]],
+    })
+
+
+# ---------- Vectorised ----------
+def vectorised(df):
+    share = df["share"].astype("string")
+    return pd.DataFrame({
+        "amount": to_amount(df["amount"]),
+        "date": format_dates(to_dates(df["date"]), "%d/%m/%Y"),
+        "value": pd.to_numeric(share.str.extract(r'(\d+\.?\d*)', expand=False)),
+        "percent": pd.to_numeric(share.str.extract(r'\((\d+)%\)', expand=False)),
+        "dpd": dpd_days(df["dpd"]),
+    })
+
+
+def timed(func, *args):
+    started = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 100000])
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    print(f"{'rows':>8} {'per-value ms':>13} {'vectorised ms':>14} {'speed-up':>9}")
+    for n in args.rows:
+        df = synthetic_columns(n, rng)
+        pd.testing.assert_frame_equal(per_value(df), vectorised(df), check_dtype=False)
+        old = timed(per_value, df)
+        new = timed(vectorised, df)
+        print(f"{n:8d} {old * 1000:13.1f} {new * 1000:14.1f} {old / new:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
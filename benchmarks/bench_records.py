@@ -0,0 +1,106 @@
+"""Parsed facility records: string-keyed dicts vs. slotted ``records.Facility``.
+
+Builds ``--records`` facilities the way a batch run accumulates them (one
+per parsed block, field values as matched text) and turns them into the
+Loan Details frame, once as the previous per-block dicts and once as
+``Facility`` records. Each path runs in a fresh interpreter so its peak RSS
+is its own; the records held before the frame is built are also measured
+with tracemalloc. Run from the repo root:
+
+    python benchmarks/bench_records.py [--records 10000 200000]
+"""
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pandas as pd
+
+from credit_parser import crif
+from credit_parser.crif import LOAN_LABELS, loan_details_frame
+from credit_parser.frames import records_frame
+from credit_parser.records import Facility
+
+
+def field_values(n):
+    """Distinct text values per record, as the field regexes would return them."""
+    return {
+        "facility_no": f"ACC{n:07d}", "type": "Term Loan", "asset_classification": f"{n % 4 * 30:03d}/STD",
+        "info_as_of": "31-03-2024", "sanctioned_date": f"{n % 28 + 1:02d}-01-2020",
+        "sanctioned_amount": f"{n % 90 + 10},00,000", "current_balance": f"{n % 50 + 1},00,000",
+        "closed_date": "-", "amount_overdue": str(n % 1000), "suit_filed": "-", "wilful_defaulter": "-",
+        "payment_history": None,
+    }
+
+
+# ---------- Previous dict path, kept for comparison ----------
+class DictRecords:
+    """The {column label: value} dicts parsers used to return, framed column by column."""
+
+    @staticmethod
+    def to_frame(records, labels):
+        columns = list(labels.values())
+        return pd.DataFrame({col: [record.get(col) for record in records] for col in columns}, columns=columns)
+
+
+def dict_records(n):
+    return [{LOAN_LABELS[field]: value for field, value in field_values(i).items()} for i in range(n)]
+
+
+def dict_frame(records):
+    return records_frame(DictRecords, records, LOAN_LABELS, amounts=crif.LOAN_AMOUNT_COLUMNS,
+                         dates=crif.LOAN_DATE_COLUMNS, categories=crif.LOAN_CATEGORY_COLUMNS,
+                         dpd=crif.LOAN_DPD_COLUMNS)
+
+
+def slotted_records(n):
+    return [Facility(**field_values(i)) for i in range(n)]
+
+
+PATHS = {"dict": (dict_records, dict_frame), "slotted": (slotted_records, loan_details_frame)}
+
+
+def run(path, n):
+    """One path in this process: held-records bytes, build + frame seconds, peak RSS MB, frame shape."""
+    build, frame = PATHS[path]
+    tracemalloc.start()
+    started = time.perf_counter()
+    records = build(n)
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    df = frame(records)
+    elapsed = time.perf_counter() - started
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KiB on Linux
+    print(held, elapsed, peak, *df.shape)
+
+
+def measure(path, n):
+    out = subprocess.run([sys.executable, __file__, "--child", path, "--records", str(n)],
+                         check=True, capture_output=True, text=True, cwd=ROOT).stdout.splitlines()[-1].split()
+    return int(out[0]) / 2**20, float(out[1]), float(out[2]), (int(out[3]), int(out[4]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, nargs="+", default=[10000, 200000])
+    parser.add_argument("--child", choices=PATHS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        return run(args.child, args.records[0])
+
+    print(f"{'records':>8} {'path':>8} {'held MB':>8} {'peak RSS MB':>12} {'seconds':>8}")
+    for n in args.records:
+        results = {path: measure(path, n) for path in PATHS}
+        assert results["dict"][3] == results["slotted"][3]
+        for path, (held, elapsed, peak, _) in results.items():
+            print(f"{n:8d} {path:>8} {held:8.1f} {peak:12.1f} {elapsed:8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""Reproducible parser benchmark suite: latency, per-stage time and peak memory.
+
+Runs every synthetic layout (see ``synthetic.py``) at each account count,
+end to end: parse the PDF bytes and write the Excel workbook in memory.
+For each case it records:
+
+    seconds_min / seconds_median   wall time over --repeat runs (after one warm-up)
+    stages                         median seconds per stage (credit_parser.timing)
+    peak_mib                       tracemalloc peak of one extra run (Python-side allocations;
+                                   PyMuPDF's own C buffers are not included)
+
+Save a baseline and compare later runs against it. The compare run exits
+with status 1 when any case's median latency or peak memory grew by more
+than --threshold:
+
+    python benchmarks/bench_suite.py --save baseline.json
+    python benchmarks/bench_suite.py --compare baseline.json [--threshold 0.25]
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from io import BytesIO
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from synthetic import GENERATORS
+
+from credit_parser import parse
+from credit_parser.excel import write_workbook
+from credit_parser.timing import instrument
+
+
+def end_to_end(file_bytes, report_type):
+    report = parse(file_bytes, report_type)
+    write_workbook(BytesIO(), report.sheets)
+
+
+def run_case(file_bytes, report_type, repeat):
+    end_to_end(file_bytes, report_type)  # warm-up: imports, compiled patterns
+    runs = []
+    for _ in range(repeat):
+        with instrument(log=False) as timings:
+            end_to_end(file_bytes, report_type)
+        runs.append(timings)
+    stage_names = {name for t in runs for name in t.stages}
+
+    tracemalloc.start()
+    end_to_end(file_bytes, report_type)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    totals = [t.total for t in runs]
+    return {
+        "pages": runs[0].counts.get("pages", 0),
+        "seconds_min": min(totals),
+        "seconds_median": statistics.median(totals),
+        "stages": {name: statistics.median(t.stages.get(name, 0.0) for t in runs) for name in sorted(stage_names)},
+        "peak_mib": peak / 2**20,
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def compare(results, baseline, threshold):
+    """Print per-case ratios against ``baseline``; return the regressed cases."""
+    regressions = []
+    print(f"\n{'case':28} {'latency x':>10} {'memory x':>9}")
+    for case, now in results.items():
+        before = baseline.get(case)
+        if not before:
+            continue
+        latency = now["seconds_median"] / before["seconds_median"]
+        memory = now["peak_mib"] / before["peak_mib"] if before["peak_mib"] else 1.0
+        flag = "  REGRESSION" if max(latency, memory) > 1 + threshold else ""
+        print(f"{case:28} {latency:10.2f} {memory:9.2f}{flag}")
+        if flag:
+            regressions.append(case)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--accounts", type=int, nargs="+", default=[10, 100])
+    parser.add_argument("--layouts", nargs="+", choices=sorted(GENERATORS), default=list(GENERATORS))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save", metavar="JSON", help="write results (use as a later --compare baseline)")
+    parser.add_argument("--compare", metavar="JSON", help="baseline results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown/growth ratio (default 0.25)")
+    args = parser.parse_args()
+
+    results = {}
+    print(f"{'case':28} {'pages':>5} {'min ms':>8} {'median ms':>10} {'peak MiB':>9}  stages (median ms)")
+    for layout in args.layouts:
+        report_type, generate = GENERATORS[layout]
+        for accounts in args.accounts:
+            case = f"{layout}-{accounts}"
+            result = run_case(generate(accounts, seed=args.seed), report_type, args.repeat)
+            results[case] = result
+            stages = " ".join(f"{name}={seconds * 1000:.1f}" for name, seconds in result["stages"].items())
+            print(f"{case:28} {result['pages']:5d} {result['seconds_min'] * 1000:8.1f} "
+                  f"{result['seconds_median'] * 1000:10.1f} {result['peak_mib']:9.1f}  {stages}")
+
+    if args.save:
+        meta = {"commit": git_commit(), "python": platform.python_version(), "machine": platform.machine(),
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S"), "repeat": args.repeat, "seed": args.seed}
+        with open(args.save, "w") as f:
+            json.dump({"meta": meta, "results": results}, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} case(s) regressed by more than {args.threshold:.0%}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
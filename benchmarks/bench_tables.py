@@ -0,0 +1,71 @@
+"""CIBIL commercial per-report latency by table engine (PyMuPDF vs. camelot).
+
+With no files given, a synthetic report is generated with ruled
+credit-summary (page 1) and enquiry-summary (page 2) tables. Each engine is
+warmed up once, then timed. Run from the repo root:
+
+    python benchmarks/bench_tables.py [report.pdf ...] [--repeat 3]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fitz  # PyMuPDF
+
+from credit_parser.cibil_commercial import parse_report
+
+CREDIT_SUMMARY = [
+    ["Category", "Lenders", "CF Borr", "CF Guar", "Open CF", "O/S Borr", "O/S Guar", "Latest", "Del Borr", "Del Guar", "Del O/S B", "Del O/S G"],
+    ["Your Institution", "1", "2", "0", "2", "10.5 (20%)", "0", "01-JAN-2023", "0", "0", "0", "0"],
+    ["Other Institution", "3", "5", "1", "4", "40.1 (80%)", "1.0", "05-FEB-2023", "1", "0", "2.0", "0"],
+]
+ENQUIRY_SUMMARY = [["5. Enquiry Summary", "", ""], ["Purpose", "0-3 Months", "Total"], ["Working Capital", "2", "5"]]
+
+
+def draw_table(page, x, y, rows, col_width, row_height=14):
+    for i, row in enumerate(rows):
+        for j, cell in enumerate(row):
+            rect = fitz.Rect(x + j * col_width, y + i * row_height, x + (j + 1) * col_width, y + (i + 1) * row_height)
+            page.draw_rect(rect, color=(0, 0, 0), width=0.5)
+            page.insert_textbox(rect + (1, 1, -1, -1), cell, fontsize=6)
+
+
+def synthetic_report():
+    doc = fitz.open()
+    page = doc.new_page()
+    page.insert_text((20, 20), "TransUnion CIBIL Company Credit Report\nName: SYNTHETIC LIMITED", fontsize=7)
+    draw_table(page, 20, 100, CREDIT_SUMMARY, 46)
+    page = doc.new_page()
+    draw_table(page, 20, 100, ENQUIRY_SUMMARY, 120)
+    return doc.tobytes()
+
+
+def timed(file_bytes, engine, repeat):
+    parse_report(file_bytes, table_engine=engine)  # warm-up: imports, caches
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        parse_report(file_bytes, table_engine=engine)
+        times.append(time.perf_counter() - started)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("files", nargs="*")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    inputs = [(os.path.basename(p), open(p, "rb").read()) for p in args.files] or [("synthetic", synthetic_report())]
+    print(f"{'file':28} {'pymupdf ms':>11} {'camelot ms':>11} {'speed-up':>9}")
+    for name, file_bytes in inputs:
+        fast = timed(file_bytes, "pymupdf", args.repeat)
+        slow = timed(file_bytes, "camelot", args.repeat)
+        print(f"{name[:28]:28} {fast * 1000:11.1f} {slow * 1000:11.1f} {slow / fast:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
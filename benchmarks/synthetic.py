@@ -0,0 +1,231 @@
+"""Synthetic CRIF / CIBIL report PDFs in the layouts the parsers expect.
+
+Every generator takes the number of accounts (loan sections / facilities /
+account blocks), an optional minimum page count and a seed, and returns
+PDF bytes. The same arguments always give the same report:
+
+    crif                "Loan Terms For:" sections with a 12-month payment-history grid per year
+    cibil_consumer      "ACCOUNT INFORMATION" blocks with a DPD grid (Colab-style layout)
+    cibil_consumer_st   "STATUS ... ACCOUNT DATES" blocks (Streamlit-style layout)
+    cibil_commercial    "10. Credit Facility Details - As Borrower" sections plus ruled
+                        credit-summary / enquiry-summary tables on pages 1 and 2
+
+Write one of each to a folder (e.g. for batch.py or the Streamlit pages):
+
+    python benchmarks/synthetic.py OUT_DIR [--accounts 50] [--pages 20] [--seed 0]
+"""
+import argparse
+import math
+import os
+import random
+
+import fitz  # PyMuPDF
+
+LINES_PER_PAGE = 90
+FONT_SIZE = 7
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+
+# ---------- Layout ----------
+def paginate(header, blocks, pages=None):
+    """Header lines on page 1, then account blocks spread over at least ``pages`` pages.
+
+    A block is never split across pages; a page that would overflow starts
+    a new one, so ``pages`` is a minimum.
+    """
+    per_page = math.ceil(len(blocks) / (pages - 1)) if pages and pages > 1 and blocks else len(blocks) or 1
+    laid_out, current, on_page = [], list(header), 0
+    if pages and pages > 1:
+        laid_out.append(current)
+        current = []
+    for block in blocks:
+        if current and (on_page == per_page or len(current) + len(block) > LINES_PER_PAGE):
+            laid_out.append(current)
+            current, on_page = [], 0
+        current += block
+        on_page += 1
+    laid_out.append(current)
+    while pages and len(laid_out) < pages:
+        laid_out.append([])
+    return laid_out
+
+
+def render(page_lines, page_header=()):
+    """One PDF page per entry; an entry longer than a page (a long header) continues on the next.
+
+    ``page_header`` lines run at the top of every page, with ``{page}`` and
+    ``{pages}`` filled in (e.g. "Page {page} of {pages}").
+    """
+    chunks = [lines[start:start + LINES_PER_PAGE]
+              for lines in page_lines for start in range(0, max(len(lines), 1), LINES_PER_PAGE)]
+    doc = fitz.open()
+    for number, lines in enumerate(chunks, start=1):
+        page = doc.new_page()
+        lines = [line.format(page=number, pages=len(chunks)) for line in page_header] + lines
+        if lines:
+            page.insert_text((20, 20), "\n".join(lines), fontsize=FONT_SIZE, lineheight=1.2)
+    return doc
+
+
+def draw_table(page, x, y, rows, col_width, row_height=14):
+    """Ruled table with one text box per cell (what page.find_tables()/camelot pick up)."""
+    for i, row in enumerate(rows):
+        for j, cell in enumerate(row):
+            rect = fitz.Rect(x + j * col_width, y + i * row_height, x + (j + 1) * col_width, y + (i + 1) * row_height)
+            page.draw_rect(rect, color=(0, 0, 0), width=0.5)
+            if cell:
+                page.insert_textbox(rect + (1, 1, -1, -1), cell, fontsize=6)
+    return y + len(rows) * row_height
+
+
+def amount(rng, lakhs=99):
+    return f"{rng.randint(1, lakhs)},00,000"
+
+
+# ---------- CRIF commercial ----------
+CRIF_HEADER = [
+    "CRIF HIGH MARK Commercial Report", "Name: SYNTHETIC TRADERS PVT LTD", "Legal Constitution: Private Limited",
+    "Class of Activity: Trading", "PAN: ABCDE1234F", "Date of Incorporation: 01-02-2001",
+    "CIN/LLPIN: U12345MH2001PTC123456", "Applied Amount: 5,00,000", "Registered:", "12 Main Road", "Mumbai",
+    "GSTIN: 27ABCDE1234F1Z5", "DESCRIPTION", "Score is good", "Tip: keep paying", "CRIF HM Score 700",
+    "Borrower Summary",
+    "Your Institution", "3", "2", "0", "1", "10.5 (40%)", "5.2", "0.0", "0.0",
+    "Other Institution", "4", "3", "1", "0", "12.0 (60%)", "7.1", "0.3", "1.0",
+    "Credit Profile Summary",
+    "Your Institution", "Working Cap", "1", "2.0", "0", "0", "0", "0", "0", "0", "0", "0", "1", "0", "0", "0", "0",
+    "Term Loan", "2", "3.0", "0", "0", "0", "0", "0", "0", "0", "0", "0", "1", "0", "0", "0", "(40%)",
+    "Other Institution", "Working Cap", "3", "4", "-", "-", "-", "-", "-", "-", "-", "-", "0", "0", "0", "0", "1",
+    "(%) represents utilization", "Additional Status",
+]
+# Laid out like an account block, so it is never split across a page break
+CRIF_INQUIRIES = [
+    "Inquiries (reported for past 24 months)", "Lender", "Date", "Purpose", "Amount", "Type", "Status",
+    "XXXX", "01-01-2023", "Working Capital", "1,00,000", "New", "Approved",
+    "XXXX", "05-03-2023", "Term Loan", "2,00,000", "New", "Pending",
+    "Additional Inquiry Details",
+]
+DPD_VALUES = ["000", "000/STD", "030", "030/SMA", "090/SUB", "STD", "-"]
+
+
+def crif_report(accounts=30, pages=None, years=2, seed=0, page_header=()):
+    rng = random.Random(seed)
+    blocks = []
+    for n in range(accounts):
+        block = [
+            f"Loan Terms For: ACC{n:06d}", "Type: Term Loan", "DPD/Asset Classification: STD",
+            "Info. as of: 31-12-2023", "Sanctioned Date: 01-01-2020", f"Sanctioned Amount: {amount(rng)}",
+            "Current Balance: 1,00,000", "Closed Date: -", "Amount Overdue: 0",
+            "Payment History/Asset Classification:", *MONTHS,
+        ]
+        for year in range(2023, 2023 - years, -1):
+            block += [str(year), *(rng.choice(DPD_VALUES) for _ in MONTHS)]
+        block += ["Suit Filed & Wilful Default", "Suit Filed Status: -", "Wilful Defaulter: -"]
+        blocks.append(block)
+    return render(paginate(CRIF_HEADER, [CRIF_INQUIRIES, *blocks], pages), page_header).tobytes()
+
+
+# ---------- CIBIL consumer ----------
+CONSUMER_HEADER = ["CIBIL REPORT", "DATE: 15-01-2024", "CONSUMER NAME: SYNTHETIC PERSON",
+                   "INCOME TAX ID NUMBER (PAN): AAAPZ9876K", "CREDITVISION® SCORE: 745"]
+
+
+def cibil_consumer_report(accounts=20, pages=None, seed=0):
+    """Colab-style layout: one "ACCOUNT INFORMATION" block per account."""
+    rng = random.Random(seed)
+    blocks = []
+    for _ in range(accounts):
+        blocks.append([
+            "ACCOUNT INFORMATION", "ACCOUNT TYPE: Personal Loan", "OWNERSHIP: Individual",
+            "DATE OPENED: 01/02/2020", "DATE CLOSED: ", f"SANCTIONED AMOUNT: {amount(rng, 9)}",
+            "CURRENT BALANCE: 50,000", "HIGH CREDIT AMOUNT: 1,000", "CASH LIMIT: 0", "EMI: 5,000",
+            "ACTUAL PAYMENT: 5,000", "PAYMENT FREQUENCY: Monthly", "STATUS: Standard",
+            "DAYS PAST DUE/ASSET CLASSIFICATION (UP TO 36 MONTHS)",
+            "YEAR JAN FEB MAR",
+            "2023 " + " ".join(rng.choice(["000", "030", "060"]) for _ in range(3)),
+            "2022 " + " ".join(rng.choice(["000", "000", "090"]) for _ in range(3)),
+        ])
+    return render(paginate(CONSUMER_HEADER, blocks, pages)).tobytes()
+
+
+def cibil_consumer_streamlit_report(accounts=10, pages=None, seed=0):
+    """Streamlit-style layout: "STATUS ... ACCOUNT DATES" blocks, closed by "ENQUIRIES:"."""
+    rng = random.Random(seed)
+    blocks = []
+    for _ in range(accounts):
+        blocks.append([
+            "STATUS", "TYPE: Credit Card", "OWNERSHIP: INDIVIDUAL OPENED: 01-02-2020",
+            f"SANCTIONED: {amount(rng, 9)}", "CURRENT BALANCE: 20,000", "EMI: 1,000",
+            "DAYS PAST DUE/ASSET CLASSIFICATION (UP TO 36 MONTHS)",
+            *(rng.choice(["000", "030", "090"]) for _ in range(2)), "ACCOUNT DATES",
+        ])
+    blocks.append(["ENQUIRIES:"])
+    return render(paginate(CONSUMER_HEADER, blocks, pages)).tobytes()
+
+
+# ---------- CIBIL commercial ----------
+COMMERCIAL_HEADER = [
+    "TransUnion CIBIL Company Credit Report", "Name: SYNTHETIC STEEL LIMITED", "Legal Constitution: Public Limited",
+    "Class Of Activity: Manufacturing", "PAN: ABCDE1234F", "Date of Incorporation: 01-Jan-2001",
+    "CIN: L12345MH2001PLC123456", "Registered Office Address: 1 Steel Road", "Mumbai", "Telephone: 123",
+]
+CREDIT_SUMMARY_TABLE = [
+    ["Category", "Lenders", "CF Borr", "CF Guar", "Open CF", "O/S Borr", "O/S Guar", "Latest", "Del Borr", "Del Guar", "Del O/S B", "Del O/S G"],
+    ["Your Institution", "1", "2", "0", "2", "10.5 (20%)", "0", "01-JAN-2023", "0", "0", "0", "0"],
+    ["Other Institution", "3", "5", "1", "4", "40.1 (80%)", "1.0", "05-FEB-2023", "1", "0", "2.0", "0"],
+    ["Total", "4", "7", "1", "6", "50.6", "1.0", "05-FEB-2023", "1", "0", "2.0", "0"],
+]
+ENQUIRY_SUMMARY_TABLE = [
+    ["5. Enquiry Summary", "", ""], ["Purpose", "0-3 Months", "Total"],
+    ["Working Capital", "2", "5"], ["Term Loan", "1", "3"],
+]
+
+
+def cibil_commercial_report(accounts=25, pages=None, tables=True, seed=0):
+    rng = random.Random(seed)
+    blocks = []
+    for n in range(accounts):
+        blocks.append([
+            "10. Credit Facility Details - As Borrower", f"Credit Facility {n + 1}", "Type: Cash Credit",
+            "Last Reported Date", "STD", "31-DEC-2023", "01-JAN-2020", "Sanctioned: 01-JAN-2020",
+            f"Sanctioned INR: {amount(rng)}", "Outstanding Balance: 3,00,000",
+            "Loan Expiry / Maturity: 01-JAN-2025", "Overdue: 0", "Suit Filed: -", "Wilful Default: -",
+        ])
+    # Header alone on page 1 so the tables have room
+    doc = render(paginate(COMMERCIAL_HEADER, blocks, max(pages or 0, 2 if tables else 0)))
+    if tables:
+        while doc.page_count < 2:
+            doc.new_page()
+        draw_table(doc[0], 20, 200, CREDIT_SUMMARY_TABLE, 46)
+        draw_table(doc[1], 300, 500, ENQUIRY_SUMMARY_TABLE, 90)
+    return doc.tobytes()
+
+
+# name -> (report type, generator)
+GENERATORS = {
+    "crif": ("crif_commercial", crif_report),
+    "cibil_consumer": ("cibil_consumer", cibil_consumer_report),
+    "cibil_consumer_st": ("cibil_consumer", cibil_consumer_streamlit_report),
+    "cibil_commercial": ("cibil_commercial", cibil_commercial_report),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("output_dir")
+    parser.add_argument("--accounts", type=int, default=30)
+    parser.add_argument("--pages", type=int, help="minimum page count")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--only", nargs="+", choices=sorted(GENERATORS))
+    args = parser.parse_args()
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    for name in args.only or GENERATORS:
+        _, generate = GENERATORS[name]
+        path = os.path.join(args.output_dir, f"synthetic_{name}_{args.accounts}.pdf")
+        with open(path, "wb") as f:
+            f.write(generate(args.accounts, pages=args.pages, seed=args.seed))
+        print(path)
+
+
+if __name__ == "__main__":
+    main()
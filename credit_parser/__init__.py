@@ -0,0 +1,66 @@
+"""Streamlit-free parsing engine for CRIF and CIBIL credit reports.
+
+Importing the package is cheap: the parser modules (and with them pandas,
+PyMuPDF, PyPDF2) are only imported when a report of that type is parsed.
+
+    from credit_parser import parse
+    report = parse(pdf_bytes)              # bureau/format auto-detected
+    report = parse("report.pdf")           # or a path: memory-mapped, never read into bytes
+    report.sheets["Loan Details"]
+
+Every entry point takes a path, bytes-like object or ``PDFSource``.
+"""
+from importlib import import_module
+
+from .report import Report, report_id
+from .source import PDFSource
+
+# report type -> parser module inside this package
+PARSERS = {
+    "crif_commercial": "crif",
+    "cibil_consumer": "cibil_consumer",
+    "cibil_commercial": "cibil_commercial",
+}
+
+__all__ = ["PARSERS", "PDFSource", "Report", "parse", "detect", "classify", "report_id"]
+
+
+def classify(pdf):
+    """Bureau, kind, layout variant and report type of a PDF (see ``detection.Detection``).
+
+    Only the metadata and first page or two are read; a ``PDFSource``
+    keeps the opened document for the parser.
+    """
+    from .detection import classify as classify_document
+    from .source import using_source
+    with using_source(pdf) as source:
+        return classify_document(source.document())
+
+
+def detect(pdf):
+    """Return the report type of a PDF, or None if no marker matched."""
+    return classify(pdf).report_type
+
+
+def parse(pdf, report_type=None, **options):
+    """Parse a PDF (path, bytes or ``PDFSource``) into a :class:`Report`.
+
+    ``report_type`` is one of ``PARSERS``; when omitted it is detected from
+    the first pages, on the same opened document the parser then reads.
+    Extra keyword options are passed to the parser (e.g. ``table_engine``
+    for the CIBIL commercial summary tables, or ``blocks``, an
+    ``incremental.BlockStore``, to re-parse only changed facilities).
+    """
+    from .source import using_source
+    from .timing import count, stage
+    with using_source(pdf) as source:
+        if report_type is None:
+            with stage("detect"):
+                report_type = detect(source)
+            if report_type is None:
+                raise ValueError("could not detect bureau/format")
+        if report_type not in PARSERS:
+            raise ValueError(f"unknown report type {report_type!r}; expected one of {sorted(PARSERS)}")
+        count("bytes_in", len(source))
+        module = import_module(f".{PARSERS[report_type]}", __name__)
+        return module.parse_report(source, **options)
@@ -0,0 +1,145 @@
+"""Pluggable page-text extraction engines.
+
+Every backend reads the PDF from a ``source.PDFSource`` and exposes
+``page_count`` and ``iter_pages()``, which yields one page's text at a
+time. The PyMuPDF engines use the source's shared document; PyPDF2 and
+pdfminer read one stream of the source, closed with the backend, which is
+a context manager. pdfminer only knows ``page_count`` once its pages have
+been iterated. Engines are picked per report type (``DEFAULT_BACKENDS``)
+and can be overridden per call:
+
+    parse(pdf_bytes, "cibil_consumer", backend="pypdf2")
+
+The CIBIL consumer regexes were written against PyPDF2 output, where words
+sharing a baseline form one line. ``pymupdf-lines`` rebuilds that layout
+from PyMuPDF word boxes, and ``normalize_layout`` evens out whitespace, so
+the consumer parser gives the same rows on any engine. PyPDF2 and
+pdfminer.six are optional and only imported when selected.
+"""
+import re
+
+from .pdf import iter_page_text
+from .source import open_source
+from .timing import stage
+
+
+class Backend:
+    """Closes what the engine opened on leaving a ``with`` block."""
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class PyMuPDFBackend(Backend):
+    """PyMuPDF ``page.get_text()``: one line per text span (CRIF / CIBIL commercial layout)."""
+    name = "pymupdf"
+
+    def __init__(self, source):
+        self.doc = source.document()
+        self.page_count = self.doc.page_count
+
+    def iter_pages(self):
+        return iter_page_text(self.doc)
+
+
+class PyMuPDFLinesBackend(PyMuPDFBackend):
+    """PyMuPDF words regrouped into baseline lines, matching PyPDF2's layout."""
+    name = "pymupdf-lines"
+
+    # Words whose bottom edges are this close (points) share a line
+    BASELINE_TOLERANCE = 2.0
+
+    def iter_pages(self):
+        for page_number in range(self.page_count):
+            page = self.doc.load_page(page_number)
+            words = page.get_text("words")
+            del page
+            yield "\n".join(baseline_lines(words, self.BASELINE_TOLERANCE))
+
+
+class PyPDF2Backend(Backend):
+    name = "pypdf2"
+
+    def __init__(self, source):
+        from PyPDF2 import PdfReader
+        self.stream = source.stream()
+        self.reader = PdfReader(self.stream)
+        self.page_count = len(self.reader.pages)
+
+    def iter_pages(self):
+        for page in self.reader.pages:
+            yield page.extract_text()
+
+    def close(self):
+        self.stream.close()
+
+
+class PDFMinerBackend(Backend):
+    name = "pdfminer"
+
+    def __init__(self, source):
+        self.stream = source.stream()
+        self.page_count = 0  # counted in the one extract_pages pass
+
+    def iter_pages(self):
+        from pdfminer.high_level import extract_pages
+        from pdfminer.layout import LTTextContainer
+        for layout in extract_pages(self.stream):
+            self.page_count += 1
+            yield "".join(el.get_text() for el in layout if isinstance(el, LTTextContainer))
+
+    def close(self):
+        self.stream.close()
+
+
+BACKENDS = {backend.name: backend for backend in (PyMuPDFBackend, PyMuPDFLinesBackend, PyPDF2Backend, PDFMinerBackend)}
+
+DEFAULT_BACKENDS = {
+    "crif_commercial": "pymupdf",
+    "cibil_consumer": "pymupdf-lines",
+    "cibil_commercial": "pymupdf",
+}
+
+
+def open_backend(report_type, source, backend=None):
+    """Open ``source`` (see ``source.open_source``) with ``backend`` or the report type's default engine.
+
+    Use the backend as a context manager so its stream is closed.
+    """
+    name = backend or DEFAULT_BACKENDS[report_type]
+    if name not in BACKENDS:
+        raise ValueError(f"unknown text backend {name!r}; expected one of {sorted(BACKENDS)}")
+    with stage("open"):
+        return BACKENDS[name](open_source(source))
+
+
+# ---------- Layout Normalisation ----------
+def baseline_lines(words, tolerance=2.0):
+    """Join PyMuPDF ``get_text("words")`` tuples into lines, left to right, by baseline."""
+    lines = []
+    current, current_y = [], None
+    for x0, _, _, y1, word, *_ in sorted(words, key=lambda w: (w[3], w[0])):
+        if current_y is not None and y1 - current_y > tolerance:
+            lines.append(current)
+            current = []
+        if not current:
+            current_y = y1
+        current.append((x0, word))
+    if current:
+        lines.append(current)
+    return [" ".join(word for _, word in sorted(line)) for line in lines]
+
+
+HORIZONTAL_SPACE = re.compile(r"[ \t\u00a0\u2000-\u200b\u202f\u3000]+")
+
+
+def normalize_layout(page_text):
+    """Engine-independent page text: single spaces, no trailing blanks, no trailing newlines."""
+    lines = (HORIZONTAL_SPACE.sub(" ", line).rstrip() for line in page_text.split("\n"))
+    return "\n".join(lines).rstrip("\n")
@@ -0,0 +1,150 @@
+"""Content-addressed cache of parsed reports.
+
+Results are keyed by the SHA-256 of the PDF bytes (hashed in place, in the
+caller's buffer or the memory-mapped file; see ``source``), the requested
+report type and ``PARSER_VERSION``, so a re-upload of the same file (or a
+Streamlit rerun) skips parsing entirely while any parser change
+invalidates old entries.
+
+An in-memory LRU holds recent reports; an optional SQLite file persists them
+across server restarts and is shared by batch worker processes.
+"""
+import os
+import pickle
+import sqlite3
+import threading
+from collections import OrderedDict
+
+from .isolation import DEFAULT_MAX_RSS_MB, DEFAULT_TIMEOUT, IsolatedResult, parse_isolated
+from .report import report_id
+from .source import using_source
+from .timing import count
+
+# Bump whenever parser output changes so stale cache entries are ignored.
+PARSER_VERSION = "8"
+
+# Disk store used by default_cache(); unset means memory only.
+CACHE_PATH_ENV = "CREDIT_PARSER_CACHE"
+
+
+# Parser options that only say where to read the PDF from, not what to output
+LOCATION_OPTIONS = {"pdf_path"}
+
+
+def cache_key(source, report_type=None, **options):
+    """Key of a parse result; output-changing options (backend, summary_tables...) are part of it."""
+    with using_source(source) as source:
+        key = f"{PARSER_VERSION}:{report_type or 'auto'}:{report_id(source)}"
+    variant = ",".join(f"{name}={value}" for name, value in sorted(options.items()) if name not in LOCATION_OPTIONS)
+    return f"{key}:{variant}" if variant else key
+
+
+class ReportCache:
+    """Thread-safe LRU of Report objects with an optional SQLite backing store.
+
+    Cached reports are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, max_entries=32, path=None):
+        self.max_entries = max_entries
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        if path:
+            with self._connect() as conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS reports (key TEXT PRIMARY KEY, payload BLOB NOT NULL)"
+                )
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+        if self.path:
+            with self._connect() as conn:
+                row = conn.execute("SELECT payload FROM reports WHERE key = ?", (key,)).fetchone()
+            if row:
+                report = pickle.loads(row[0])
+                self._remember(key, report)
+                with self._lock:
+                    self.hits += 1
+                return report
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, report):
+        self._remember(key, report)
+        if self.path:
+            payload = pickle.dumps(report, protocol=pickle.HIGHEST_PROTOCOL)
+            with self._connect() as conn:
+                conn.execute("INSERT OR REPLACE INTO reports (key, payload) VALUES (?, ?)", (key, payload))
+
+    def _remember(self, key, report):
+        with self._lock:
+            self._entries[key] = report
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        if self.path:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM reports")
+
+    def parse(self, pdf, report_type=None, **options):
+        """Same as ``credit_parser.parse`` but served from the cache when possible."""
+        from . import parse
+
+        with using_source(pdf) as source:
+            key = cache_key(source, report_type, **options)
+            report = self.get(key)
+            if report is not None:
+                count("cache_hits")
+            else:
+                report = parse(source, report_type, **options)
+                self.put(key, report)
+        return report
+
+    def parse_isolated(self, pdf, report_type=None, timeout=DEFAULT_TIMEOUT, max_rss_mb=DEFAULT_MAX_RSS_MB,
+                       label=None, **options):
+        """Same as ``isolation.parse_isolated`` but served from the cache when possible.
+
+        Fallback reports are not stored, so a later parse can still get the full one.
+        """
+        with using_source(pdf) as source:
+            key = cache_key(source, report_type, **options)
+            report = self.get(key)
+            if report is not None:
+                count("cache_hits")
+                return IsolatedResult(report, report_type=report.report_type)
+            result = parse_isolated(source, report_type, timeout=timeout, max_rss_mb=max_rss_mb, label=label,
+                                    **options)
+        if result.report is not None and not result.fallback:
+            self.put(key, result.report)
+        return result
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def default_cache():
+    """Process-wide cache shared by every Streamlit session and rerun.
+
+    Set ``CREDIT_PARSER_CACHE`` to a SQLite file path to persist entries.
+    """
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = ReportCache(path=os.environ.get(CACHE_PATH_ENV) or None)
+        return _default_cache
@@ -0,0 +1,345 @@
+"""CIBIL commercial (CCR) report parsing (no Streamlit dependency).
+
+Summary tables come from PyMuPDF's table finder; camelot is an opt-in
+fallback imported only when requested, so OpenCV is never pulled in by default.
+"""
+import logging
+import re
+from contextlib import nullcontext
+
+import pandas as pd
+
+from .frames import records_frame
+from .incremental import borrower_key
+from .backends import open_backend
+from .page_index import PageIndex, index_document
+from .pdf import iter_text_chunks
+from .records import BorrowerProfile, Facility
+from .report import Report
+from .sections import HEAD, split_sections, stream_sections
+from .source import using_source
+from .timing import count, stage, timed_pages
+
+logger = logging.getLogger(__name__)
+
+# ----------------------------------
+# Borrower Details Extraction
+# ----------------------------------
+def extract_fields(report_text: str) -> BorrowerProfile:
+    data = {}
+
+    # Company Name
+    match = re.search(r'Name:\s*([A-Z\s]+LIMITED)', report_text, re.IGNORECASE)
+    data["name"] = match.group(1).strip() if match else None
+
+    # Legal Constitution
+    match = re.search(r'Legal Constitution:\s*([A-Za-z ]+)', report_text)
+    data["legal_constitution"] = match.group(1).strip() if match else None
+
+    # Class of Activity
+    match = re.search(r'Class Of Activity:\s*([A-Za-z0-9 ,\-]+)', report_text)
+    data["class_of_activity"] = match.group(1).strip() if match else None
+
+    # PAN
+    match = re.search(r'PAN:\s*([A-Z0-9]+)', report_text)
+    data["pan"] = match.group(1).strip() if match else None
+
+    # Date of Incorporation
+    match = re.search(r'Date of Incorporation:\s*([0-9]{2}-[A-Za-z]{3}-[0-9]{4})', report_text)
+    data["date_of_incorporation"] = match.group(1).strip() if match else None
+
+    # CIN/LLPIN
+    match = re.search(r'CIN:\s*([A-Z0-9]+)', report_text)
+    data["cin"] = match.group(1).strip() if match else None
+
+    # Registered Address
+    match = re.search(r'Registered Office Address:\s*(.*?)(?:Telephone|Mobile|Email)', report_text, re.DOTALL)
+    data["registered_address"] = match.group(1).strip().replace("\n", " ") if match else None
+
+    return BorrowerProfile(**data)
+
+PROFILE_LABELS = {
+    'name': 'Company Name', 'legal_constitution': 'Legal Constitution', 'class_of_activity': 'Class of Activity',
+    'pan': 'PAN', 'date_of_incorporation': 'Date of Incorporation', 'cin': 'CIN/LLPIN',
+    'registered_address': 'Regd. Address',
+}
+
+# ----------------------------------
+# Facility Details Extraction
+# ----------------------------------
+FACILITY_FIELDS = {
+    'facility_no': re.compile(r'Credit Facility\s*(\d+)', re.IGNORECASE),
+    'type': re.compile(r'Type:\s+(.*)'),
+    # One line only: the next line starts the "Info. as of" date
+    'asset_classification': re.compile(r'Last Reported Date.*?\n([A-Z]+[ \t]*\d*)', re.IGNORECASE | re.DOTALL),
+    'info_as_of': re.compile(r'(\d{2}-[A-Z]{3}-\d{4}|-)\s*[\n ]+(\d{2}-[A-Z]{3}-\d{4}|-)', re.IGNORECASE),
+    'sanctioned_date': re.compile(r'Sanctioned:\s*(\d{2}-[A-Z]{3}-\d{4}|-)', re.IGNORECASE),
+    'sanctioned_amount': re.compile(r'Sanctioned ((?:INR|USD|EUR):\s*[\d,]+)', re.IGNORECASE),
+    'current_balance': re.compile(r'Outstanding Balance:\s*([\d,]+)', re.IGNORECASE),
+    'closed_date': re.compile(r'Loan Expiry\s*/\s*Maturity:\s*(\d{2}-[A-Z]{3}-\d{4}|-)', re.IGNORECASE),
+    'amount_overdue': re.compile(r'Overdue:\s*([\d,]+)', re.IGNORECASE),
+    'suit_filed': re.compile(r'Suit Filed:\s*(\d{2}-[A-Z]{3}-\d{4}|-)', re.IGNORECASE),
+    'wilful_defaulter': re.compile(r'Wilful Default:\s*(\d{2}-[A-Z]{3}-\d{4}|-)', re.IGNORECASE),
+}
+# Dates and asset classes are normalised to upper case
+FACILITY_UPPER_FIELDS = {'asset_classification', 'info_as_of', 'sanctioned_date', 'closed_date', 'suit_filed', 'wilful_defaulter'}
+
+def extract_facility_details(a, start, end=None):
+    section_a = a[start:end] if end else a[start:]
+    details = Facility()
+    for key, pattern in FACILITY_FIELDS.items():
+        match = pattern.search(section_a)
+        if not match:
+            continue
+        if key in FACILITY_UPPER_FIELDS:
+            setattr(details, key, match.group(1).strip().upper())
+        else:
+            setattr(details, key, match.group(1).strip())
+    return details
+
+# ----------------------------------
+# PDF Table Extraction
+# ----------------------------------
+# Summary tables are read with PyMuPDF from the already open document.
+# Camelot (which needs a file on disk and pulls in OpenCV) is opt-in:
+# "camelot" uses it only, "auto" uses it for tables PyMuPDF did not find.
+TABLE_ENGINES = ("pymupdf", "camelot", "auto")
+
+def extract_tables(doc, page_num):
+    """Tables on a 1-based page as camelot-style DataFrames ('' for empty cells)."""
+    if page_num > doc.page_count:
+        return []
+    try:
+        found = doc.load_page(page_num - 1).find_tables()
+    except Exception as e:
+        logger.warning("Error reading tables on page %d: %s", page_num, e)
+        return []
+    return [pd.DataFrame([[cell if cell is not None else "" for cell in row] for row in table.extract()])
+            for table in found.tables]
+
+def extract_tables_camelot(source, pdf_path=None, pages=(1, 2)):
+    """{page: [DataFrame]} via camelot, reading every page in one call.
+
+    camelot reads ``pdf_path`` or the source's own file; a source held in
+    memory is written to a short-lived file in RAM (see ``PDFSource.file_path``).
+    """
+    import camelot  # heavy (pulls OpenCV); only imported when opted in
+    tables = {page: [] for page in pages}
+    try:
+        with source.file_path() if pdf_path is None else nullcontext(pdf_path) as path:
+            for table in camelot.read_pdf(path, pages=",".join(map(str, pages))):
+                tables.setdefault(int(table.page), []).append(table.df)
+    except Exception as e:
+        logger.warning("Error reading tables with camelot: %s", e)
+    return tables
+
+def find_table(tables, first_cell):
+    """First table whose first column contains ``first_cell``, else None."""
+    for df in tables:
+        if len(df.columns) and (df[df.columns[0]] == first_cell).any():
+            return df
+    return None
+
+# ----------------------------------
+# Facility Table
+# ----------------------------------
+FACILITY_LABELS = {
+    'facility_no': 'Facility_No', 'type': 'Type', 'asset_classification': 'DPD/Asset Classification',
+    'info_as_of': 'Info. as of', 'sanctioned_date': 'Sanctioned Date', 'sanctioned_amount': 'Sanctioned Amount',
+    'current_balance': 'Current Balance', 'closed_date': 'Closed Date', 'amount_overdue': 'Amount Overdue',
+    'suit_filed': 'Suit Filed Status', 'wilful_defaulter': 'Wilful Defaulter',
+}
+FACILITY_AMOUNT_COLUMNS = ['Sanctioned Amount','Current Balance','Amount Overdue']
+FACILITY_DATE_COLUMNS = {'Info. as of': '%d-%b-%Y', 'Sanctioned Date': '%d-%b-%Y', 'Closed Date': '%d-%b-%Y'}
+FACILITY_CATEGORY_COLUMNS = ['Type','DPD/Asset Classification','Sanctioned Currency']
+# "INR: 1,00,000" keeps its code until the frame is built
+FACILITY_CURRENCY_COLUMNS = {'Sanctioned Amount': 'Sanctioned Currency'}
+FACILITY_DPD_COLUMNS = {'DPD/Asset Classification': 'Current DPD'}
+
+FACILITY_MARKER = "10. Credit Facility Details - As Borrower"
+# Identifies a facility across monthly reports (see ``incremental``)
+FACILITY_KEY_FIELDS = ['facility_no', 'sanctioned_date']
+
+def loan_details_frame(records):
+    return records_frame(Facility, records, FACILITY_LABELS, amounts=FACILITY_AMOUNT_COLUMNS,
+                         dates=FACILITY_DATE_COLUMNS, categories=FACILITY_CATEGORY_COLUMNS,
+                         currencies=FACILITY_CURRENCY_COLUMNS, dpd=FACILITY_DPD_COLUMNS)
+
+def parse_loan_details(text):
+    _, sections = split_sections(text, FACILITY_MARKER)
+    return loan_details_frame([parse_facility_section(section) for section in sections])
+
+# ----------------------------------
+# Credit Summary (Page 1 tables)
+# ----------------------------------
+CREDIT_SUMMARY_ANCHOR = 'Your Institution'
+INQUIRY_SUMMARY_ANCHOR = '5. Enquiry Summary'
+# usual page -> first-column cell identifying that page's summary table
+SUMMARY_ANCHORS = {1: CREDIT_SUMMARY_ANCHOR, 2: INQUIRY_SUMMARY_ANCHOR}
+
+def summary_pages(index):
+    """anchor -> 1-based page to look for its table on: where the page index
+    saw the anchor, else the usual page."""
+    pages = {}
+    for usual, anchor in SUMMARY_ANCHORS.items():
+        found = index.first(anchor)
+        pages[anchor] = found + 1 if found is not None else usual
+    return pages
+
+def parse_credit_summary(tables_page1):
+    df = find_table(tables_page1, CREDIT_SUMMARY_ANCHOR)
+    if df is not None:
+        idx = df.loc[df[df.columns[0]] == 'Your Institution'].index[0]
+        # Drop "(...)" shares and blank cells, one vectorised pass per column
+        credit_summary = df.loc[idx:, :].apply(
+            lambda col: col.astype("string").str.replace(r"\([^)]*\)", "", regex=True).str.strip())
+        credit_summary = credit_summary.astype(object).mask(credit_summary == "", None)
+        expanded_rows = []
+        for _, row in credit_summary.iterrows():
+            new_row = list(row)  # start with original row
+            i = 0
+            while i < len(new_row):
+                val = new_row[i]
+                if val is not None and '\n' in str(val):
+                    # Split by newline
+                    parts = [v.strip() for v in str(val).split('\n') if v.strip() != ""]
+                    if len(parts) > 1:
+                        # Insert into current and next None columns
+                        new_row[i] = parts[0]  # first part stays here
+                        j = 1
+                        for part in parts[1:]:
+                            # find next available None column
+                            k = i + j
+                            if k < len(new_row):
+                                while k < len(new_row) and new_row[k] is not None:
+                                    k += 1
+                                # If we ran out of columns, append at the end
+                                if k >= len(new_row):
+                                    new_row.append(part)
+                                else:
+                                    new_row[k] = part
+                                j += 1
+                            else:
+                                new_row.append(part)
+                i += 1
+            expanded_rows.append(new_row)
+    
+        # Find max row length
+        max_len = max(len(r) for r in expanded_rows)
+    
+        # Pad rows with None to normalize
+        for r in expanded_rows:
+            while len(r) < max_len:
+                r.append(None)
+    
+        expanded_credit_summary = pd.DataFrame(expanded_rows)
+        expanded_credit_summary = expanded_credit_summary[expanded_credit_summary.columns[:12]]
+        expanded_credit_summary.columns = [
+            "Category", "Total_Lenders", "Total_CF_Borrower", "Total_CF_Guarantor", "Open_CF",
+            "Total_Outstanding_Borrower", "Total_Outstanding_Guarantor", "Latest_CF_Opened_Date",
+            "Delinquent_CF_Borrower", "Delinquent_CF_Guarantor",
+            "Delinquent_Outstanding_Borrower", "Delinquent_Outstanding_Guarantor"
+        ]
+        credit_summary = expanded_credit_summary
+    else:
+        credit_summary = pd.DataFrame()
+    return credit_summary
+
+# ----------------------------------
+# Inquiry Summary (Page 2 tables)
+# ----------------------------------
+def parse_inquiry_summary(tables_page2):
+    df = find_table(tables_page2, INQUIRY_SUMMARY_ANCHOR)
+    if df is not None:
+        inquiry_summary = df.loc[df.loc[df[df.columns[0]]=='5. Enquiry Summary'].index[0]+1:,:]
+    else:
+        inquiry_summary = pd.DataFrame()
+    return inquiry_summary
+
+# ----------------------------------
+# Headless Entry Point
+# ----------------------------------
+def parse_facility_section(section):
+    return extract_facility_details(section, 0)
+
+def parse_summary_tables(source, pdf_path=None, table_engine="pymupdf", index=None):
+    """{"Credit Summary", "Inquiry Summary"} DataFrames from the summary tables.
+
+    Tables are only looked for on the pages holding their anchors (see
+    ``summary_pages``), on the source's shared PyMuPDF document. ``index``
+    is a ``PageIndex`` of its pages, if any; without one, pages are read
+    only until both anchors have been seen.
+    """
+    if table_engine not in TABLE_ENGINES:
+        raise ValueError(f"unknown table engine {table_engine!r}; expected one of {TABLE_ENGINES}")
+    with using_source(source) as source:
+        with stage("open"):
+            doc = source.document()
+        if index is None:
+            with stage("extract"):
+                index = index_document(doc, SUMMARY_ANCHORS.values())
+        pages = summary_pages(index)
+        with stage("tables"):
+            tables = {anchor: [] for anchor in pages}
+            if table_engine != "camelot":
+                tables = {anchor: extract_tables(doc, page) for anchor, page in pages.items()}
+            missing = [anchor for anchor in pages if find_table(tables[anchor], anchor) is None]
+            if missing and table_engine != "pymupdf":
+                camelot_tables = extract_tables_camelot(source, pdf_path, pages=sorted({pages[anchor] for anchor in missing}))
+                for anchor in missing:
+                    tables[anchor] = camelot_tables[pages[anchor]]
+
+            return {
+                "Credit Summary": parse_credit_summary(tables[CREDIT_SUMMARY_ANCHOR]),
+                "Inquiry Summary": parse_inquiry_summary(tables[INQUIRY_SUMMARY_ANCHOR]),
+            }
+
+def parse_report(source, pdf_path=None, backend=None, table_engine="pymupdf", blocks=None,
+                 summary_tables=True):
+    """Parse a CIBIL commercial report into a Report of {sheet name: DataFrame}.
+
+    ``source`` is a path, bytes or ``PDFSource`` (see ``source.open_source``).
+    ``table_engine`` is one of ``TABLE_ENGINES``; ``pdf_path`` points camelot
+    at a file on disk with the same bytes as an in-memory ``source``.
+    ``backend`` overrides the text engine (see ``backends.BACKENDS``).
+    ``blocks`` is an ``incremental.BlockStore``: unchanged facility sections
+    from the borrower's earlier reports are reused and a "Changes" sheet added.
+    ``summary_tables=False`` leaves out the Credit / Inquiry Summary sheets
+    (table detection is most of the parse time); the UI builds them with
+    ``parse_summary_tables`` only when they are viewed.
+    """
+    if table_engine not in TABLE_ENGINES:
+        raise ValueError(f"unknown table engine {table_engine!r}; expected one of {TABLE_ENGINES}")
+    with using_source(source) as source, open_backend("cibil_commercial", source, backend) as pages:
+        # Pages are streamed: each facility is parsed as soon as the next one
+        # starts. Borrower details precede the first facility (page 1). The page
+        # index records which pages the summary tables are on.
+        head, facilities, session = "", [], None
+        index = PageIndex(SUMMARY_ANCHORS.values())
+        for kind, text in stream_sections(iter_text_chunks(index.scan(timed_pages(pages.iter_pages()))), FACILITY_MARKER):
+            if kind == HEAD:
+                head = text
+                with stage("regex"):
+                    details = extract_fields(head)
+                session = blocks.session("cibil_commercial", borrower_key(details)) if blocks else None
+            else:
+                with stage("regex"):
+                    facilities.append(session.parse(text, parse_facility_section) if session else parse_facility_section(text))
+        count("pages", pages.page_count)
+        count("facilities", len(facilities))
+        with stage("regex"):
+            borrower_details = BorrowerProfile.to_frame([details], PROFILE_LABELS).T.set_axis(["Value"], axis=1)
+
+        with stage("frames"):
+            loan_details = loan_details_frame(facilities)
+
+        sheets = {
+            "Borrower Details": borrower_details,
+            "Loan Details": loan_details,
+        }
+        if summary_tables:
+            # Same PyMuPDF document as the text backend (and detection) read
+            sheets.update(parse_summary_tables(source, pdf_path, table_engine, index=index))
+        if session:
+            sheets["Changes"] = session.finish(FACILITY_KEY_FIELDS, FACILITY_LABELS)
+        return Report("cibil_commercial", sheets, pages=pages.page_count)
@@ -0,0 +1,258 @@
+"""CIBIL consumer report parsing, personal and legacy commercial formats (no Streamlit dependency)."""
+import re
+
+import pandas as pd
+
+from .backends import normalize_layout, open_backend
+from .fields import compile_fields, field_values
+from .frames import format_dates, to_amount, to_dates
+from .records import ConsumerAccount
+from .report import Report
+from .sections import stream_sections
+from .source import using_source
+from .timing import count, stage, timed_pages
+
+# ---------- Helper Functions ----------
+DPD_NUMBER = re.compile(r'\b(\d{3})\b')
+COLAB_DPD_SECTION = re.compile(
+    r'DAYS PAST DUE/ASSET CLASSIFICATION.*?\n(?:YEAR.*\n)((?:.*\n)*?)(?:ACCOUNT|$)', re.IGNORECASE
+)
+
+def extract_max_dpd(block):
+    """Extract maximum DPD from Colab-style personal account block."""
+    dpd_section_match = COLAB_DPD_SECTION.search(block)
+    if not dpd_section_match:
+        return 0
+    dpd_text = dpd_section_match.group(1)
+    dpd_numbers = DPD_NUMBER.findall(dpd_text)
+    dpd_values = [int(x) for x in dpd_numbers]
+    return max(dpd_values) if dpd_values else 0
+
+COLAB_FIELDS = compile_fields({
+    'type': r'ACCOUNT\s*TYPE\s*[:\-]?\s*(.+)',
+    'ownership': r'OWNERSHIP\s*[:\-]?\s*(.+)',
+    'opened': r'DATE OPENED\s*[:\-]?\s*(\d{2}/\d{2}/\d{4})',
+    'closed': r'DATE CLOSED\s*[:\-]?\s*(\d{2}/\d{2}/\d{4})',
+    'sanctioned': r'(?:CREDIT LIMIT|SANCTIONED(?:\s+AMOUNT)?)\s*[:\-]?\s*(.+)',
+    'current_balance': r'BALANCE\s*[:\-]?\s*(.+)',
+    'high_credit': r'HIGH CREDIT\s*AMOUNT\s*[:\-]?\s*(.+)',
+    'cash_limit': r'CASH LIMIT\s*[:\-]?\s*(.+)',
+    'emi': r'EMI\s*[:\-]?\s*(.+)',
+    'actual_payment': r'ACTUAL PAYMENT\s*[:\-]?\s*(.+)',
+    'payment_frequency': r'PAYMENT FREQUENCY\s*[:\-]?\s*(.+)',
+    'status': r'STATUS\s*[:\-]?\s*(.+)',
+}, re.IGNORECASE)
+
+def parse_colab_personal_block(block):
+    """Parse Colab-style personal account block (amounts stay as matched, see ``personal_frame``)."""
+    return ConsumerAccount(**field_values(COLAB_FIELDS, block), max_dpd=extract_max_dpd(block))
+
+def extract_max_dpd_streamlit(block):
+    """
+    Extract maximum DPD from Streamlit-style personal block.
+    Looks for the DAYS PAST DUE section and returns the maximum numeric value.
+    """
+    dpd_section_match = re.search(
+        r'DAYS PAST DUE/ASSET CLASSIFICATION.*?\n((?:\d{3}\s*\n?)+)', block, re.IGNORECASE
+    )
+    if not dpd_section_match:
+        return 0
+    dpd_text = dpd_section_match.group(1)
+    # Extract all 3-digit numbers
+    dpd_numbers = re.findall(r'\b(\d{3})\b', dpd_text)
+    dpd_values = [int(x) for x in dpd_numbers if x.isdigit()]
+    return max(dpd_values) if dpd_values else 0
+
+def parse_streamlit_personal_block(block):
+    """Parse Streamlit-style personal account block."""
+    parsed = ConsumerAccount()
+    type_match = re.search(r'TYPE:\s*(.+)', block, re.IGNORECASE)
+    parsed.type = type_match.group(1).strip() if type_match else ''
+    
+    own_match = re.search(r'OWNERSHIP:\s*(.+?)(?:OPENED|\n|LAST|REPORTED|CLOSED|PMT|$)', block, re.IGNORECASE)
+    parsed.ownership = own_match.group(1).strip() if own_match else ''
+    
+    opened_match = re.search(r'OPENED:\s*(\d{2}-\d{2}-\d{4})', block)
+    parsed.opened = opened_match.group(1).strip() if opened_match else ''
+    
+    closed_match = re.search(r'CLOSED:\s*(.+)', block)
+    parsed.closed = closed_match.group(1).strip() if closed_match else ''
+    
+    san_match = re.search(r'(?:SANCTIONED(?:\s+AMOUNT)?|CREDIT LIMIT)\s*:\s*([\d,]+)', block)
+    parsed.sanctioned = san_match.group(1) if san_match else ''
+    
+    curr_match = re.search(r'CURRENT BALANCE:\s*(-?[\d,]+)', block)
+    parsed.current_balance = curr_match.group(1) if curr_match else ''
+    
+    emi_match = re.search(r'EMI:\s*([\d,]+)', block)
+    parsed.emi = emi_match.group(1) if emi_match else ''
+    
+    parsed.max_dpd = extract_max_dpd_streamlit(block)
+    return parsed
+
+PERSONAL_LABELS = {'type': 'Type of loan', 'ownership': 'Ownership', 'opened': 'Sanction date',
+                   'closed': 'Closed date', 'sanctioned': 'Sanctioned amount',
+                   'current_balance': 'Current balance', 'emi': 'EMI', 'max_dpd': 'Max DPD'}
+PERSONAL_AMOUNT_COLUMNS = ['Sanctioned amount', 'Current balance', 'EMI']
+
+def display_dates(series):
+    """Sanction dates in any of ``frames.DATE_FORMATS`` -> 'DD/MM/YYYY'; others kept as they are."""
+    return format_dates(to_dates(series), "%d/%m/%Y").fillna(series.astype(str))
+
+def numbered(df, customer_name):
+    """Prepend the 'Sr. No.' (from 1) and 'Borrower' columns of the account sheets."""
+    df.insert(0, 'Sr. No.', range(1, len(df) + 1))
+    df.insert(1, 'Borrower', customer_name)
+    return df
+
+def personal_frame(accounts, customer_name):
+    """``ConsumerAccount`` records -> the consumer's sheet; missing amounts are 0."""
+    df = numbered(ConsumerAccount.to_frame(accounts, PERSONAL_LABELS), customer_name)
+    df.insert(df.columns.get_loc('Max DPD'), 'Status', df['Closed date'].eq('').map({True: "Active", False: "Closed"}))
+    for col in PERSONAL_AMOUNT_COLUMNS:
+        df[col] = to_amount(df[col]).fillna(0)
+    df['Sanction date'] = display_dates(df['Sanction date'])
+    return df
+
+CORPORATE_FIELDS = compile_fields({
+    'type': r'Type:\s*(.+)',
+    'opened': r'Sanctioned:\s*(\d{2}-[A-Za-z]{3}-\d{4})',
+    'sanctioned': r'Sanctioned INR:\s*([\d,]+)',
+    'current_balance': r'Outstanding Balance:\s*(-?[\d,]+)',
+    'emi': r'Installment Amount:\s*([\d,]+)',
+    'overdue': r'Overdue:\s*(-?[\d,]+)'
+}, re.IGNORECASE)
+
+def parse_corporate(data_str):
+    """Parse one Credit Facility Details block of a commercial report."""
+    return ConsumerAccount(**field_values(CORPORATE_FIELDS, data_str))
+
+CORPORATE_LABELS = {'type': 'Type of loan', 'opened': 'Sanction date (DD/MM/YYYY)',
+                    'sanctioned': 'Sanction amount (INR)/ CC outstanding Amount', 'emi': 'Monthly EMI (INR)',
+                    'current_balance': 'Current outstanding (INR)', 'overdue': 'Overdue Amount'}
+CORPORATE_COLUMNS = ['Sr. No.', 'Borrower', 'Type of loan', 'Sanction date (DD/MM/YYYY)',
+                     'Sanction amount (INR)/ CC outstanding Amount', 'Monthly EMI (INR)',
+                     'Current outstanding (INR)', 'Overdue Amount']
+CORPORATE_AMOUNT_COLUMNS = CORPORATE_COLUMNS[4:]
+
+def corporate_frame(accounts, customer_name):
+    df = numbered(ConsumerAccount.to_frame(accounts, CORPORATE_LABELS), customer_name)
+    for col in CORPORATE_AMOUNT_COLUMNS:
+        df[col] = to_amount(df[col])
+    df['Sanction date (DD/MM/YYYY)'] = display_dates(df['Sanction date (DD/MM/YYYY)'])
+    return df
+
+# ---------- Headless Entry Point ----------
+ACCOUNT_MARKER = 'ACCOUNT INFORMATION'
+# Identify an account across monthly reports (see ``incremental``)
+PERSONAL_KEY_FIELDS = ['type', 'ownership', 'opened']
+CORPORATE_KEY_FIELDS = ['type', 'opened']
+PAN_NUMBER = re.compile(r'\b([A-Z]{5}\d{4}[A-Z])\b')
+REPORT_DATE = re.compile(r'\bDATE\s*:\s*(\d{2}[-/]\d{2}[-/]\d{4}|\d{2}-[A-Za-z]{3}-\d{4})', re.IGNORECASE)
+
+def extract_pan(text):
+    """First PAN-shaped id in the report header, else None."""
+    match = PAN_NUMBER.search(text)
+    return match.group(1) if match else None
+
+def extract_report_date(text):
+    """The report's own "DATE:" as printed (e.g. '15-03-2024'), else None."""
+    match = REPORT_DATE.search(text)
+    return match.group(1) if match else None
+
+def parse_personal_section(section):
+    return parse_colab_personal_block(section[len(ACCOUNT_MARKER):])
+
+def iter_page_text(pages):
+    """Yield each page's layout-normalised text (newline-terminated) one page at a time."""
+    for text in timed_pages(pages.iter_pages()):
+        yield normalize_layout(text) + "\n"
+
+def parse_report(source, backend=None, blocks=None):
+    """Parse a CIBIL report into a Report of {sheet name: DataFrame}.
+
+    ``source`` is a path, bytes or ``PDFSource`` (see ``source.open_source``).
+    The "Summary" sheet holds the name, score, PAN and report date (as
+    printed, None when absent). Commercial reports give a "Corporate_Entity"
+    sheet; personal reports give a sheet named after the consumer (truncated to Excel's 31 characters).
+    ``backend`` overrides the text engine (see ``backends.BACKENDS``).
+    ``blocks`` is an ``incremental.BlockStore``: unchanged account blocks from
+    the borrower's earlier reports (matched by PAN) are reused and a
+    "Changes" sheet added.
+    """
+    with using_source(source) as source, open_backend("cibil_consumer", source, backend) as pages:
+        # Pages are streamed and split at "ACCOUNT INFORMATION": Colab-style
+        # account blocks are parsed as they close. The head (everything before
+        # the first block) holds the name/score; without any block it is the
+        # whole text, which the other formats need.
+        sections = stream_sections(iter_page_text(pages), ACCOUNT_MARKER)
+        _, head = next(sections)
+
+        summary_rows = []
+
+        # ---------------- CORPORATE REPORT HANDLING ----------------
+        if 'COMMERCIAL CREDIT INFORMATION REPORT' in head:
+            full_text = head + "".join(text for _, text in sections)
+            with stage("regex"):
+                name_match = re.search(r'Name of Borrower\s*[:\-]?\s*(.+)', full_text)
+                if not name_match:
+                    name_match = re.search(r'Name:\s*[:\-]?\s*(.+)', full_text)
+                customer_name = name_match.group(1).strip() if name_match else "Unknown Entity"
+
+                cmr = re.search(r'CMR-\s*([\d,]+)', full_text)
+                cmr_score = cmr.group(1) if cmr else "None"
+                pan = extract_pan(full_text)
+                summary_rows.append({'Name': customer_name, 'Score': cmr_score, 'PAN': pan,
+                                     'Report Date': extract_report_date(head)})
+
+                session = blocks.session("cibil_consumer", pan) if blocks else None
+                matches = re.findall(r'Credit Facility Details(.*?)Overdue Details', full_text, re.DOTALL)
+                facilities = [session.parse(entry, parse_corporate) if session else parse_corporate(entry)
+                              for entry in matches]
+            count("pages", pages.page_count)
+            count("facilities", len(facilities))
+
+            with stage("frames"):
+                sheets = {
+                    "Summary": pd.DataFrame(summary_rows),
+                    "Corporate_Entity": corporate_frame(facilities, customer_name),
+                }
+            if session:
+                sheets["Changes"] = session.finish(CORPORATE_KEY_FIELDS, CORPORATE_LABELS)
+            return Report("cibil_consumer", sheets, pages=pages.page_count)
+
+        # ---------------- PERSONAL REPORT HANDLING ----------------
+        # Consumer Name & Score
+        with stage("regex"):
+            name_match = re.search(r'CONSUMER NAME\s*[:\-]?\s*(.+)|CONSUMER:\s*[:\-]?\s*(.+)', head, re.IGNORECASE)
+            customer_name = (name_match.group(1).strip() if name_match and name_match.group(1)else name_match.group(2).strip() if name_match and name_match.group(2)else "Unknown Individual")
+            score_match = re.search(r'CREDITVISION® SCORE\s*[:\-]?\s*(\d{3})', head, re.IGNORECASE)
+            pscore = score_match.group(1) if score_match else "None"
+            pan = extract_pan(head)
+            summary_rows.append({'Name': customer_name, 'Score': pscore, 'PAN': pan,
+                                 'Report Date': extract_report_date(head)})
+        session = blocks.session("cibil_consumer", pan) if blocks else None
+
+        # Detect personal report format
+        accounts = []
+        for _, section in sections:
+            with stage("regex"):
+                accounts.append(session.parse(section, parse_personal_section) if session else parse_personal_section(section))
+        if not accounts:
+            # No ACCOUNT INFORMATION block, so head is the full text
+            with stage("regex"):
+                matches = re.findall(r'STATUS(.*?)(?:ACCOUNT DATES|ENQUIRIES:)', head, re.DOTALL)
+                for block in matches:
+                    accounts.append(session.parse(block, parse_streamlit_personal_block) if session
+                                    else parse_streamlit_personal_block(block))
+        count("pages", pages.page_count)
+        count("facilities", len(accounts))
+
+        with stage("frames"):
+            sheets = {
+                "Summary": pd.DataFrame(summary_rows),
+                f"{customer_name}"[:31]: personal_frame(accounts, customer_name),
+            }
+        if session:
+            sheets["Changes"] = session.finish(PERSONAL_KEY_FIELDS, PERSONAL_LABELS)
+        return Report("cibil_consumer", sheets, pages=pages.page_count)
@@ -0,0 +1,265 @@
+"""CRIF commercial report parsing (no Streamlit dependency)."""
+import re
+
+import pandas as pd
+
+from .fields import compile_fields, field_values
+from .frames import records_frame
+from .history import history_cells, payment_history_frame, payment_history_metrics
+from .incremental import borrower_key
+from .backends import open_backend
+from .page_index import PageIndex
+from .pdf import iter_text_chunks
+from .records import BorrowerProfile, Facility, Inquiry
+from .report import Report
+from .sections import HEAD, split_sections, stream_sections
+from .source import using_source
+from .timing import count, stage, timed_pages
+
+# ------------------- Helper Functions -------------------
+
+def extract_summary_section(text, start_label, end_label):
+    pattern = rf'{start_label}(.*?){end_label}'
+    match = re.search(pattern, text, re.DOTALL)
+    return match.group(1).strip() if match else None
+
+PROFILE_LABELS = {
+    'name': 'Company Name', 'legal_constitution': 'Legal Constitution', 'class_of_activity': 'Class of Activity',
+    'pan': 'PAN', 'date_of_incorporation': 'Date of Incorporation', 'cin': 'CIN/LLPIN',
+    'loan_amount_applied': 'Loan Amt. Applied for', 'registered_address': 'Regd. Address',
+    'score_details': 'CRIF_Score_Details', 'score_tip': 'Benchmark Score Tip',
+}
+
+def extract_borrower_details(text):
+    details = {}
+    details['name'] = re.search(r'Name:\s+(.*)', text)
+    details['legal_constitution'] = re.search(r'Legal Constitution:\s+(.*)', text)
+    details['class_of_activity'] = re.search(r'Class of Activity:\s+(.*)', text)
+    details['pan'] = re.search(r'PAN:\s+([A-Z]{5}\d{4}[A-Z])', text)
+    details['date_of_incorporation'] = re.search(r'Date of Incorporation:\s+(\d{2}-\d{2}-\d{4})', text)
+    details['cin'] = re.search(r'CIN/LLPIN:\s+([^\s]+)', text)
+    details['loan_amount_applied'] = re.search(r'Applied Amount:\s+([^\s]+)', text)
+    details = {k: v.group(1).strip() if v else None for k, v in details.items()}
+
+    details['registered_address'] = extract_summary_section(text,"Registered:","GSTIN:").replace('\n',' ') if extract_summary_section(text,"Registered:","GSTIN:") else None
+    details['score_details'] = extract_summary_section(text,"DESCRIPTION","Tip").replace('\n',' ') if extract_summary_section(text,"DESCRIPTION","Tip") else None
+    details['score_tip'] = extract_summary_section(text,"Tip:","CRIF HM").replace('\n',' ') if extract_summary_section(text,"Tip:","CRIF HM") else None
+    return BorrowerProfile(**details)
+
+def payment_history_parser(data):
+    """Payment history block -> list of "Mon YEAR value" strings (see ``history``)."""
+    return history_cells(data)
+
+LOAN_LABELS = {
+    'facility_no': 'Loan Terms For', 'type': 'Type', 'asset_classification': 'DPD/Asset Classification',
+    'info_as_of': 'Info. as of', 'sanctioned_date': 'Sanctioned Date', 'sanctioned_amount': 'Sanctioned Amount',
+    'current_balance': 'Current Balance', 'closed_date': 'Closed Date', 'amount_overdue': 'Amount Overdue',
+    'suit_filed': 'Suit Filed Status', 'wilful_defaulter': 'Wilful Defaulter',
+    'payment_history': 'Payment History/Asset Classification',
+}
+LOAN_KEYS = list(LOAN_LABELS.values())[:-1]
+LOAN_COLUMNS = list(LOAN_LABELS.values())
+LOAN_AMOUNT_COLUMNS = ['Sanctioned Amount','Current Balance','Amount Overdue']
+LOAN_DATE_COLUMNS = {'Info. as of': '%d-%m-%Y', 'Sanctioned Date': '%d-%m-%Y', 'Closed Date': '%d-%m-%Y'}
+LOAN_CATEGORY_COLUMNS = ['Type','DPD/Asset Classification']
+LOAN_DPD_COLUMNS = {'DPD/Asset Classification': 'Current DPD'}
+LOAN_FIELDS = compile_fields({field: rf'{label}:\s*(.*)' for field, label in LOAN_LABELS.items() if label in LOAN_KEYS})
+PAYMENT_HISTORY_SECTION = re.compile(r'Payment History/Asset Classification:(.*?)Suit Filed & Wilful Default', re.DOTALL)
+
+LOAN_MARKER = "Loan Terms For:"
+# Identifies a loan across monthly reports (see ``incremental``)
+LOAN_KEY_FIELDS = ['facility_no']
+
+# Section headings the summary parsers start / stop at; each parser only
+# scans the pages from its start heading to its end heading
+BORROWER_SUMMARY = "Borrower Summary"
+CREDIT_PROFILE_SUMMARY = "Credit Profile Summary"
+ADDITIONAL_STATUS = "Additional Status"
+INQUIRIES = "Inquiries (reported for past 24 months)"
+ADDITIONAL_INQUIRIES = "Additional Inquiry Details"
+SECTION_MARKERS = [BORROWER_SUMMARY, CREDIT_PROFILE_SUMMARY, ADDITIONAL_STATUS, INQUIRIES, ADDITIONAL_INQUIRIES]
+
+def parse_loan_section(section):
+    """One "Loan Terms For:" section -> ``Facility``."""
+    match = PAYMENT_HISTORY_SECTION.search(section)
+    history = match.group(1).strip() if match else None
+    return Facility(**field_values(LOAN_FIELDS, section, default=None),
+                    payment_history=payment_history_parser(history) if history else None)
+
+def loan_details_frame(records):
+    return records_frame(Facility, records, LOAN_LABELS, amounts=LOAN_AMOUNT_COLUMNS,
+                         dates=LOAN_DATE_COLUMNS, categories=LOAN_CATEGORY_COLUMNS, dpd=LOAN_DPD_COLUMNS)
+
+def with_payment_history(loans):
+    """Loan Details -> (Loan Details plus DPD metrics, long-format payment history)."""
+    history = payment_history_frame(loans)
+    metrics = payment_history_metrics(history)
+    loans = loans.join(metrics)
+    loans[metrics.columns[1]] = loans[metrics.columns[1]].fillna(0).astype("int16")
+    return loans, history
+
+def parse_loan_details(text):
+    _, sections = split_sections(text, LOAN_MARKER)
+    return with_payment_history(loan_details_frame([parse_loan_section(section) for section in sections]))[0]
+
+def parse_inquiry_summary(text):
+    a = text.split('\n')
+    try:
+        inquiry_initial_index = [i for i in range(len(a)) if a[i] == INQUIRIES][0]
+        inquiry_end_index = [i for i in range(len(a)) if a[i] == ADDITIONAL_INQUIRIES][0]
+    except IndexError:
+        return pd.DataFrame()
+    inquiry_list = a[inquiry_initial_index+1:inquiry_end_index]
+    data_list = inquiry_list
+    headers = data_list[:6]
+    data = data_list[6:]
+    records = []
+    current = []
+    for item in data:
+        if item == 'XXXX' and current:
+            records.append(current)
+            current = []
+        current.append(item)
+    if current: records.append(current)
+    for i, r in enumerate(records):
+        if len(r) < len(headers):
+            records[i] = r + [None]*(len(headers)-len(r))
+        elif len(r) > len(headers):
+            records[i] = r[:len(headers)]
+    records = [Inquiry(*r) for r in records]
+    return Inquiry.to_frame(records).iloc[:, :len(headers)].set_axis(headers, axis=1)
+
+def parse_borrower_summary(text):
+    # Similar to raw code: Your Institution / Other Institution parsing
+    text_input = extract_summary_section(text, BORROWER_SUMMARY, CREDIT_PROFILE_SUMMARY)
+    if not text_input: return pd.DataFrame()
+    columns = ["Type","Lender","Total Accts","Live Accts","Delinquent Accts","Sanctioned Amt","Outstanding Amt","Overdue Amt","PAR (90+)"]
+    lines = text_input.strip().split('\n')
+    data_rows = []
+    your_inst = next((i for i,l in enumerate(lines) if l=="Your Institution"), -1)
+    other_inst = next((i for i,l in enumerate(lines) if l=="Other Institution"), -1)
+    if your_inst!=-1:
+        data_rows.append([
+            lines[your_inst].strip(),
+            int(lines[your_inst+1].strip()),
+            int(lines[your_inst+2].strip()),
+            int(lines[your_inst+3].strip()),
+            int(lines[your_inst+4].strip()),
+            lines[your_inst+5].strip(),
+            float(lines[your_inst+6].strip()),
+            float(lines[your_inst+7].strip()),
+            float(lines[your_inst+8].strip())
+        ])
+    if other_inst!=-1:
+        data_rows.append([
+            lines[other_inst].strip(),
+            int(lines[other_inst+1].strip()),
+            int(lines[other_inst+2].strip()),
+            int(lines[other_inst+3].strip()),
+            lines[other_inst+4].strip(),
+            lines[other_inst+5].strip(),
+            float(lines[other_inst+6].strip()),
+            float(lines[other_inst+7].strip()),
+            float(lines[other_inst+8].strip())
+        ])
+    df = pd.DataFrame(data_rows, columns=columns)
+    # "10.5 (40%)" -> value and share, one vectorised pass per column
+    sanctioned = df['Sanctioned Amt'].astype(str)
+    df['Sanctioned Amt (Value)'] = pd.to_numeric(sanctioned.str.extract(r'(\d+\.?\d*)', expand=False), errors="coerce")
+    df['Sanctioned Amt (Percentage)'] = pd.to_numeric(sanctioned.str.extract(r'\((\d+)%\)', expand=False), errors="coerce")
+    return df.drop(columns=['Sanctioned Amt'])
+
+def parse_credit_summary(text):
+    text_input = extract_summary_section(text, CREDIT_PROFILE_SUMMARY, ADDITIONAL_STATUS)
+    if not text_input: return pd.DataFrame()
+    text_input = text_input.split('(%) represents utilization')[0]
+    asset_classes = ['STD','SMA','SUB','DBT','LOS']
+    inquiry_periods = ['<3 m','3-6 m','6-9 m','9-12 m','>12 m']
+    facilities = ['Working Cap','Term Loan','Non-Funded','Forex','OTHERS']
+    columns = ['Institution','Credit Facility']
+    for cls in asset_classes:
+        columns.extend([f'{cls} Acct(#)',f'{cls} O/S Amt'])
+    columns.extend([f'Inquiries {p}' for p in inquiry_periods])
+    sections = re.split(r'(Your Institution|Other Institution)', text_input)
+    data=[]
+    for i in range(1,len(sections),2):
+        inst=sections[i].strip()
+        content=sections[i+1].strip().splitlines()
+        content=[val for val in content if not re.fullmatch(r"\(\d+(\.\d+)?%\)",val)]
+        current=[]
+        for line in content:
+            line=line.strip()
+            if line in facilities:
+                if current:
+                    numbers=[item for item in current if item not in ('')]
+                    row=[inst,facility]
+                    for j in range(5):
+                        acct=numbers[j*2] if len(numbers)>j*2 else '-'
+                        amt=numbers[j*2+1] if len(numbers)>j*2+1 else '-'
+                        row.extend([acct,amt])
+                    inquiries=numbers[10:15]
+                    while len(inquiries)<5: inquiries.append('-')
+                    row.extend(inquiries)
+                    data.append(row)
+                    current=[]
+                facility=line
+            elif line: current.append(line)
+        if current:
+            numbers=[item for item in current]
+            row=[inst,facility]
+            for j in range(5):
+                acct=numbers[j*2] if len(numbers)>j*2 else '-'
+                amt=numbers[j*2+1] if len(numbers)>j*2+1 else '-'
+                row.extend([acct,amt])
+            inquiries=numbers[10:15]
+            while len(inquiries)<5: inquiries.append('-')
+            row.extend(inquiries)
+            data.append(row)
+    return pd.DataFrame(data,columns=columns)
+
+# ------------------- Headless Entry Point -------------------
+
+def parse_report(source, backend=None, blocks=None):
+    """Parse a CRIF commercial report into a Report of {sheet name: DataFrame}.
+
+    ``source`` is a path, bytes or ``PDFSource`` (see ``source.open_source``).
+    ``backend`` overrides the text engine (see ``backends.BACKENDS``).
+    ``blocks`` is an ``incremental.BlockStore``: unchanged loan sections from
+    the borrower's earlier reports are reused and a "Changes" sheet added.
+    """
+    with using_source(source) as source, open_backend("crif_commercial", source, backend) as pages:
+        # Pages are streamed: each loan section is parsed as soon as the next one
+        # starts and its text dropped. The borrower/summary/inquiry sections all
+        # precede the first "Loan Terms For:"; the page index keeps those pages
+        # and tells each summary parser which of them to scan.
+        head, loans, session = "", [], None
+        index = PageIndex(SECTION_MARKERS, keep_until=LOAN_MARKER)
+        for kind, text in stream_sections(iter_text_chunks(index.scan(timed_pages(pages.iter_pages()))), LOAN_MARKER):
+            if kind == HEAD:
+                head = text
+                with stage("regex"):
+                    details = extract_borrower_details(head)
+                session = blocks.session("crif_commercial", borrower_key(details)) if blocks else None
+            else:
+                with stage("regex"):
+                    loans.append(session.parse(text, parse_loan_section) if session else parse_loan_section(text))
+        count("pages", pages.page_count)  # known once every page is read (pdfminer)
+        count("facilities", len(loans))
+        with stage("frames"):
+            loan_details, payment_history = with_payment_history(loan_details_frame(loans))
+        with stage("regex"):
+            borrower_details = BorrowerProfile.to_frame([details], PROFILE_LABELS).T
+            borrower_summary = parse_borrower_summary(index.text(BORROWER_SUMMARY, CREDIT_PROFILE_SUMMARY))
+            credit_summary = parse_credit_summary(index.text(CREDIT_PROFILE_SUMMARY, ADDITIONAL_STATUS))
+            inquiry_summary = parse_inquiry_summary(index.text(INQUIRIES, ADDITIONAL_INQUIRIES))
+        sheets = {
+            "Borrower Details": borrower_details,
+            "Borrower Summary": borrower_summary,
+            "Credit Summary": credit_summary,
+            "Loan Details": loan_details,
+            "Inquiry Summary": inquiry_summary,
+            "Payment History": payment_history,
+        }
+        if session:
+            sheets["Changes"] = session.finish(LOAN_KEY_FIELDS, LOAN_LABELS)
+        return Report("crif_commercial", sheets, pages=pages.page_count)
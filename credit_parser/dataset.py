@@ -0,0 +1,157 @@
+"""Append-only Parquet dataset of parsed reports for portfolio analytics.
+
+Each report's sheets are mapped onto a few shared tables, and every row
+carries the report's stable ``report_id`` (``credit_parser.report_id``,
+the SHA-256 of the PDF bytes):
+
+    borrowers, borrower_summary, credit_summary, facilities,
+    inquiries, payment_history, changes
+
+The files are laid out as hive partitions by bureau and report date:
+
+    <root>/<table>/bureau=CRIF/report_date=2024-03-31/part-<uuid>.parquet
+
+Every ``append_reports`` call adds new files and never rewrites existing
+ones, so batch runs can keep appending to the same root (skipping ids in
+``existing_report_ids``). Column names are
+snake_case. ``facilities.loan`` and ``payment_history.loan`` give the
+facility's position in its report, so the two tables join on
+(report_id, loan). Requires pyarrow.
+"""
+import datetime
+import re
+import uuid
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from .report import BUREAUS
+
+# sheet name -> table; the CIBIL consumer account sheet is named after the
+# consumer, so any sheet not listed here becomes "facilities"
+SHEET_TABLES = {
+    "Borrower Details": "borrowers",
+    "Summary": "borrowers",
+    "Borrower Summary": "borrower_summary",
+    "Credit Summary": "credit_summary",
+    "Loan Details": "facilities",
+    "Inquiry Summary": "inquiries",
+    "Payment History": "payment_history",
+    "Changes": "changes",
+}
+TABLES = sorted(set(SHEET_TABLES.values()))
+
+# Facility "as of" columns; the latest one dates the report
+AS_OF_COLUMNS = ["info_as_of"]
+
+NON_WORD = re.compile(r"[^0-9a-zA-Z]+")
+
+
+def column_name(name, position):
+    """'DPD/Asset Classification' -> 'dpd_asset_classification'; blanks -> 'column_<n>'."""
+    name = NON_WORD.sub("_", str(name)).strip("_").lower()
+    return name or f"column_{position}"
+
+
+def _table_frame(sheet_name, table, df):
+    if sheet_name == "Borrower Details":
+        # Stored transposed (field -> value); one row per report in the dataset
+        df = df.iloc[:, [0]].T.reset_index(drop=True)
+    elif table in ("facilities", "payment_history"):
+        df = df.rename_axis("loan").reset_index()
+    else:
+        df = df.reset_index(drop=True)
+    df.columns = [column_name(c, i) for i, c in enumerate(df.columns)]
+    for col in df.columns[df.dtypes == object]:
+        # Mixed str/float object columns do not convert; lists (payment history cells) do
+        if not df[col].map(lambda v: isinstance(v, list)).any():
+            df[col] = df[col].astype("string")
+    return df
+
+
+def report_tables(report, rid):
+    """Report -> {table: DataFrame} with report_id / report_type columns added."""
+    tables = {}
+    for sheet_name, df in report.sheets.items():
+        table = SHEET_TABLES.get(sheet_name, "facilities")
+        frame = _table_frame(sheet_name, table, df)
+        frame.insert(0, "report_type", report.report_type)
+        frame.insert(0, "report_id", rid)
+        tables[table] = frame
+    return tables
+
+
+def report_date(tables):
+    """Latest facility "as of" date in the report; today if it has none."""
+    facilities = tables.get("facilities")
+    for col in AS_OF_COLUMNS:
+        if facilities is not None and col in facilities:
+            latest = pd.to_datetime(facilities[col], errors="coerce").max()
+            if pd.notna(latest):
+                return latest.date().isoformat()
+    return datetime.date.today().isoformat()
+
+
+def append_reports(root, reports):
+    """Append (report_id, Report) pairs; one new file per table and partition.
+
+    Returns the paths written.
+    """
+    partitions = {}  # (table, bureau, date) -> [DataFrame]
+    for rid, report in reports:
+        tables = report_tables(report, rid)
+        key = (BUREAUS.get(report.report_type, "UNKNOWN"), report_date(tables))
+        for table, frame in tables.items():
+            if len(frame):
+                partitions.setdefault((table, *key), []).append(frame)
+
+    written = []
+    for (table, bureau, date), frames in sorted(partitions.items()):
+        directory = Path(root) / table / f"bureau={bureau}" / f"report_date={date}"
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"part-{uuid.uuid4().hex}.parquet"
+        frame = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+        pq.write_table(pa.Table.from_pandas(frame, preserve_index=False), path)
+        written.append(path)
+    return written
+
+
+def existing_report_ids(root):
+    """report_ids already in the dataset (every report has a borrowers row)."""
+    if not (Path(root) / "borrowers").is_dir():
+        return set()
+    return set(ds.dataset(Path(root) / "borrowers", format="parquet", partitioning="hive")
+               .to_table(columns=["report_id"]).column("report_id").to_pylist())
+
+
+def _unified_schema(dataset):
+    """One schema over every file: numeric/timestamp types widen, other clashes read as strings."""
+    types = {}
+    for fragment in dataset.get_fragments():
+        for field in fragment.physical_schema:
+            types.setdefault(field.name, []).append(field.type)
+    fields = []
+    for name, candidates in types.items():
+        try:
+            fields.append(pa.unify_schemas([pa.schema([(name, t)]) for t in candidates],
+                                           promote_options="permissive").field(0))
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            # e.g. a date parsed by one bureau's parser but kept as text by another
+            fields.append(pa.field(name, pa.large_string()))
+    return pa.schema(fields + list(dataset.partitioning.schema))
+
+
+def read_table(root, table, filter=None, columns=None):
+    """Read one table back as a DataFrame; bureau and report_date come from the partitions.
+
+    Schemas differ between report types (e.g. CRIF vs CIBIL facilities), so
+    missing columns read as nulls. ``filter`` is a pyarrow.dataset
+    expression, e.g. ``ds.field("bureau") == "CRIF"``.
+    """
+    path = Path(root) / table
+    dataset = ds.dataset(path, format="parquet", partitioning="hive")
+    dataset = ds.dataset(path, schema=_unified_schema(dataset), format="parquet", partitioning="hive")
+    return dataset.to_table(columns=columns, filter=filter).to_pandas()
@@ -0,0 +1,87 @@
+"""Bureau / format detection from the opening pages of a report.
+
+``classify`` reads the document metadata and page 1 only, falling back to
+page 2 when page 1 has no decisive marker, so dispatch costs a few
+milliseconds instead of a full text extraction.
+"""
+import re
+from dataclasses import dataclass
+
+# Layout variants of CIBIL consumer-parser input
+COLAB = "colab"            # "ACCOUNT INFORMATION" blocks
+STREAMLIT = "streamlit"    # "STATUS ... ACCOUNT DATES" blocks
+CORPORATE = "corporate"    # legacy "COMMERCIAL CREDIT INFORMATION REPORT"
+
+STREAMLIT_MARKER = re.compile(r"^STATUS\s*$|ACCOUNT DATES|ENQUIRIES:", re.MULTILINE)
+
+MAX_PAGES = 2
+
+
+@dataclass
+class Detection:
+    """What a report is, and which parser handles it (``report_type``)."""
+    bureau: str = None       # "CRIF" / "CIBIL"
+    kind: str = None         # "consumer" / "commercial"
+    layout: str = None       # COLAB / STREAMLIT / CORPORATE for the consumer parser
+    report_type: str = None  # key of credit_parser.PARSERS, None if unrecognised
+    pages_read: int = 0
+
+
+def _metadata_text(doc):
+    return " ".join(str(v) for v in (doc.metadata or {}).values() if v)
+
+
+def _classify_text(text):
+    upper = text.upper()
+    if "CRIF" in upper or "Loan Terms For:" in text:
+        return Detection("CRIF", "commercial", report_type="crif_commercial")
+    if "COMMERCIAL CREDIT INFORMATION REPORT" in upper:
+        # Legacy commercial layout is handled by the consumer parser
+        return Detection("CIBIL", "commercial", CORPORATE, "cibil_consumer")
+    if "CONSUMER" in upper or "CREDITVISION" in upper:
+        return Detection("CIBIL", "consumer", _consumer_layout(text), "cibil_consumer")
+    if "Credit Facility Details" in text or "CIBIL" in upper or "TRANSUNION" in upper:
+        return Detection("CIBIL", "commercial", report_type="cibil_commercial")
+    return Detection()
+
+
+def _decided(detection, text):
+    """True when reading more pages cannot change the answer."""
+    if detection.kind == "consumer":
+        return detection.layout is not None
+    if detection.report_type == "cibil_commercial":
+        # A bare CIBIL/TransUnion mention; consumer markers may follow
+        return "Credit Facility Details" in text
+    return detection.report_type is not None
+
+
+def _consumer_layout(text):
+    if "ACCOUNT INFORMATION" in text:
+        return COLAB
+    if STREAMLIT_MARKER.search(text):
+        return STREAMLIT
+    return None
+
+
+def classify(doc, max_pages=MAX_PAGES):
+    """Classify an open fitz document from its metadata and first page(s).
+
+    Page 2 is only read when page 1 leaves the report type or the consumer
+    layout undecided.
+    """
+    text = _metadata_text(doc)
+    detection = Detection()
+    for page_number in range(min(max_pages, doc.page_count)):
+        page = doc.load_page(page_number)
+        text += "\n" + page.get_text()
+        del page
+        detection = _classify_text(text)
+        detection.pages_read = page_number + 1
+        if _decided(detection, text):
+            break
+    return detection
+
+
+def detect_report_type(doc):
+    """Guess the parser (report type) for an open fitz document, or None."""
+    return classify(doc).report_type
@@ -0,0 +1,111 @@
+"""Streaming Excel export of parsed reports.
+
+Sheets are written with xlsxwriter in ``constant_memory`` mode: rows go out
+one at a time, sheet after sheet, and only the current row is held in
+memory, however many reports end up in the workbook. ``target`` is a path
+or a writable binary file (a temp file, an HTTP response body), so there
+is no need for a full in-memory ``BytesIO`` copy first.
+
+The layout follows ``DataFrame.to_excel``: a bold header row, and the index
+as the first column(s) unless it is a plain RangeIndex.
+"""
+import datetime
+import math
+import os
+import re
+
+import pandas as pd
+import xlsxwriter
+
+from .timing import count, stage
+
+INVALID_SHEET_CHARS = re.compile(r'[\[\]:*?/\\]')
+MAX_SHEET_TITLE = 31
+
+HEADER_FORMAT = {"bold": True, "border": 1, "align": "center", "valign": "top"}
+DATETIME_FORMAT = "yyyy-mm-dd hh:mm:ss"
+
+
+def sheet_title(name):
+    """Excel sheet names: no []:*?/\\ characters and at most 31 characters."""
+    return INVALID_SHEET_CHARS.sub(" ", str(name))[:MAX_SHEET_TITLE]
+
+
+def _unique_title(name, used):
+    title = sheet_title(name)
+    n = 2
+    while title.lower() in used:
+        suffix = f" ({n})"
+        title = sheet_title(name)[:MAX_SHEET_TITLE - len(suffix)] + suffix
+        n += 1
+    used.add(title.lower())
+    return title
+
+
+def _write_cell(sheet, row, col, value, formats, cell_format=None):
+    if value is None or value is pd.NaT or value is pd.NA:
+        return
+    if isinstance(value, float) and math.isnan(value):
+        return
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        sheet.write_datetime(row, col, value, formats["datetime"])
+    elif isinstance(value, (list, tuple, dict)):
+        sheet.write_string(row, col, str(value), cell_format)
+    elif hasattr(value, "item"):
+        # numpy scalar -> Python scalar
+        sheet.write(row, col, value.item(), cell_format)
+    else:
+        sheet.write(row, col, value, cell_format)
+
+
+def write_sheet(workbook, title, df, header=True, formats=None):
+    """Stream one DataFrame into a new worksheet, row by row."""
+    formats = formats or _formats(workbook)
+    sheet = workbook.add_worksheet(title)
+    keep_index = not isinstance(df.index, pd.RangeIndex)
+    index_names = [name or "" for name in df.index.names] if keep_index else []
+    row = 0
+    if header:
+        for col, name in enumerate(index_names + list(df.columns)):
+            if name != "":
+                _write_cell(sheet, row, col, name, formats, formats["header"])
+        row += 1
+    offset = len(index_names)
+    for values in df.itertuples(index=keep_index, name=None):
+        if keep_index:
+            labels = values[0] if isinstance(values[0], tuple) else (values[0],)
+            for col, label in enumerate(labels):
+                _write_cell(sheet, row, col, label, formats, formats["header"])
+            values = values[1:]
+        for col, value in enumerate(values, start=offset):
+            _write_cell(sheet, row, col, value, formats)
+        row += 1
+    return sheet
+
+
+def _formats(workbook):
+    return {
+        "header": workbook.add_format(HEADER_FORMAT),
+        "datetime": workbook.add_format({"num_format": DATETIME_FORMAT}),
+    }
+
+
+def write_workbook(target, sheets, skip_headers=()):
+    """Write ``sheets`` (a {name: DataFrame} dict or an iterable of pairs) to ``target``.
+
+    Pairs may come from a generator, so a combined workbook for many reports
+    never holds them all at once. Names are made valid and unique.
+    ``skip_headers`` names sheets written without a header row.
+    """
+    pairs = sheets.items() if isinstance(sheets, dict) else sheets
+    with stage("excel"):
+        workbook = xlsxwriter.Workbook(target, {"constant_memory": True})
+        try:
+            formats = _formats(workbook)
+            used = set()
+            for name, df in pairs:
+                write_sheet(workbook, _unique_title(name, used), df, header=name not in skip_headers, formats=formats)
+        finally:
+            workbook.close()
+    count("bytes_out", os.path.getsize(target) if isinstance(target, (str, os.PathLike)) else target.tell())
+    return target
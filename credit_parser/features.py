@@ -0,0 +1,170 @@
+"""Per-borrower credit-risk features, computed over a whole batch of parsed reports.
+
+The figures underwriters otherwise rebuild by hand from the facility,
+payment history and enquiry tables, one row per borrower (indexed by the
+borrower key: PAN, else CIN, else the name, as in ``portfolio``):
+
+    borrower_name, pan, cin, report_id, report_type, as_of,
+    facilities, live_facilities, sanctioned, outstanding, utilisation,
+    overdue, overdue_ratio, max_dpd, max_dpd_12m, max_dpd_24m,
+    enquiries_3m, enquiries_6m
+
+    features = borrower_features([(report_id(pdf_bytes), report), ...])
+
+Every report's tables are first stacked into long frames for the whole
+batch, one concat per table layout (see ``portfolio.facility_frame``);
+each feature is then one grouped reduction over report_id rather than a
+round of pandas calls per borrower.
+
+- ``as_of`` is the report date (latest facility "Info. as of", else the
+  date printed on the report, else NaT; see ``portfolio.report_frame``)
+  unless one is given for the whole batch.
+- A facility is live unless it was closed on or before ``as_of`` or its
+  status says closed / settled / written off.
+- ``sanctioned`` / ``outstanding`` / ``overdue`` are totals over every
+  facility; ``utilisation`` is outstanding / sanctioned over live ones and
+  ``overdue_ratio`` is overdue / outstanding.
+- ``max_dpd_12m`` / ``max_dpd_24m`` are the highest DPD in the 12 / 24
+  months up to ``as_of``, from payment history months (an asset class
+  alone counts as its ``frames.ASSET_CLASS_DPD``) and each facility's
+  current DPD as of its "Info. as of" date (``portfolio.dpd_frame``). Reports without dated DPD
+  (CIBIL consumer) leave them NA; ``max_dpd`` is over everything reported.
+- ``enquiries_3m`` / ``enquiries_6m`` are the bureau's own enquiry counts
+  (CRIF credit profile summary, CIBIL commercial enquiry summary); NA
+  when the report has none.
+
+A borrower with several reports in the batch gets the features of the
+latest; undated reports rank before every dated one.
+"""
+import numpy as np
+import pandas as pd
+
+from .frames import first_column, stack_tables
+from .portfolio import FACILITY_COLUMNS, dpd_frame, facility_frame, month_index, report_frame
+
+# Facility columns read on top of ``portfolio.FACILITY_COLUMNS``
+STATUS_COLUMNS = {
+    "closed_date": ["Closed Date", "Closed date"],
+    "status": ["Status"],
+}
+CLOSED_STATUS = r"(?i)closed|settled|written[ -]?off"
+
+DPD_WINDOWS = {"max_dpd_12m": 12, "max_dpd_24m": 24}
+
+# Enquiry count columns per period, in the sheets that have them
+ENQUIRY_SHEETS = ["Credit Summary", "Inquiry Summary"]
+ENQUIRY_PERIODS = {
+    "0-3": ["Inquiries <3 m", "0-3 Months"],
+    "3-6": ["Inquiries 3-6 m", "3-6 Months"],
+}
+
+FEATURE_COLUMNS = ["borrower_name", "pan", "cin", "report_id", "report_type", "as_of",
+                   "facilities", "live_facilities", "sanctioned", "outstanding", "utilisation",
+                   "overdue", "overdue_ratio", "max_dpd", "max_dpd_12m", "max_dpd_24m",
+                   "enquiries_3m", "enquiries_6m"]
+
+
+# ---------- Gathering ----------
+def _enquiry_counts(tables):
+    """Enquiry tables of one layout -> {period: counts}, one per row; Total rows left out.
+
+    Tables without the count columns (camelot ones) have their header as
+    the first row, so each row is matched against its own table's header.
+    """
+    stacked, table, position = stack_tables(tables)
+    counts = {}
+    if any(first_column(stacked, candidates) for candidates in ENQUIRY_PERIODS.values()):
+        keep = stacked.iloc[:, 0].astype(str).str.strip().str.lower() != "total"
+        for period, candidates in ENQUIRY_PERIODS.items():
+            col = first_column(stacked, candidates)
+            if col:
+                counts[period] = stacked[col].where(keep)
+        return table, counts
+    values = stacked.to_numpy(dtype=object)
+    text = stacked.astype(str).apply(lambda col: col.str.strip()).to_numpy()
+    header = text[np.arange(len(text)) - position]
+    keep = (position > 0) & (np.char.lower(text[:, 0].astype(str)) != "total")
+    rows = np.arange(len(values))
+    for period, candidates in ENQUIRY_PERIODS.items():
+        matches = np.isin(header, candidates)
+        if matches.any():
+            counts[period] = pd.Series(np.where(keep & matches.any(axis=1), values[rows, matches.argmax(axis=1)], None))
+    return table, counts
+
+
+def enquiry_frame(reports):
+    """Enquiry counts of every report in long form: report_id, period, count."""
+    layouts = {}  # (sheet, columns) -> ([report_id], [table])
+    for rid, report in reports:
+        for sheet in ENQUIRY_SHEETS:
+            df = report.sheets.get(sheet)
+            if df is not None and len(df):
+                ids, tables = layouts.setdefault((sheet, tuple(df.columns)), ([], []))
+                ids.append(rid)
+                tables.append(df)
+    parts = []
+    for ids, tables in layouts.values():
+        table, counts = _enquiry_counts(tables)
+        ids = np.asarray(ids, dtype=object)[table]
+        parts.extend(pd.DataFrame({"report_id": ids, "period": period, "count": values.to_numpy(dtype=object)})
+                     for period, values in counts.items())
+    if not parts:
+        return pd.DataFrame({"report_id": [], "period": [], "count": []})
+    frame = pd.concat(parts, ignore_index=True)
+    frame["count"] = pd.to_numeric(frame["count"], errors="coerce")
+    return frame
+
+
+# ---------- Features ----------
+def _ratio(numerator, denominator):
+    return numerator / denominator.where(denominator > 0)
+
+
+def report_features(reports, as_of=None):
+    """One feature row per report (indexed by report_id), see the module docstring.
+
+    A report given more than once (the same file twice in a batch) counts once.
+    """
+    unique = {}
+    for rid, report in reports:
+        unique.setdefault(rid, report)
+    reports = list(unique.items())
+    if not reports:
+        return pd.DataFrame(columns=["borrower", *FEATURE_COLUMNS[:3], *FEATURE_COLUMNS[4:]],
+                            index=pd.Index([], name="report_id"))
+    facilities = facility_frame(reports, {**FACILITY_COLUMNS, **STATUS_COLUMNS})
+    frame = report_frame(reports, facilities, None).set_index("report_id")
+    frame["as_of"] = pd.to_datetime(as_of) if as_of is not None else pd.to_datetime(frame["report_date"])
+    as_of_month = month_index(frame["as_of"])
+
+    # Live facilities
+    report_as_of = facilities["report_id"].map(frame["as_of"])
+    closed_date = pd.to_datetime(facilities["closed_date"], dayfirst=True, errors="coerce", format="mixed")
+    closed = (closed_date <= report_as_of) | \
+        facilities["status"].astype("string").str.contains(CLOSED_STATUS, na=False)
+    live = facilities[~closed].groupby("report_id")
+    frame["live_facilities"] = live.size().reindex(frame.index, fill_value=0)
+    frame["utilisation"] = _ratio(live["outstanding"].sum(min_count=1), live["sanctioned"].sum(min_count=1))
+    frame["overdue_ratio"] = _ratio(frame["overdue"], frame["outstanding"])
+
+    # DPD: payment history months, plus each facility's current DPD in its as-of month
+    dated = dpd_frame(reports, facilities)
+    months_back = dated["report_id"].map(as_of_month) - dated["month"]
+    for feature, months in DPD_WINDOWS.items():
+        in_window = dated[(months_back >= 0) & (months_back < months)]
+        frame[feature] = in_window.groupby("report_id")["dpd"].max()
+    frame["max_dpd"] = pd.concat([dated.groupby("report_id")["dpd"].max(), frame["max_dpd"]], axis=1).max(axis=1)
+
+    # Enquiries
+    enquiries = enquiry_frame(reports).groupby(["report_id", "period"])["count"].sum(min_count=1)
+    enquiries = enquiries.unstack().reindex(index=frame.index, columns=list(ENQUIRY_PERIODS))
+    frame["enquiries_3m"] = enquiries["0-3"]
+    frame["enquiries_6m"] = enquiries["0-3"] + enquiries["3-6"]
+    return frame
+
+
+def borrower_features(reports, as_of=None):
+    """One feature row per borrower, from its latest report in ``reports``; indexed by borrower key."""
+    frame = report_features(reports, as_of).reset_index()
+    frame = frame.sort_values(["as_of", "report_id"], na_position="first").drop_duplicates("borrower", keep="last")
+    return frame.set_index("borrower").sort_index()[FEATURE_COLUMNS]
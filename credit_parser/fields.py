@@ -0,0 +1,23 @@
+"""Precompiled `LABEL: value` field tables.
+
+Each parser declares its fields once, at import, as {field: compiled regex}
+with the value in group 1. Separate searches are kept on purpose: CPython's
+``re`` scans for a literal label prefix very quickly, and a single combined
+alternation over the same block measured 2-4x slower
+(see ``benchmarks/bench_fields.py``).
+"""
+import re
+
+
+def compile_fields(patterns, flags=0):
+    """{field: pattern string} -> {field: compiled pattern}."""
+    return {name: re.compile(pattern, flags) for name, pattern in patterns.items()}
+
+
+def field_values(fields, text, default=''):
+    """First group-1 value (stripped) of every field in ``text``, in table order."""
+    values = {}
+    for name, pattern in fields.items():
+        match = pattern.search(text)
+        values[name] = match.group(1).strip() if match else default
+    return values
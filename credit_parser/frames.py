@@ -0,0 +1,159 @@
+"""Build typed DataFrames from accumulated per-row records in one step.
+
+Parsers keep field values as the text they matched; amounts, dates and DPD
+codes are normalised here once per column. Dates and regex extraction run
+as pyarrow compute kernels over the whole column, never value by value.
+"""
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from .history import ASSET_CLASSES
+
+# Explicit date formats seen across the bureaus, tried in this order
+DATE_FORMATS = ("%d-%b-%Y", "%d/%m/%Y", "%d-%m-%Y")
+
+# Indian amount units -> multiplier ("12.5 Cr", "4 L", "3.2 Lakhs", "500 K")
+AMOUNT_UNITS = {"CR": 1e7, "CRORE": 1e7, "CRORES": 1e7, "L": 1e5, "LAC": 1e5, "LACS": 1e5,
+                "LAKH": 1e5, "LAKHS": 1e5, "K": 1e3}
+# First number in the value: "Rs. 1,00,000" is 100000, not ".100000", and
+# trailing text ("5,00,000 DATE REPORTED: 31/03/2024") is never glued on
+AMOUNT = r"(?P<amount>-?\d[\d,]*(?:\.\d+)?)"
+AMOUNT_UNIT = r"\d\s*(?P<unit>CRORES?|CR|LAKHS?|LACS?|L|K)\.?\s*$"
+CURRENCY = r"(?:^|[^A-Z])(?P<code>[A-Z]{3})(?:[^A-Z]|$)"
+NOT_CURRENCIES = ["LAC"]
+
+# Days past due implied by an asset class reported in place of a DPD count:
+# the lower bound under the RBI asset classification norms (SMA from the
+# first day overdue, NPA / sub-standard past 90 days, doubtful after a year
+# as sub-standard). Loss assets are not defined by age and rank with doubtful.
+ASSET_CLASS_DPD = dict(zip(ASSET_CLASSES, [0, 1, 91, 456, 456]))
+
+# SMA sub-classes ("SMA-1", "SMA 2") by the lower bound of their DPD bucket;
+# the digit is the sub-class, not a day count
+SMA_SUBCLASS = r"SMA[ \-_]?(?P<sub>[012])(?:[^0-9]|$)"
+SMA_SUBCLASS_DPD = {"0": 0, "1": 31, "2": 61}
+
+
+def _strings(series, upper=False):
+    """Any column -> pyarrow string array (numbers as their text, missing as null)."""
+    strings = pa.array(series.astype("string[pyarrow]"))
+    return pc.utf8_upper(strings) if upper else strings
+
+
+def _extract(strings, pattern):
+    """First match of ``pattern``'s single named group per value (null without a match)."""
+    matches = pc.extract_regex(strings, pattern)
+    return pc.if_else(pc.is_valid(matches), pc.struct_field(matches, [0]), None)
+
+
+def _series(array, like, dtype=None):
+    return pd.Series(array.to_pandas(), index=like.index, name=like.name, dtype=dtype)
+
+
+def to_amount(series):
+    """'5,00,000' / '1,234 INR' / '12.5 Cr' -> number; blanks, '-' and text become NaN.
+
+    Crore / lakh / thousand suffixes are scaled to rupees. A column that is
+    already numeric is returned as float unchanged (its values are not read
+    back from text).
+    """
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        return series.astype(float)
+    text = _strings(series)
+    numbers = pc.replace_substring(_extract(text, AMOUNT), ",", "")
+    amounts = _series(pc.cast(numbers, pa.float64()), series, dtype=float)
+    if pc.any(pc.match_substring_regex(text, "[A-Za-z]")).as_py():
+        units = _series(_extract(pc.utf8_upper(text), AMOUNT_UNIT), series)
+        if units.notna().any():
+            amounts = amounts * units.map(AMOUNT_UNITS).fillna(1).astype(float)
+    return amounts
+
+
+def to_currency(series):
+    """'INR: 1,23,456' / '1,23,456 usd' -> 'INR' / 'USD'; NA without a code."""
+    codes = _extract(_strings(series, upper=True), CURRENCY)
+    codes = pc.if_else(pc.is_in(codes, pa.array(NOT_CURRENCIES)), None, codes)
+    return _series(codes, series, dtype="string")
+
+
+def to_dates(series, formats=DATE_FORMATS):
+    """Text dates -> datetime64, trying each explicit format on what is still unparsed.
+
+    ``formats`` is one strptime format or a sequence of them; anything no
+    format matches becomes NaT.
+    """
+    if isinstance(formats, str):
+        formats = (formats,)
+    text = pc.utf8_trim_whitespace(_strings(series))
+    dates = pc.strptime(text, format=formats[0], unit="us", error_is_null=True)
+    for fmt in formats[1:]:
+        if dates.null_count == text.null_count:
+            break
+        dates = pc.coalesce(dates, pc.strptime(text, format=fmt, unit="us", error_is_null=True))
+    return _series(dates, series, dtype="datetime64[us]")
+
+
+def format_dates(series, fmt):
+    """datetime64 column -> text in strftime ``fmt``; NaT stays NA."""
+    return _series(pc.strftime(pa.array(series), format=fmt), series, dtype=str)
+
+
+def dpd_days(series):
+    """'030', '000/STD', 'SMA-2', 'SUB' -> days past due (Int16).
+
+    A DPD count in the value wins; an SMA sub-class maps through
+    ``SMA_SUBCLASS_DPD`` and a bare asset class through ``ASSET_CLASS_DPD``;
+    anything else is NA.
+    """
+    text = _strings(series, upper=True)
+    # The sub-class digit is not a count: drop it before looking for one
+    counts = pc.replace_substring_regex(text, r"(SMA)[ \-_]?[012]([^0-9]|$)", r"\1\2")
+    days = _series(pc.cast(_extract(counts, r"(?P<days>\d+)"), pa.int64()), series, dtype="Int64")
+    subclasses = _series(_extract(text, SMA_SUBCLASS), series).map(SMA_SUBCLASS_DPD)
+    classes = _series(_extract(text, f"(?P<cls>{'|'.join(ASSET_CLASSES)})"), series).map(ASSET_CLASS_DPD)
+    return days.fillna(subclasses).fillna(classes).astype("Int16")
+
+
+def first_column(df, candidates):
+    """The first of ``candidates`` that is a column of ``df``, else None."""
+    return next((col for col in candidates if col in df.columns), None)
+
+
+def stack_tables(tables):
+    """DataFrames with the same columns -> (one frame, each row's table number, its row in that table).
+
+    One concat for the lot, which is far cheaper than reading each table's
+    columns out one by one.
+    """
+    lengths = np.array([len(df) for df in tables], dtype=np.int64)
+    frame = pd.concat(tables, ignore_index=True) if len(tables) > 1 else tables[0].reset_index(drop=True)
+    table = np.repeat(np.arange(len(tables)), lengths)
+    return frame, table, np.arange(len(frame)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+
+
+def records_frame(record_type, records, labels, amounts=(), dates=None, categories=(), currencies=None, dpd=None):
+    """One DataFrame from a list of ``records`` types, with explicit column dtypes.
+
+    ``labels`` maps record field -> column name (see ``Record.to_frame``);
+    every labelled column is created even when no record has a value, so
+    the output schema does not depend on the report. ``dates`` maps
+    column -> strptime format (or a sequence of formats, see ``to_dates``);
+    unparseable values become NaT. ``currencies`` maps an amount column ->
+    a column its currency code is split into, and ``dpd`` a DPD/asset
+    class column -> a new ``dpd_days`` column; both are inserted after
+    their source column.
+    """
+    df = record_type.to_frame(records, labels)
+    for col, currency_col in (currencies or {}).items():
+        df.insert(df.columns.get_loc(col) + 1, currency_col, to_currency(df[col]))
+    for col, days_col in (dpd or {}).items():
+        df.insert(df.columns.get_loc(col) + 1, days_col, dpd_days(df[col]))
+    for col in amounts:
+        df[col] = to_amount(df[col])
+    for col, fmt in (dates or {}).items():
+        df[col] = to_dates(df[col], fmt)
+    for col in categories:
+        df[col] = df[col].astype("category")
+    return df
@@ -0,0 +1,81 @@
+"""Consolidated view of several reports for a group of connected borrowers.
+
+``results`` is a list of ``(file name, Report or None, error)``. The group
+workbook has a "Group Summary" sheet (one row per report plus a group
+total) followed by each borrower's facility table:
+
+    write_workbook(path, group_sheets(results))
+"""
+import pandas as pd
+
+from .frames import first_column, to_amount
+
+GROUP_SUMMARY = "Group Summary"
+GROUP_TOTAL = "Group Total"
+
+# Facility table columns per summary figure; the first one present is used
+# (CRIF / CIBIL commercial, CIBIL consumer personal, CIBIL consumer corporate)
+AMOUNT_COLUMNS = {
+    "Sanctioned": ["Sanctioned Amount", "Sanctioned amount", "Sanction amount (INR)/ CC outstanding Amount"],
+    "Outstanding": ["Current Balance", "Current balance", "Current outstanding (INR)"],
+    "Overdue": ["Amount Overdue", "Overdue Amount"],
+}
+DPD_COLUMN = "Max DPD"
+
+
+def borrower_name(report):
+    """Company name from Borrower Details, or the CIBIL consumer Summary name."""
+    if "Borrower Details" in report.sheets:
+        name = report["Borrower Details"].iloc[:, 0].get("Company Name")
+    else:
+        summary = report.sheets.get("Summary")
+        name = summary.loc[0, "Name"] if summary is not None and len(summary) else None
+    return name if isinstance(name, str) and name else None
+
+
+def facility_table(report):
+    """The report's facility / account sheet."""
+    if "Loan Details" in report.sheets:
+        return report["Loan Details"]
+    # CIBIL consumer: "Summary", then the account sheet (named after the consumer)
+    return list(report.sheets.values())[1]
+
+
+def report_summary(report):
+    facilities = facility_table(report)
+    row = {"Facilities": len(facilities)}
+    for figure, candidates in AMOUNT_COLUMNS.items():
+        col = first_column(facilities, candidates)
+        row[figure] = to_amount(facilities[col]).sum() if col else None
+    row[DPD_COLUMN] = pd.to_numeric(facilities[DPD_COLUMN], errors="coerce").max() if DPD_COLUMN in facilities else None
+    return row
+
+
+def group_summary(results):
+    """One row per report (failed ones included, with their error) plus a group total row."""
+    rows = []
+    for file_name, report, error in results:
+        row = {"Borrower": None, "File": file_name, "Report Type": None}
+        if report is not None:
+            row.update({"Borrower": borrower_name(report) or file_name, "Report Type": report.report_type})
+            row.update(report_summary(report))
+        row["Error"] = error
+        rows.append(row)
+    df = pd.DataFrame(rows, columns=["Borrower", "File", "Report Type", "Facilities", *AMOUNT_COLUMNS, DPD_COLUMN, "Error"])
+    parsed = df[df["Error"].isna()]
+    total = {"Borrower": GROUP_TOTAL, "Facilities": parsed["Facilities"].sum(),
+             **{figure: parsed[figure].sum(min_count=1) for figure in AMOUNT_COLUMNS},
+             DPD_COLUMN: parsed[DPD_COLUMN].max()}
+    return pd.concat([df, pd.DataFrame([total])], ignore_index=True)
+
+
+def group_sheets(results):
+    """(sheet name, DataFrame) pairs: the group summary, then one sheet per borrower.
+
+    Sheet names repeat when a borrower has several reports; ``write_workbook``
+    numbers them.
+    """
+    yield GROUP_SUMMARY, group_summary(results)
+    for file_name, report, _ in results:
+        if report is not None:
+            yield borrower_name(report) or file_name, facility_table(report)
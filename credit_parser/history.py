@@ -0,0 +1,83 @@
+"""Payment history decoded into a long-format DPD table.
+
+A loan's payment history is a list of "Mon YEAR value" cells, where value is
+a DPD count, an asset class or both (e.g. "030", "STD", "000/STD"). Cells of
+every loan in a report, or of several reports concatenated together, are
+decoded in one pass with vectorised string operations:
+
+    Loan | Year (Int16) | Month (Int8) | DPD (Int16) | Asset Class (category)
+
+Per-loan metrics are then group-by reductions on that table.
+"""
+import pandas as pd
+
+HISTORY_COLUMN = "Payment History/Asset Classification"
+
+MONTHS = {m: n for n, m in enumerate(
+    ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"], start=1)}
+ASSET_CLASSES = ["STD", "SMA", "SUB", "DBT", "LOS"]
+ASSET_CLASS_DTYPE = pd.CategoricalDtype(ASSET_CLASSES)
+
+DELINQUENT_DPD = 30
+
+
+def history_cells(data):
+    """Payment history block -> "Mon YEAR value" cells, skipping '-' (not reported).
+
+    The block is 12 month labels followed by, per year, the year and its 12
+    values.
+    """
+    lines = [line.strip() for line in data.strip().splitlines() if line.strip()]
+    months = lines[:12]
+    cells = []
+    for i in range(12, len(lines), 13):
+        year = lines[i]
+        cells.extend(f"{month} {year} {value}"
+                     for month, value in zip(months, lines[i + 1:i + 13]) if value != "-")
+    return cells
+
+
+def _empty_history(index_names):
+    index = pd.MultiIndex.from_arrays([[]] * len(index_names), names=index_names) \
+        if len(index_names) > 1 else pd.Index([], name=index_names[0])
+    return pd.DataFrame({
+        "Year": pd.array([], dtype="Int16"),
+        "Month": pd.array([], dtype="Int8"),
+        "DPD": pd.array([], dtype="Int16"),
+        "Asset Class": pd.Categorical([], dtype=ASSET_CLASS_DTYPE),
+    }, index=index)
+
+
+def payment_history_frame(loans, column=HISTORY_COLUMN):
+    """Loan Details frame -> one row per reported month, indexed like ``loans``.
+
+    With a RangeIndex the index is the loan's row number (named "Loan"); a
+    batch of reports concatenated with keys keeps its (file, loan) index.
+    """
+    index_names = [name or "Loan" for name in loans.index.names]
+    cells = loans[column].explode().dropna() if column in loans else pd.Series(dtype=object)
+    if cells.empty:
+        return _empty_history(index_names)
+    parts = cells.astype(str).str.split(" ", n=2, expand=True).reindex(columns=range(3))
+    values = parts[2].fillna("").str.upper()
+    frame = pd.DataFrame({
+        "Year": pd.to_numeric(parts[1], errors="coerce").astype("Int16"),
+        "Month": parts[0].str[:3].str.lower().map(MONTHS).astype("Int8"),
+        "DPD": pd.to_numeric(values.str.extract(r"^(\d+)", expand=False), errors="coerce").astype("Int16"),
+        "Asset Class": values.str.extract(f"({'|'.join(ASSET_CLASSES)})", expand=False).astype(ASSET_CLASS_DTYPE),
+    })
+    frame.index.names = index_names
+    return frame
+
+
+def payment_history_metrics(history):
+    """Per-loan Max DPD, months at 30+ DPD and the last month with DPD > 0."""
+    levels = list(range(history.index.nlevels))
+    dpd = history["DPD"]
+    period = pd.to_datetime(pd.DataFrame({"year": history["Year"], "month": history["Month"], "day": 1}),
+                            errors="coerce")
+    return pd.DataFrame({
+        "Max DPD": dpd.groupby(level=levels).max(),
+        f"Months {DELINQUENT_DPD}+ DPD": (dpd >= DELINQUENT_DPD).fillna(False).groupby(level=levels).sum().astype("int16"),
+        "Last Delinquent": period.where((dpd > 0).fillna(False)).groupby(level=levels).max(),
+    })
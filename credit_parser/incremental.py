@@ -0,0 +1,187 @@
+"""Incremental re-parsing of refreshed reports for the same borrower.
+
+A borrower's report pulled again next month mostly repeats the same
+facility / account blocks. ``BlockStore`` remembers, per borrower (PAN,
+else CIN, from the report header), the record parsed from every
+block it has seen, keyed by a fingerprint of the block text. Passing it to
+``parse`` reuses those records and only runs the field regexes on new or
+changed blocks:
+
+    store = BlockStore("blocks.sqlite")
+    report = parse(pdf_bytes, blocks=store)
+    report.sheets["Changes"]      # facilities added / removed / changed since the last report
+
+The page text still has to be extracted to fingerprint the blocks; what is
+skipped is the per-block parsing. A block that runs over a page break also
+holds that break's running header / footer (page numbers, print date and
+time, reference numbers), which differ from pull to pull; those lines
+(``RUNNING_LINE``) and blank lines are left out of the fingerprint.
+
+Entries are scoped by ``PARSER_VERSION``, so a parser change re-parses
+everything. Reports for which no borrower key is found are parsed
+normally, without a "Changes" sheet.
+"""
+import hashlib
+import json
+import pickle
+import re
+import sqlite3
+
+import pandas as pd
+
+from .cache import PARSER_VERSION
+from .timing import count
+
+CHANGE_COLUMNS = ["Facility", "Change", "Field", "Previous", "Current"]
+ADDED, REMOVED, CHANGED = "added", "removed", "changed"
+
+# A whole line of page furniture: "Page 2 of 9" / "2 of 9", "Date: ..."-style
+# print / issue stamps and report reference numbers. Field labels that merely
+# contain "date" ("DATE OPENED:", "Sanctioned Date:") do not match
+RUNNING_LINE = re.compile(
+    r"\s*(?:page\s*\d+(?:\s*of\s*\d+)?|\d+\s+of\s+\d+"
+    r"|(?:date|time|report date|date of (?:issue|request)|print(?:ed)?(?: on| date)?|generated on)\s*:.*"
+    r"|(?:control|report order|member reference|chm ref)\s*(?:number|no\.?|id|#)?\s*:.*)\s*",
+    re.IGNORECASE)
+
+
+def borrower_key(profile):
+    """PAN, else CIN, from a parser's ``BorrowerProfile``."""
+    return profile.pan or profile.cin
+
+
+def block_content(text):
+    """``text`` without running header / footer lines and blank lines: what a fingerprint covers."""
+    return "\n".join(line.strip() for line in text.split("\n") if line.strip() and not RUNNING_LINE.fullmatch(line))
+
+
+def fingerprint(text):
+    return hashlib.blake2b(block_content(text).encode("utf-8"), digest_size=16).hexdigest()
+
+
+class BlockStore:
+    """SQLite store of parsed blocks and of each borrower's latest report."""
+
+    def __init__(self, path):
+        self.path = path
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS blocks (version TEXT, report_type TEXT, borrower TEXT,"
+                " fingerprint TEXT, payload BLOB NOT NULL,"
+                " PRIMARY KEY (version, report_type, borrower, fingerprint))"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS latest (version TEXT, report_type TEXT, borrower TEXT,"
+                " fingerprints TEXT NOT NULL, PRIMARY KEY (version, report_type, borrower))"
+            )
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def session(self, report_type, borrower):
+        """A ``BlockSession`` for one report, or None without a borrower key."""
+        if not borrower:
+            return None
+        return BlockSession(self, report_type, borrower)
+
+    def load(self, report_type, borrower):
+        """({fingerprint: pickled record}, [fingerprints of the latest report])."""
+        scope = (PARSER_VERSION, report_type, borrower)
+        where = "version = ? AND report_type = ? AND borrower = ?"
+        with self._connect() as conn:
+            blocks = dict(conn.execute(f"SELECT fingerprint, payload FROM blocks WHERE {where}", scope))
+            row = conn.execute(f"SELECT fingerprints FROM latest WHERE {where}", scope).fetchone()
+        return blocks, json.loads(row[0]) if row else []
+
+    def save(self, report_type, borrower, new_blocks, fingerprints):
+        scope = (PARSER_VERSION, report_type, borrower)
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO blocks (version, report_type, borrower, fingerprint, payload)"
+                " VALUES (?, ?, ?, ?, ?)",
+                [(*scope, fp, payload) for fp, payload in new_blocks.items()],
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO latest (version, report_type, borrower, fingerprints) VALUES (?, ?, ?, ?)",
+                (*scope, json.dumps(fingerprints)),
+            )
+
+    def clear(self):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM blocks")
+            conn.execute("DELETE FROM latest")
+
+
+class BlockSession:
+    """Block reuse and change tracking while one report is parsed."""
+
+    def __init__(self, store, report_type, borrower):
+        self.store = store
+        self.report_type = report_type
+        self.borrower = borrower
+        self.known, self.previous = store.load(report_type, borrower)
+        self.new_blocks = {}
+        self.fingerprints = []
+
+    def parse(self, text, parse_block):
+        """``parse_block(text)``, or the stored record if this block was parsed before."""
+        fp = fingerprint(text)
+        self.fingerprints.append(fp)
+        payload = self.known.get(fp) or self.new_blocks.get(fp)
+        if payload is not None:
+            count("blocks_reused")
+            # A fresh copy each time, so equal blocks never share one record
+            return pickle.loads(payload)
+        count("blocks_parsed")
+        record = parse_block(text)
+        self.new_blocks[fp] = pickle.dumps(record, protocol=pickle.HIGHEST_PROTOCOL)
+        return record
+
+    def finish(self, key_fields, labels=None):
+        """Record this report as the borrower's latest; return the changes since the previous one.
+
+        Facilities are matched across reports by ``key_fields``; a block whose
+        text changed but whose key did not gives one "changed" row per field,
+        named by its sheet column in ``labels`` ({field: column}) when given.
+        """
+        changes = diff_records(self._records(self.previous), self._records(self.fingerprints), key_fields, labels)
+        self.store.save(self.report_type, self.borrower, self.new_blocks, self.fingerprints)
+        return changes
+
+    def _records(self, fingerprints):
+        payloads = {**self.known, **self.new_blocks}
+        return {fp: pickle.loads(payloads[fp]) for fp in fingerprints if fp in payloads}
+
+
+def _label(record, key_fields):
+    return " / ".join(str(record.get(field) or "") for field in key_fields)
+
+
+def _text(value):
+    return None if value is None or value == "" else str(value)
+
+
+def diff_records(previous, current, key_fields, labels=None):
+    """Changes between two {fingerprint: record} maps as a DataFrame of ``CHANGE_COLUMNS``."""
+    labels = labels or {}
+    removed = {fp: r for fp, r in previous.items() if fp not in current}
+    added = {fp: r for fp, r in current.items() if fp not in previous}
+    old_by_key = {}
+    for record in removed.values():
+        old_by_key.setdefault(_label(record, key_fields), []).append(record)
+
+    rows = []
+    for record in added.values():
+        label = _label(record, key_fields)
+        if old_by_key.get(label):
+            old = old_by_key[label].pop(0)
+            old_values, new_values = dict(old.items()), dict(record.items())
+            for field in dict.fromkeys([*old_values, *new_values]):
+                before, after = _text(old_values.get(field)), _text(new_values.get(field))
+                if before != after:
+                    rows.append([label, CHANGED, labels.get(field, field), before, after])
+        else:
+            rows.append([label, ADDED, None, None, None])
+    for label, records in old_by_key.items():
+        rows.extend([label, REMOVED, None, None, None] for _ in records)
+    return pd.DataFrame(rows, columns=CHANGE_COLUMNS)
@@ -0,0 +1,283 @@
+"""Crash-isolated parsing with a wall-clock timeout and an RSS ceiling.
+
+A malformed PDF can hang PyMuPDF/camelot or grow without bound. Here every
+report is parsed in its own child process, so a hang, crash or runaway
+allocation only costs that report:
+
+    result = parse_isolated("report.pdf", timeout=60, max_rss_mb=1024)   # or bytes / a PDFSource
+    result.report          # Report, or None on failure
+    result.error           # ParseFailure record (kind, stage, message, ...), or None
+    result.fallback        # True if the report came from the cheaper fallback path
+
+``classify_isolated`` runs bureau detection the same way, and
+``call_isolated`` any other function of the source (e.g. just the CIBIL
+commercial summary tables).
+
+Children are forked from a forkserver that has the parsers preloaded, so
+starting one is cheap and never forks a multi-threaded parent (Streamlit,
+the batch pool). The parent polls the child's resident memory (Linux
+/proc) every ``POLL_SECONDS`` and kills it past ``max_rss_mb``; short
+spikes between polls are not seen. A report on disk is handed to the
+child as its path and memory-mapped there; only in-memory data is copied
+through the pipe (see ``source``).
+
+On a timeout or memory kill the report is retried once with the report
+type's ``FALLBACK_OPTIONS`` (CIBIL commercial: text only, no summary
+tables). The other parsers already extract text only, so they are not
+retried. The first failure stays in ``result.error`` either way.
+"""
+import multiprocessing
+import multiprocessing.forkserver
+import os
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+
+from .source import using_source
+from .timing import instrument, merge
+
+DEFAULT_TIMEOUT = 120.0
+DEFAULT_MAX_RSS_MB = 2048
+POLL_SECONDS = 0.05
+
+# Failure kinds
+ERROR, TIMEOUT, MEMORY, CRASH = "error", "timeout", "memory", "crash"
+
+# Options for the retry after a timeout / memory kill, per report type
+FALLBACK_OPTIONS = {
+    "cibil_commercial": {"summary_tables": False},
+}
+
+# Imported once in the forkserver so every child starts with them loaded;
+# "__main__" keeps children from each re-running the caller's main script
+# (under Streamlit, the app itself)
+PRELOAD = ["__main__", "credit_parser", "credit_parser.crif", "credit_parser.cibil_consumer", "credit_parser.cibil_commercial"]
+
+
+@dataclass
+class ParseFailure:
+    """Structured error record of one failed attempt."""
+    kind: str                     # ERROR, TIMEOUT, MEMORY or CRASH
+    stage: str = None             # timing stage the worker was in (see ``credit_parser.timing``)
+    error_type: str = None        # exception class name, for ERROR
+    message: str = ""
+    seconds: float = 0.0
+    peak_rss_mb: float = None
+
+    def as_dict(self):
+        return asdict(self)
+
+    def __str__(self):
+        where = f" in {self.stage}" if self.stage else ""
+        what = f"{self.error_type}: {self.message}" if self.error_type else self.message
+        return f"{self.kind}{where}: {what}"
+
+
+@dataclass
+class IsolatedResult:
+    report: object = None
+    error: ParseFailure = None
+    fallback: bool = False
+    report_type: str = None
+    timings: dict = field(default_factory=dict)
+
+
+_context = None
+_context_lock = threading.Lock()
+
+
+def _mp_context():
+    global _context
+    with _context_lock:
+        if _context is None:
+            if "forkserver" in multiprocessing.get_all_start_methods():
+                _context = multiprocessing.get_context("forkserver")
+                _context.set_forkserver_preload(PRELOAD)
+            else:
+                _context = multiprocessing.get_context("spawn")
+        if _context.get_start_method() == "forkserver":
+            # Every time, so a forkserver that died is restarted with the path too
+            _start_forkserver()
+        return _context
+
+
+def _start_forkserver():
+    # The forkserver does not take over the parent's sys.path (Python 3.11), so
+    # the preload fails silently unless the package is installed; hand it over
+    # through PYTHONPATH while the server starts. The caller's environment is
+    # put back as it was whatever happens (the server keeps its own copy)
+    saved = os.environ.get("PYTHONPATH")
+    os.environ["PYTHONPATH"] = os.pathsep.join(path or os.getcwd() for path in sys.path)
+    try:
+        multiprocessing.forkserver.ensure_running()
+    finally:
+        if saved is None:
+            os.environ.pop("PYTHONPATH", None)
+        else:
+            os.environ["PYTHONPATH"] = saved
+
+
+def _forget_forkserver():
+    # A process forked from one that started the forkserver (the service's
+    # worker pool) inherits its bookkeeping but is not the server's parent, so
+    # it cannot wait on it ("No child processes"); it starts its own instead.
+    # The locks may have been held by another thread at the fork
+    global _context, _context_lock
+    _context, _context_lock = None, threading.Lock()
+    server = multiprocessing.forkserver._forkserver
+    if server._forkserver_pid is not None:
+        os.close(server._forkserver_alive_fd)
+        server._forkserver_pid = server._forkserver_address = server._forkserver_alive_fd = None
+    server._lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_forget_forkserver)
+
+
+def rss_mb(pid):
+    """Resident memory of a process in MiB (Linux), else None."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+# ---------- Child ----------
+def _child(conn, source, report_type, options, label):
+    from . import detect, parse
+    last = [None]
+
+    def on_stage(name):
+        # Only changes are sent: extraction enters its stage once per page
+        if name != last[0]:
+            last[0] = name
+            conn.send(("stage", name))
+
+    with instrument(label, log=False, on_stage=on_stage) as timings:
+        try:
+            if report_type is None:
+                with timings.stage("detect"):
+                    report_type = detect(source)
+                if report_type is None:
+                    raise ValueError("could not detect bureau/format")
+            conn.send(("report_type", report_type))
+            report, error = parse(source, report_type, **options), None
+        except Exception as e:
+            report, error = None, (timings.failed_stage, type(e).__name__, str(e))
+    source.close()
+    conn.send(("done", report, error, timings.as_dict()))
+    conn.close()
+
+
+def _call_child(conn, source, func, args, kwargs, label):
+    with instrument(label, log=False, on_stage=lambda name: conn.send(("stage", name))) as timings:
+        try:
+            value, error = func(source, *args, **kwargs), None
+        except Exception as e:
+            value, error = None, (timings.failed_stage, type(e).__name__, str(e))
+    source.close()
+    conn.send(("done", value, error, timings.as_dict()))
+    conn.close()
+
+
+def _classify(source):
+    from . import classify
+    from .timing import stage
+
+    with stage("detect"):
+        return classify(source)
+
+
+# ---------- Parent ----------
+def _attempt(target, args, source, timeout, max_rss_mb, report_type=None):
+    """Run ``target(conn, source, *args)`` in a child under the limits; its "done" result lands in ``report``."""
+    ctx = _mp_context()
+    receiver, sender = ctx.Pipe(duplex=False)
+    process = ctx.Process(target=target, args=(sender, source, *args), daemon=True)
+    started = time.monotonic()
+    process.start()
+    sender.close()
+    result = IsolatedResult(report_type=report_type)
+    stage, peak = None, None
+
+    def failure(kind, message, error_type=None, failed_stage=None):
+        return ParseFailure(kind, failed_stage or stage, error_type, message,
+                            round(time.monotonic() - started, 3), peak)
+
+    try:
+        while True:
+            if receiver.poll(POLL_SECONDS):
+                try:
+                    message = receiver.recv()
+                except EOFError:
+                    process.join(1)
+                    result.error = failure(CRASH, f"worker exited with code {process.exitcode}")
+                    break
+                if message[0] == "stage":
+                    stage = message[1]
+                elif message[0] == "report_type":
+                    result.report_type = message[1]
+                else:
+                    _, result.report, error, result.timings = message
+                    if error:
+                        failed_stage, error_type, text = error
+                        result.error = failure(ERROR, text, error_type, failed_stage)
+                    break
+            current = rss_mb(process.pid)
+            if current is not None:
+                peak = round(max(peak or 0, current), 1)
+            if max_rss_mb and current and current > max_rss_mb:
+                result.error = failure(MEMORY, f"resident memory {current:.0f} MiB over the {max_rss_mb} MiB limit")
+                break
+            if timeout and time.monotonic() - started > timeout:
+                result.error = failure(TIMEOUT, f"no result after {timeout:g}s")
+                break
+    finally:
+        receiver.close()
+        if process.is_alive():
+            process.kill()
+        process.join()
+    # The child's stages count towards the caller's instrument(), if any
+    merge(result.timings or {"failed_stage": result.error and result.error.stage})
+    return result
+
+
+def parse_isolated(pdf, report_type=None, timeout=DEFAULT_TIMEOUT, max_rss_mb=DEFAULT_MAX_RSS_MB,
+                   fallback=True, label=None, **options):
+    """``parse`` in a child process; never raises for a bad report (see module docstring).
+
+    ``pdf`` is a path, bytes or ``PDFSource``. ``timeout`` (seconds) and
+    ``max_rss_mb`` apply to each attempt; None disables them. Extra
+    options go to the parser.
+    """
+    with using_source(pdf) as source:
+        result = _attempt(_child, (report_type, options, label), source, timeout, max_rss_mb, report_type)
+        retry_options = FALLBACK_OPTIONS.get(result.report_type)
+        if fallback and retry_options and result.error and result.error.kind in (TIMEOUT, MEMORY):
+            retry = _attempt(_child, (result.report_type, {**options, **retry_options}, label), source,
+                             timeout, max_rss_mb, result.report_type)
+            if retry.report is not None:
+                retry.error, retry.fallback = result.error, True
+                return retry
+    return result
+
+
+def call_isolated(func, pdf, *args, timeout=DEFAULT_TIMEOUT, max_rss_mb=DEFAULT_MAX_RSS_MB, label=None, **kwargs):
+    """``func(source, *args, **kwargs)`` in a child process under the same limits.
+
+    ``func`` must be a module-level function (it is pickled by name).
+    Returns (its value or None, ParseFailure or None); never retried.
+    """
+    with using_source(pdf) as source:
+        result = _attempt(_call_child, (func, args, kwargs, label), source, timeout, max_rss_mb)
+    return result.report, result.error
+
+
+def classify_isolated(pdf, timeout=DEFAULT_TIMEOUT, max_rss_mb=DEFAULT_MAX_RSS_MB, label=None):
+    """``classify`` in a child process under the same limits: (``Detection`` or None, ParseFailure or None)."""
+    return call_isolated(_classify, pdf, timeout=timeout, max_rss_mb=max_rss_mb, label=label)
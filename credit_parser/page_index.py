@@ -0,0 +1,78 @@
+"""Which pages each report section lives on.
+
+A ``PageIndex`` is filled in one pass over the page texts a parser streams
+anyway, recording the pages each section marker occurs on. Section parsers
+then scan only their page span instead of the whole report:
+
+    index = PageIndex(["Borrower Summary", "Credit Profile Summary"], keep_until="Loan Terms For:")
+    for text in index.scan(pages.iter_pages()):
+        ...
+    index.span("Borrower Summary", "Credit Profile Summary")   # range(0, 2)
+    index.text("Borrower Summary", "Credit Profile Summary")   # just those pages
+
+Page texts are only kept up to the first page holding ``keep_until`` (the
+summary pages before the facility details), so streaming parsers stay
+streaming. ``index_document`` builds an index straight from a PyMuPDF
+document, reading pages only until every marker has been seen.
+"""
+
+
+class PageIndex:
+    """Pages (0-based) each marker occurs on, and the text of the leading pages."""
+
+    def __init__(self, markers, keep_until=None):
+        self.found = {marker: [] for marker in markers}
+        self.page_count = 0
+        self.keep_until = keep_until
+        self._texts = []
+        self._keeping = keep_until is not None
+
+    def add(self, text):
+        for marker, pages in self.found.items():
+            if marker in text:
+                pages.append(self.page_count)
+        if self._keeping:
+            self._texts.append(text)
+            self._keeping = self.keep_until not in text
+        self.page_count += 1
+
+    def scan(self, pages):
+        """Pass a page-text iterator through, indexing each page on the way."""
+        for text in pages:
+            self.add(text)
+            yield text
+
+    def complete(self):
+        return all(self.found.values())
+
+    def first(self, marker, start=0):
+        """First page at or after ``start`` holding ``marker``, else None."""
+        return next((page for page in self.found[marker] if page >= start), None)
+
+    def span(self, start, end=None):
+        """Pages from the first holding ``start`` through the next holding ``end``.
+
+        Runs to the last page when ``end`` is None or never follows; empty
+        when ``start`` was not seen.
+        """
+        first = self.first(start)
+        if first is None:
+            return range(0)
+        last = self.first(end, first) if end is not None else None
+        return range(first, (last if last is not None else self.page_count - 1) + 1)
+
+    def text(self, start, end=None):
+        """Kept text of ``span(start, end)``, pages joined by newlines ("" if not seen)."""
+        return "\n".join(self._texts[page] for page in self.span(start, end) if page < len(self._texts))
+
+
+def index_document(doc, markers):
+    """``PageIndex`` of an open PyMuPDF document, read only until every marker is found."""
+    index = PageIndex(markers)
+    for page_number in range(doc.page_count):
+        page = doc.load_page(page_number)
+        index.add(page.get_text())
+        del page
+        if index.complete():
+            break
+    return index
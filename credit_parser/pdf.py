@@ -0,0 +1,32 @@
+"""PDF access shared by the fitz-based parsers."""
+import fitz  # PyMuPDF
+
+
+def open_document(file_bytes):
+    """Open a PDF held in memory (bytes or a memoryview, which PyMuPDF reads without copying)."""
+    return fitz.open(stream=file_bytes, filetype="pdf")
+
+
+def open_file(path):
+    """Open a PDF on disk; pages are read from the file as they are needed."""
+    return fitz.open(path, filetype="pdf")
+
+
+def extract_text(doc):
+    """Concatenate the text of every page, one page per newline-joined chunk."""
+    return "\n".join([page.get_text() for page in doc])
+
+
+def iter_page_text(doc):
+    """Yield page texts one at a time; each page is released once its text is taken."""
+    for page_number in range(doc.page_count):
+        page = doc.load_page(page_number)
+        text = page.get_text()
+        del page
+        yield text
+
+
+def iter_text_chunks(pages):
+    """Stream page texts joined like ``extract_text`` without building one string."""
+    for page_number, text in enumerate(pages):
+        yield text if page_number == 0 else "\n" + text
@@ -0,0 +1,380 @@
+"""Indexed SQLite store of parsed reports for cross-report borrower queries.
+
+Reports are ingested in one transaction per call, into four tables:
+
+    reports      one row per report: borrower key (PAN, else CIN, else the
+                 name), PAN, CIN, bureau, report date and the report's
+                 facility totals (see ``group.report_summary``)
+    facilities   one row per facility: type, lender, sanction date, amounts
+                 and Max DPD
+    dpd_months   one row per facility and month with a known DPD: payment
+                 history months, and the current DPD in the month the
+                 facility is reported as of (see ``dpd_frame``)
+    borrowers    one row per borrower: its group, and its latest report
+                 with that report's totals
+
+Queries return DataFrames:
+
+    store = PortfolioStore("portfolio.sqlite")
+    store.ingest([(report_id(pdf_bytes), report)], group="Acme Group")
+    store.delinquent_borrowers(min_dpd=90, months=6)
+    store.exposure_by_group()
+    store.facilities(pan="AAACA1234A", since="2024-01-01")
+
+The report date is the latest facility "Info. as of" date, else the date
+printed on the report (CIBIL consumer); with neither it is NULL, and such
+reports are left out of every date filter. Every filter column is
+indexed (PAN, CIN, borrower, lender, facility type, report date, Max DPD,
+DPD month, group), and exposure is summed over each borrower's latest report, which
+the store keeps up to date on ingest. The parsers extract no lender per
+facility, so ``lender`` is only filled in for sheets that have one.
+
+``delinquent_borrowers`` reads ``dpd_months``, so only DPD reported for a
+month inside the window counts: a report's Max DPD covers its whole
+history. Reports without dated DPD (CIBIL consumer) are never listed there.
+"""
+import datetime
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+from .frames import ASSET_CLASS_DPD, first_column, stack_tables, to_amount, to_dates
+from .group import AMOUNT_COLUMNS, DPD_COLUMN, borrower_name, facility_table
+from .incremental import borrower_key
+from .records import BorrowerProfile
+from .report import BUREAUS
+
+# Facility table columns per stored field; the first one present is used
+# (CRIF, CIBIL commercial, CIBIL consumer). CIBIL commercial facilities have
+# no payment history, so their Max DPD is the current DPD.
+FACILITY_COLUMNS = {
+    "facility": ["Loan Terms For", "Facility_No", "Sr. No."],
+    "facility_type": ["Type", "Type of loan"],
+    "lender": ["Lender", "Member Name", "Institution"],
+    "sanction_date": ["Sanctioned Date", "Sanction date", "Sanction date (DD/MM/YYYY)"],
+    **{figure.lower(): candidates for figure, candidates in AMOUNT_COLUMNS.items()},
+    "max_dpd": [DPD_COLUMN, "Current DPD"],
+    "current_dpd": ["Current DPD"],
+    "as_of": ["Info. as of"],
+}
+TEXT_FIELDS = ["facility", "facility_type", "lender"]
+AMOUNT_FIELDS = [figure.lower() for figure in AMOUNT_COLUMNS]
+
+SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS reports (report_id TEXT PRIMARY KEY, report_type TEXT, bureau TEXT,"
+    " report_date TEXT, borrower TEXT NOT NULL, borrower_name TEXT, pan TEXT, cin TEXT,"
+    " facilities INTEGER, sanctioned REAL, outstanding REAL, overdue REAL, max_dpd INTEGER, ingested_at TEXT)",
+    "CREATE TABLE IF NOT EXISTS facilities (report_id TEXT, position INTEGER, facility TEXT, facility_type TEXT,"
+    " lender TEXT, sanction_date TEXT, sanctioned REAL, outstanding REAL, overdue REAL, max_dpd INTEGER,"
+    " PRIMARY KEY (report_id, position))",
+    "CREATE TABLE IF NOT EXISTS borrowers (borrower TEXT PRIMARY KEY, borrower_group TEXT, borrower_name TEXT,"
+    " latest_report_id TEXT, report_date TEXT, facilities INTEGER, sanctioned REAL, outstanding REAL, overdue REAL,"
+    " max_dpd INTEGER)",
+    "CREATE TABLE IF NOT EXISTS dpd_months (report_id TEXT, position INTEGER, month TEXT, dpd INTEGER,"
+    " PRIMARY KEY (report_id, position, month))",
+    "CREATE INDEX IF NOT EXISTS reports_pan ON reports (pan, report_date)",
+    "CREATE INDEX IF NOT EXISTS reports_cin ON reports (cin, report_date)",
+    "CREATE INDEX IF NOT EXISTS reports_borrower ON reports (borrower, report_date)",
+    "CREATE INDEX IF NOT EXISTS reports_date ON reports (report_date)",
+    "CREATE INDEX IF NOT EXISTS reports_dpd ON reports (max_dpd, report_date)",
+    "CREATE INDEX IF NOT EXISTS facilities_lender ON facilities (lender)",
+    "CREATE INDEX IF NOT EXISTS facilities_type ON facilities (facility_type)",
+    "CREATE INDEX IF NOT EXISTS facilities_dpd ON facilities (max_dpd)",
+    "CREATE INDEX IF NOT EXISTS dpd_months_month ON dpd_months (month, dpd)",
+    "CREATE INDEX IF NOT EXISTS borrowers_group ON borrowers (borrower_group)",
+]
+
+REPORT_FIELDS = ["report_id", "report_type", "bureau", "report_date", "borrower", "borrower_name", "pan", "cin",
+                 "facilities", "sanctioned", "outstanding", "overdue", "max_dpd", "ingested_at"]
+FACILITY_FIELDS = ["report_id", "position", "facility", "facility_type", "lender", "sanction_date",
+                   "sanctioned", "outstanding", "overdue", "max_dpd"]
+DPD_MONTH_FIELDS = ["report_id", "position", "month", "dpd"]
+
+# Report columns added to facility query results
+REPORT_CONTEXT = "r.borrower, r.borrower_name, r.pan, r.cin, r.bureau, r.report_date"
+
+# Copied from each borrower's latest report onto its ``borrowers`` row
+LATEST_FIELDS = ["borrower_name", "report_date", "facilities", "sanctioned", "outstanding", "overdue", "max_dpd"]
+
+
+def _sql_rows(frame, columns):
+    """DataFrame -> tuples for ``executemany``, NaN/NaT/NA as None."""
+    frame = frame[columns].astype(object)
+    return list(frame.where(frame.notna(), None).itertuples(index=False, name=None))
+
+
+def _text(series):
+    series = series.astype("string").str.strip()
+    return series.where(series != "")
+
+
+def _detail(details, field):
+    value = details.get(field)
+    if not isinstance(value, str):
+        return None
+    return value.strip() or None
+
+
+def facility_frame(reports, fields=FACILITY_COLUMNS):
+    """Every report's facilities in one frame, under ``FACILITY_COLUMNS`` names.
+
+    Facility tables with the same columns (in practice one layout per
+    report type) are concatenated in one step and their columns picked
+    once, then values are converted once for the whole batch;
+    ``sanction_date`` is 'YYYY-MM-DD' (text dates are day first) and
+    ``as_of`` a datetime. ``fields`` may add more field -> candidate
+    columns to ``FACILITY_COLUMNS``; those are left unconverted.
+    """
+    layouts = {}  # facility table columns -> [(report number, report_id, table)]
+    for n, (rid, report) in enumerate(reports):
+        df = facility_table(report)
+        layouts.setdefault(tuple(df.columns), []).append((n, rid, df))
+    parts = []
+    for layout in layouts.values():
+        numbers, ids, tables = zip(*layout)
+        stacked, table, position = stack_tables(tables)
+        part = pd.DataFrame({"report": np.asarray(numbers)[table], "report_id": np.asarray(ids, dtype=object)[table],
+                             "position": position})
+        for field, candidates in fields.items():
+            col = first_column(tables[0], candidates)
+            part[field] = stacked[col] if col else None
+        for field in AMOUNT_FIELDS:
+            # Per layout: parsers already give numeric amounts, only text ones need reading
+            part[field] = to_amount(part[field])
+        parts.append(part)
+    if not parts:
+        return pd.DataFrame(columns=["report_id", "position", *fields])
+    frame = pd.concat(parts, ignore_index=True) if len(parts) > 1 else parts[0]
+    frame = frame.sort_values(["report", "position"], kind="stable", ignore_index=True).drop(columns="report")
+    for field in TEXT_FIELDS:
+        frame[field] = _text(frame[field])
+    frame["max_dpd"] = pd.to_numeric(frame["max_dpd"], errors="coerce")
+    frame["current_dpd"] = pd.to_numeric(frame["current_dpd"], errors="coerce")
+    frame["as_of"] = pd.to_datetime(frame["as_of"], errors="coerce")
+    dates = pd.to_datetime(frame["sanction_date"], dayfirst=True, errors="coerce", format="mixed")
+    frame["sanction_date"] = dates.dt.strftime("%Y-%m-%d")
+    return frame
+
+
+def month_index(dates):
+    """Dates -> months since year 0 (year * 12 + month), so month windows are plain subtraction."""
+    return dates.dt.year * 12 + dates.dt.month
+
+
+def history_frame(reports):
+    """Payment history months of every report: report_id, position, month (see ``month_index``), dpd."""
+    ids, tables = [], []
+    for rid, report in reports:
+        history = report.sheets.get("Payment History")
+        if history is not None and len(history):
+            ids.append(rid)
+            tables.append(history)
+    if not tables:
+        return pd.DataFrame({"report_id": [], "position": [], "month": [], "dpd": []})
+    history = pd.concat(tables)
+    months = pd.to_numeric(history["Year"], errors="coerce") * 12 + pd.to_numeric(history["Month"], errors="coerce")
+    dpd = pd.to_numeric(history["DPD"], errors="coerce").fillna(history["Asset Class"].map(ASSET_CLASS_DPD))
+    return pd.DataFrame({"report_id": np.repeat(np.asarray(ids, dtype=object), [len(df) for df in tables]),
+                         "position": history.index.get_level_values(-1),
+                         "month": months.to_numpy(dtype=float), "dpd": dpd.to_numpy(dtype=float)})
+
+
+def dpd_frame(reports, facilities):
+    """Every DPD tied to a month: report_id, position, month (see ``month_index``), dpd.
+
+    Payment history months (an asset class alone counts as its
+    ``frames.ASSET_CLASS_DPD``), plus each facility's current DPD in the
+    month of its "Info. as of" date; ``facilities`` is ``facility_frame(reports)``.
+    """
+    current = pd.DataFrame({"report_id": facilities["report_id"], "position": facilities["position"],
+                            "month": month_index(facilities["as_of"]), "dpd": facilities["current_dpd"]})
+    return pd.concat([history_frame(reports), current], ignore_index=True).dropna(subset=["month", "dpd"])
+
+
+def dpd_month_rows(dated):
+    """``dpd_frame`` -> ``dpd_months`` rows: the highest DPD per facility and month, month as 'YYYY-MM-01'."""
+    dated = dated.groupby(["report_id", "position", "month"], as_index=False)["dpd"].max()
+    months = dated["month"].astype(int) - 1
+    dated["month"] = pd.to_datetime(pd.DataFrame({"year": months // 12, "month": months % 12 + 1, "day": 1}))
+    dated["month"] = dated["month"].dt.strftime("%Y-%m-%d")
+    dated["position"] = dated["position"].astype(int)
+    dated["dpd"] = dated["dpd"].astype(int)
+    return dated
+
+
+def borrower_details(report):
+    """The report's identity fields: Borrower Details, or the CIBIL consumer Summary row."""
+    if "Borrower Details" in report.sheets:
+        return report["Borrower Details"].iloc[:, 0]
+    summary = report.sheets.get("Summary")
+    return summary.iloc[0] if summary is not None and len(summary) else {}
+
+
+def report_frame(reports, facilities, ingested_at):
+    """One row per report: borrower identity, plus totals over its rows of ``facilities``.
+
+    The report date is the latest facility "as of" date, else the date
+    printed on the report (CIBIL consumer), else None.
+    """
+    rows = []
+    for rid, report in reports:
+        details = borrower_details(report)
+        pan, cin = _detail(details, "PAN"), _detail(details, "CIN/LLPIN")
+        name = borrower_name(report)
+        rows.append({"report_id": rid, "report_type": report.report_type,
+                     "bureau": BUREAUS.get(report.report_type, "UNKNOWN"),
+                     "borrower": borrower_key(BorrowerProfile(pan=pan, cin=cin)) or name or rid,
+                     "borrower_name": name, "pan": pan, "cin": cin, "printed_date": _detail(details, "Report Date")})
+    frame = pd.DataFrame(rows, columns=["report_id", "report_type", "bureau", "borrower", "borrower_name", "pan", "cin",
+                                        "printed_date"])
+    by_report = facilities.groupby("report_id", sort=False)
+    totals = by_report[AMOUNT_FIELDS].sum(min_count=1).assign(
+        facilities=by_report.size(), max_dpd=by_report["max_dpd"].max(), as_of=by_report["as_of"].max())
+    frame = frame.join(totals, on="report_id")
+    frame["facilities"] = frame["facilities"].fillna(0).astype(int)
+    dates = frame.pop("as_of").fillna(to_dates(frame.pop("printed_date")))
+    frame["report_date"] = dates.dt.strftime("%Y-%m-%d")
+    frame["ingested_at"] = ingested_at
+    return frame
+
+
+def _window(months, as_of=None):
+    """('YYYY-MM-DD' ``months`` before ``as_of``, ``as_of``); ``as_of`` defaults to today."""
+    as_of = pd.Timestamp(as_of or datetime.date.today())
+    return (as_of - pd.DateOffset(months=months)).date().isoformat(), as_of.date().isoformat()
+
+
+class PortfolioStore:
+    """SQLite portfolio of parsed reports (see module docstring)."""
+
+    def __init__(self, path):
+        self.path = path
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            for statement in SCHEMA:
+                conn.execute(statement)
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    # ---------- Ingest ----------
+    def ingest(self, reports, group=None):
+        """Add (report_id, Report) pairs in one transaction; returns how many were new.
+
+        Reports already in the store are skipped. ``group`` (e.g. the
+        business group of connected borrowers) is recorded for every
+        borrower in this batch.
+        """
+        ingested_at = datetime.datetime.now().isoformat(timespec="seconds")
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("PRAGMA synchronous=NORMAL")
+                new = self._new_reports(conn, reports)
+                if not new:
+                    return 0
+                facilities = facility_frame(new)
+                report_rows = report_frame(new, facilities, ingested_at)
+                conn.executemany(f"INSERT INTO reports VALUES ({','.join('?' * len(REPORT_FIELDS))})",
+                                 _sql_rows(report_rows, REPORT_FIELDS))
+                conn.executemany(f"INSERT INTO facilities VALUES ({','.join('?' * len(FACILITY_FIELDS))})",
+                                 _sql_rows(facilities, FACILITY_FIELDS))
+                conn.executemany(f"INSERT INTO dpd_months VALUES ({','.join('?' * len(DPD_MONTH_FIELDS))})",
+                                 _sql_rows(dpd_month_rows(dpd_frame(new, facilities)), DPD_MONTH_FIELDS))
+                self._update_borrowers(conn, set(report_rows["borrower"]), group)
+        finally:
+            conn.close()
+        return len(new)
+
+    @staticmethod
+    def _new_reports(conn, reports):
+        """The (report_id, Report) pairs not in the store yet, first of each id."""
+        reports = list(reports)
+        seen = set()
+        ids = [rid for rid, _ in reports]
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            seen.update(rid for rid, in conn.execute(
+                f"SELECT report_id FROM reports WHERE report_id IN ({','.join('?' * len(chunk))})", chunk))
+        new = []
+        for rid, report in reports:
+            if rid not in seen:
+                seen.add(rid)
+                new.append((rid, report))
+        return new
+
+    @staticmethod
+    def _update_borrowers(conn, borrowers, group):
+        # Undated reports (NULL report_date) sort last, behind any dated one
+        conn.executemany("INSERT OR IGNORE INTO borrowers (borrower) VALUES (?)", [(b,) for b in borrowers])
+        conn.executemany(
+            f"UPDATE borrowers SET (latest_report_id, {', '.join(LATEST_FIELDS)}) ="
+            f" (SELECT report_id, {', '.join(LATEST_FIELDS)} FROM reports WHERE borrower = ?1"
+            " ORDER BY report_date DESC, ingested_at DESC, report_id LIMIT 1) WHERE borrower = ?1",
+            [(b,) for b in borrowers])
+        if group is not None:
+            conn.executemany("UPDATE borrowers SET borrower_group = ? WHERE borrower = ?",
+                             [(group, b) for b in borrowers])
+
+    def set_group(self, borrower, group):
+        """Assign a borrower (PAN / CIN key, see ``reports``) to a group; None clears it."""
+        with self._connect() as conn:
+            conn.execute("UPDATE borrowers SET borrower_group = ? WHERE borrower = ?", (group, borrower))
+
+    # ---------- Queries ----------
+    def query(self, sql, params=()):
+        """Run any SQL against the store and return the result as a DataFrame."""
+        conn = self._connect()
+        try:
+            return pd.read_sql_query(sql, conn, params=params)
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _where(filters):
+        clauses = [clause for clause, value in filters if value is not None]
+        params = [value for _, value in filters if value is not None]
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def reports(self, pan=None, cin=None, borrower=None, since=None, until=None, min_dpd=None):
+        """Reports matching every given filter, newest first; dates are 'YYYY-MM-DD' (inclusive)."""
+        where, params = self._where([
+            ("pan = ?", pan), ("cin = ?", cin), ("borrower = ?", borrower),
+            ("report_date >= ?", since), ("report_date <= ?", until), ("max_dpd >= ?", min_dpd)])
+        return self.query(f"SELECT * FROM reports{where} ORDER BY report_date DESC, borrower", params)
+
+    def facilities(self, pan=None, cin=None, lender=None, facility_type=None, since=None, until=None,
+                   min_dpd=None, latest=False):
+        """Facility rows with their borrower and report date; ``latest`` keeps each borrower's latest report only."""
+        where, params = self._where([
+            ("r.pan = ?", pan), ("r.cin = ?", cin), ("f.lender = ?", lender), ("f.facility_type = ?", facility_type),
+            ("r.report_date >= ?", since), ("r.report_date <= ?", until), ("f.max_dpd >= ?", min_dpd)])
+        join = " JOIN borrowers b ON b.latest_report_id = r.report_id" if latest else ""
+        return self.query(
+            f"SELECT {REPORT_CONTEXT}, f.* FROM facilities f JOIN reports r ON r.report_id = f.report_id{join}{where}"
+            " ORDER BY r.report_date DESC, r.borrower, f.position", params)
+
+    def delinquent_borrowers(self, min_dpd=90, months=6, as_of=None):
+        """Borrowers with DPD >= ``min_dpd`` in a month of the ``months`` before ``as_of`` (default today).
+
+        ``max_dpd`` is the highest such DPD in the window and
+        ``last_delinquent_month`` the latest month it was reached.
+        """
+        return self.query(
+            "SELECT r.borrower, MAX(r.borrower_name) AS borrower_name, MAX(r.pan) AS pan, MAX(r.cin) AS cin,"
+            " MAX(d.dpd) AS max_dpd, MAX(d.month) AS last_delinquent_month,"
+            " MAX(r.report_date) AS last_report_date, COUNT(DISTINCT r.report_id) AS reports"
+            " FROM dpd_months d JOIN reports r ON r.report_id = d.report_id"
+            " WHERE d.dpd >= ? AND d.month >= ? AND d.month <= ?"
+            " GROUP BY r.borrower ORDER BY max_dpd DESC, r.borrower",
+            (min_dpd, *_window(months, as_of)))
+
+    def exposure_by_group(self):
+        """Totals of each borrower's latest report, per group (ungrouped borrowers stand alone)."""
+        return self.query(
+            "SELECT COALESCE(borrower_group, borrower_name, borrower) AS borrower_group, COUNT(*) AS borrowers,"
+            " SUM(facilities) AS facilities, SUM(sanctioned) AS sanctioned, SUM(outstanding) AS outstanding,"
+            " SUM(overdue) AS overdue, MAX(max_dpd) AS max_dpd"
+            " FROM borrowers GROUP BY borrower_group IS NULL, COALESCE(borrower_group, borrower)"
+            " ORDER BY outstanding DESC")
@@ -0,0 +1,127 @@
+"""Slotted record types for what the parsers extract per block.
+
+One record per facility / account / enquiry (and one ``BorrowerProfile``
+per report) is built while a report is read, and the whole list becomes a
+DataFrame or Arrow table in one step at the end:
+
+    df = Facility.to_frame(facilities, LOAN_LABELS)   # labels: {field: column name}
+    table = Facility.to_arrow(facilities)
+
+The classes are ``dataclass(slots=True)``: instances have no ``__dict__``
+and the field names live once on the class rather than as string keys in
+every record. Values stay as matched (text); ``frames.records_frame``
+types them per column. ``get`` / ``items`` give the dict-style access
+``incremental`` diffs records with.
+"""
+from dataclasses import dataclass, fields
+from operator import attrgetter
+
+import pandas as pd
+import pyarrow as pa
+
+
+class Record:
+    """Bulk conversion shared by the record types (no slots of its own)."""
+    __slots__ = ()
+
+    @classmethod
+    def field_names(cls):
+        return [field.name for field in fields(cls)]
+
+    @classmethod
+    def columns(cls, records, names=None):
+        """{field: [value of each record]} for ``names`` (every field by default)."""
+        names = list(names or cls.field_names())
+        if len(names) == 1:
+            return {names[0]: list(map(attrgetter(names[0]), records))}
+        rows = list(map(attrgetter(*names), records))
+        if not rows:
+            return {name: [] for name in names}
+        return dict(zip(names, map(list, zip(*rows))))
+
+    @classmethod
+    def _labels(cls, labels):
+        return labels or {name: name for name in cls.field_names()}
+
+    @classmethod
+    def to_frame(cls, records, labels=None):
+        """Records -> DataFrame; ``labels`` maps field -> column name and picks the columns."""
+        labels = cls._labels(labels)
+        columns = cls.columns(records, labels)
+        return pd.DataFrame({labels[name]: values for name, values in columns.items()},
+                            columns=list(labels.values()))
+
+    @classmethod
+    def to_arrow(cls, records, labels=None):
+        """Records -> pyarrow Table, as ``to_frame``."""
+        labels = cls._labels(labels)
+        return pa.table({labels[name]: pa.array(values) for name, values in cls.columns(records, labels).items()})
+
+    def get(self, name, default=None):
+        return getattr(self, name, default)
+
+    def items(self):
+        return [(name, getattr(self, name)) for name in self.field_names()]
+
+
+@dataclass(slots=True)
+class Facility(Record):
+    """A CRIF loan or CIBIL commercial credit facility."""
+    facility_no: str | None = None
+    type: str | None = None
+    asset_classification: str | None = None
+    info_as_of: str | None = None
+    sanctioned_date: str | None = None
+    sanctioned_amount: str | None = None
+    current_balance: str | None = None
+    closed_date: str | None = None
+    amount_overdue: str | None = None
+    suit_filed: str | None = None
+    wilful_defaulter: str | None = None
+    payment_history: list | None = None  # "Mon YEAR value" cells (CRIF)
+
+
+@dataclass(slots=True)
+class ConsumerAccount(Record):
+    """A CIBIL consumer account, or a facility of a CIBIL consumer commercial report ('' when absent)."""
+    type: str = ''
+    ownership: str = ''
+    opened: str = ''
+    closed: str = ''
+    sanctioned: str = ''
+    current_balance: str = ''
+    high_credit: str = ''
+    cash_limit: str = ''
+    emi: str = ''
+    actual_payment: str = ''
+    payment_frequency: str = ''
+    status: str = ''
+    overdue: str = ''
+    max_dpd: int = 0
+
+
+@dataclass(slots=True)
+class Inquiry(Record):
+    """One CRIF enquiry row, in the report's column order."""
+    lender: str | None = None
+    date: str | None = None
+    purpose: str | None = None
+    amount: str | None = None
+    type: str | None = None
+    status: str | None = None
+
+
+@dataclass(slots=True)
+class BorrowerProfile(Record):
+    """Borrower identity from a report header (commercial details, or a consumer's name and score)."""
+    name: str | None = None
+    legal_constitution: str | None = None
+    class_of_activity: str | None = None
+    pan: str | None = None
+    date_of_incorporation: str | None = None
+    cin: str | None = None
+    loan_amount_applied: str | None = None
+    registered_address: str | None = None
+    score: str | None = None
+    score_details: str | None = None
+    score_tip: str | None = None
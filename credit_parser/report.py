@@ -0,0 +1,47 @@
+"""Parser output container."""
+import hashlib
+import json
+from dataclasses import dataclass, field
+
+from .source import PDFSource
+
+# report type -> bureau
+BUREAUS = {
+    "crif_commercial": "CRIF",
+    "cibil_consumer": "CIBIL",
+    "cibil_commercial": "CIBIL",
+}
+
+
+def report_id(pdf):
+    """Stable id of a report: the SHA-256 of its PDF bytes (bytes-like or a ``PDFSource``)."""
+    if isinstance(pdf, PDFSource):
+        return pdf.sha256()
+    return hashlib.sha256(pdf).hexdigest()
+
+
+@dataclass
+class Report:
+    """Everything a parser extracted from one PDF.
+
+    ``sheets`` maps the Excel sheet name used by the Streamlit pages to its
+    DataFrame, in display order.
+    """
+    report_type: str
+    sheets: dict = field(default_factory=dict)
+    pages: int = 0
+
+    def __getitem__(self, sheet_name):
+        return self.sheets[sheet_name]
+
+    def to_dict(self):
+        """JSON-ready form: each sheet as {"columns", "index", "data"} rows.
+
+        Dates become ISO strings and missing values ``None``.
+        """
+        return {
+            "report_type": self.report_type,
+            "pages": self.pages,
+            "sheets": {name: json.loads(df.to_json(orient="split", date_format="iso", default_handler=str))
+                       for name, df in self.sheets.items()},
+        }
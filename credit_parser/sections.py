@@ -0,0 +1,53 @@
+"""Incremental splitting of streamed report text at a repeated section marker.
+
+Facility / account sections ("Loan Terms For:", "10. Credit Facility Details
+- As Borrower", "ACCOUNT INFORMATION") are emitted as soon as the next marker
+closes them, so a parser can turn each one into a record and drop its text
+instead of holding the whole document as one string.
+"""
+
+HEAD = "head"
+SECTION = "section"
+
+
+def stream_sections(chunks, marker):
+    """Yield ``(HEAD, text)`` then ``(SECTION, text)`` for each marker section.
+
+    ``chunks`` is any iterable of text pieces whose concatenation is the
+    document text (see ``pdf.iter_text_chunks``). The head is everything
+    before the first marker (the whole text if the marker never occurs) and
+    is always yielded exactly once, first. Each section runs from its marker
+    up to the next one; the last runs to the end of the text. The result is
+    identical to slicing the full concatenated text at every marker.
+    """
+    buffer = ""
+    started = False
+    for chunk in chunks:
+        # Only the new chunk (plus a marker-length overlap) can hold a new marker
+        search_from = max(len(buffer) - len(marker) + 1, 0)
+        buffer += chunk
+        while True:
+            # Markers never overlap themselves, so the open section's own
+            # marker at offset 0 is skipped by searching from 1
+            index = buffer.find(marker, max(search_from, 1) if started else search_from)
+            if index == -1:
+                break
+            yield (SECTION if started else HEAD), buffer[:index]
+            buffer = buffer[index:]
+            started = True
+            search_from = 1
+    if started:
+        yield SECTION, buffer
+    else:
+        yield HEAD, buffer
+
+
+def split_sections(text, marker):
+    """Non-streaming form: (head, [sections]) of an already extracted text."""
+    head, sections = "", []
+    for kind, part in stream_sections([text], marker):
+        if kind == HEAD:
+            head = part
+        else:
+            sections.append(part)
+    return head, sections
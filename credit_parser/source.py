@@ -0,0 +1,160 @@
+"""One input type for a PDF, whether it lives on disk or in memory.
+
+Every entry point (``parse``, ``classify``, the cache, the isolated
+workers, the batch runner) takes a path, bytes-like object or
+``PDFSource`` and turns it into a ``PDFSource`` with ``open_source``:
+
+    with PDFSource.from_path("report.pdf") as source:
+        report = parse(source)
+
+- A file on disk is memory-mapped, never read into a bytes object; PyMuPDF
+  opens it by path and reads pages as it needs them, and ``sha256`` hashes
+  it a chunk at a time.
+- In-memory data (an upload, an HTTP body) is wrapped in a memoryview of
+  the caller's buffer, which PyMuPDF also reads without a copy.
+- ``document()`` opens the PyMuPDF document once; detection, the text
+  backend, the page index and the table finder all share it.
+- camelot, which only reads files, gets the original path. In-memory data
+  is the one case it needs a copy for: a short-lived file on the RAM-backed
+  ``/dev/shm`` where there is one, so nothing goes to disk.
+- A path source crosses to a worker process as its path only.
+
+Each document opened adds to the ``documents_opened`` count (see
+``timing``). Whatever still has to copy the PDF bytes (pickling in-memory
+data for a worker, that camelot file, a stream for PyPDF2 / pdfminer over
+a non-``bytes`` buffer) adds the size to ``bytes_copied``.
+"""
+import hashlib
+import mmap
+import os
+import tempfile
+from contextlib import contextmanager
+from io import BytesIO
+
+from .timing import count
+
+# tmpfs (RAM) on Linux; files for readers that only take a path go here
+SHARED_MEMORY_DIR = "/dev/shm"
+
+# A mapped file is hashed this much at a time, each chunk's pages dropped after
+HASH_CHUNK = 8 * 2**20
+
+
+class PDFSource:
+    """A PDF's bytes (``data``, a read-only memoryview), its path if on disk, and its shared document."""
+
+    def __init__(self, data, path=None, mapped=None):
+        self._buffer = data
+        self.data = data.toreadonly() if isinstance(data, memoryview) else memoryview(data).toreadonly()
+        self.path = path
+        self._mapped = mapped
+        self._document = None
+
+    @classmethod
+    def from_path(cls, path):
+        path = os.fspath(path)
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return cls(b"", path)  # an empty file cannot be mapped
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(memoryview(mapped), path, mapped)
+
+    @classmethod
+    def from_bytes(cls, data):
+        return cls(data)
+
+    def __len__(self):
+        return self.data.nbytes
+
+    def sha256(self):
+        """Hex SHA-256 of the bytes. A mapped file never becomes resident as a whole."""
+        if self._mapped is None or not hasattr(mmap, "MADV_DONTNEED"):
+            return hashlib.sha256(self.data).hexdigest()
+        digest = hashlib.sha256()
+        for start in range(0, len(self), HASH_CHUNK):
+            digest.update(self.data[start:start + HASH_CHUNK])
+            self._mapped.madvise(mmap.MADV_DONTNEED, start, min(HASH_CHUNK, len(self) - start))
+        return digest.hexdigest()
+
+    def document(self):
+        """The PyMuPDF document, opened on first use and shared by every later caller."""
+        if self._document is None:
+            from .pdf import open_document, open_file
+            self._document = open_file(self.path) if self.path else open_document(self.data)
+            count("documents_opened")
+        return self._document
+
+    def stream(self):
+        """A binary file object over the PDF, for readers that want one (PyPDF2, pdfminer)."""
+        if self.path:
+            return open(self.path, "rb")
+        if isinstance(self._buffer, bytes):
+            return BytesIO(self._buffer)  # shares the bytes object until written to
+        count("bytes_copied", len(self))
+        return BytesIO(self.data)
+
+    @contextmanager
+    def file_path(self):
+        """A filesystem path to the PDF for as long as the block runs (camelot only reads files).
+
+        A source from a file yields that file. In-memory data needs the one
+        copy camelot would otherwise spill to a disk temp file itself.
+        """
+        if self.path:
+            yield self.path
+            return
+        count("bytes_copied", len(self))
+        # Not a memfd: pypdfium2 resolves /proc/self/fd links and cannot open them
+        in_memory = SHARED_MEMORY_DIR if os.path.isdir(SHARED_MEMORY_DIR) else None
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf", dir=in_memory) as tmp_file:
+            tmp_file.write(self.data)
+        try:
+            yield tmp_file.name
+        finally:
+            os.unlink(tmp_file.name)
+
+    def close(self):
+        if self._document is not None:
+            self._document.close()
+            self._document = None
+        if self._mapped is not None:
+            self.data.release()
+            self._buffer.release()
+            try:
+                self._mapped.close()
+            except BufferError:
+                pass  # a view of the mapping is still held elsewhere; it goes with it
+            self._mapped = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __reduce__(self):
+        # To another process: a file by its path, in-memory data as one copy of its bytes
+        if self.path:
+            return PDFSource.from_path, (self.path,)
+        count("bytes_copied", len(self))
+        return PDFSource.from_bytes, (self._buffer if isinstance(self._buffer, bytes) else self.data.tobytes(),)
+
+
+def open_source(pdf):
+    """``pdf`` (a path, bytes-like object or ``PDFSource``) as a ``PDFSource``."""
+    if isinstance(pdf, PDFSource):
+        return pdf
+    if isinstance(pdf, (str, os.PathLike)):
+        return PDFSource.from_path(pdf)
+    return PDFSource.from_bytes(pdf)
+
+
+@contextmanager
+def using_source(pdf):
+    """``open_source(pdf)`` for the block; closed at the end unless the caller passed a ``PDFSource`` (theirs to close)."""
+    source = open_source(pdf)
+    try:
+        yield source
+    finally:
+        if source is not pdf:
+            source.close()
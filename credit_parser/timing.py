@@ -0,0 +1,192 @@
+"""Per-stage timings, counters and optional profiling of report processing.
+
+Parsers mark their stages with ``stage("regex")`` / ``count("pages", n)``.
+These are no-ops unless the caller is inside ``instrument()``:
+
+    with instrument("report.pdf") as timings:
+        report = parse(pdf_bytes)
+    timings.as_dict()   # {"label", "total_seconds", "stages": {...}, "counts": {...}}
+
+Stages used by the parsers: open (PDF/backend), extract (page text),
+regex (field/section parsing), tables (PyMuPDF/camelot tables), frames
+(DataFrame building), excel (workbook writing); detect and json are
+added by callers. Counts: pages, facilities,
+bytes_in, bytes_out, bytes_copied / documents_opened (``source``),
+cache_hits, blocks_parsed / blocks_reused (``incremental``). Reports
+parsed in a child process (``isolation``) have their stages and counts
+folded into the caller's ``instrument()``.
+
+On exit the result is logged as one JSON line on the ``credit_parser.timing``
+logger. Passing ``profile="cprofile"`` (or "pyinstrument", if installed)
+also writes a per-report profile to ``profile_dir``. Both default to the
+CREDIT_PARSER_PROFILE / CREDIT_PARSER_PROFILE_DIR environment variables.
+"""
+import contextvars
+import json
+import logging
+import os
+import re
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+logger = logging.getLogger("credit_parser.timing")
+
+PROFILE_ENV = "CREDIT_PARSER_PROFILE"
+PROFILE_DIR_ENV = "CREDIT_PARSER_PROFILE_DIR"
+PROFILERS = ("cprofile", "pyinstrument")
+
+_current = contextvars.ContextVar("credit_parser_timings", default=None)
+
+
+class Timings:
+    """Accumulated seconds per stage and counters for one report."""
+
+    def __init__(self, label=None, on_stage=None):
+        self.label = label
+        self.stages = {}
+        self.counts = {}
+        self.total = 0.0
+        self.profile_path = None
+        # Innermost stage an exception escaped from
+        self.failed_stage = None
+        # Called with the stage name whenever a stage starts
+        self.on_stage = on_stage
+
+    @contextmanager
+    def stage(self, name):
+        if self.on_stage is not None:
+            self.on_stage(name)
+        started = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            if self.failed_stage is None:
+                self.failed_stage = name
+            raise
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - started
+
+    def count(self, name, n=1):
+        self.counts[name] = self.counts.get(name, 0) + n
+
+    def merge(self, stats):
+        """Add the stages and counts of an ``as_dict()`` taken elsewhere (e.g. a child process)."""
+        for name, seconds in stats.get("stages", {}).items():
+            self.stages[name] = self.stages.get(name, 0.0) + seconds
+        for name, n in stats.get("counts", {}).items():
+            self.count(name, n)
+        if self.failed_stage is None:
+            self.failed_stage = stats.get("failed_stage")
+
+    def as_dict(self):
+        result = {
+            "label": self.label,
+            "total_seconds": round(self.total, 6),
+            "stages": {name: round(seconds, 6) for name, seconds in self.stages.items()},
+            # Time outside any stage: section splitting, glue code, caching
+            "unstaged_seconds": round(max(self.total - sum(self.stages.values()), 0.0), 6),
+            "counts": dict(self.counts),
+        }
+        if self.failed_stage:
+            result["failed_stage"] = self.failed_stage
+        if self.profile_path:
+            result["profile"] = str(self.profile_path)
+        return result
+
+
+# ---------- Parser-side hooks ----------
+@contextmanager
+def stage(name):
+    """Time the enclosed block as ``name`` when instrumenting; otherwise do nothing."""
+    timings = _current.get()
+    if timings is None:
+        yield
+    else:
+        with timings.stage(name):
+            yield
+
+
+def count(name, n=1):
+    timings = _current.get()
+    if timings is not None:
+        timings.count(name, n)
+
+
+def merge(stats):
+    timings = _current.get()
+    if timings is not None:
+        timings.merge(stats)
+
+
+def timed_pages(pages, name="extract"):
+    """Wrap a page-text iterator so the time spent producing pages counts as ``name``.
+
+    Parsing done by the consumer between pages is not included.
+    """
+    timings = _current.get()
+    if timings is None:
+        yield from pages
+        return
+    pages = iter(pages)
+    while True:
+        with timings.stage(name):
+            text = next(pages, None)
+        if text is None:
+            return
+        yield text
+
+
+# ---------- Caller side ----------
+def _start_profiler(profile):
+    if profile == "cprofile":
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+        return profiler
+    if profile == "pyinstrument":
+        from pyinstrument import Profiler
+        profiler = Profiler()
+        profiler.start()
+        return profiler
+    raise ValueError(f"unknown profiler {profile!r}; expected one of {PROFILERS}")
+
+
+def _dump_profile(profile, profiler, profile_dir, label):
+    name = re.sub(r"[^\w.-]+", "_", Path(str(label or "report")).stem)
+    directory = Path(profile_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+    stamp = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+    if profile == "cprofile":
+        profiler.disable()
+        path = directory / f"{name}-{stamp}.prof"
+        profiler.dump_stats(path)
+    else:
+        profiler.stop()
+        path = directory / f"{name}-{stamp}.html"
+        path.write_text(profiler.output_html())
+    return path
+
+
+@contextmanager
+def instrument(label=None, profile=None, profile_dir=None, log=True, on_stage=None):
+    """Collect stage timings for everything run inside the block (see module docstring).
+
+    ``on_stage(name)`` is called as each stage starts (used to report progress
+    out of an isolated worker).
+    """
+    profile = profile if profile is not None else os.environ.get(PROFILE_ENV) or None
+    profile_dir = profile_dir or os.environ.get(PROFILE_DIR_ENV) or "profiles"
+    timings = Timings(label, on_stage=on_stage)
+    token = _current.set(timings)
+    profiler = _start_profiler(profile) if profile else None
+    started = time.perf_counter()
+    try:
+        yield timings
+    finally:
+        timings.total = time.perf_counter() - started
+        _current.reset(token)
+        if profiler is not None:
+            timings.profile_path = _dump_profile(profile, profiler, profile_dir, label)
+        if log:
+            logger.info(json.dumps(timings.as_dict()))
@@ -0,0 +1,162 @@
+# --- Shared Streamlit building blocks: isolated parsing, lazy section tabs, big tables, deferred Excel, multi-file groups ---
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import pandas as pd
+import streamlit as st
+from io import BytesIO
+
+from credit_parser.cache import default_cache
+from credit_parser.excel import write_workbook
+from credit_parser.group import borrower_name, facility_table, group_sheets, group_summary
+from credit_parser.isolation import call_isolated
+
+XLSX_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# Tables longer than this are streamed to the browser in chunks as the user
+# scrolls instead of being sent whole (Streamlit loads small ones eagerly anyway)
+LAZY_ROWS = 1000
+
+
+# ---------- Per-upload memo ----------
+def upload_memo(uploaded):
+    """Plain dict kept in session state for the current upload (one file or a list);
+    a new upload starts a fresh one.
+
+    Being a plain dict, it can also be used from a deferred download callable,
+    which runs outside the script and has no session state.
+    """
+    file_id = tuple(f.file_id for f in uploaded) if isinstance(uploaded, list) else uploaded.file_id
+    memo = st.session_state.get("upload_memo")
+    if memo is None or memo["file_id"] != file_id:
+        memo = st.session_state["upload_memo"] = {"file_id": file_id, "values": {}}
+    return memo["values"]
+
+
+def memoised(memo, name, compute):
+    """``compute()`` the first time ``name`` is asked for in ``memo``, then reuse it."""
+    if name not in memo:
+        memo[name] = compute()
+    return memo[name]
+
+
+# ---------- Parsing ----------
+# Every report is parsed in its own child process with a timeout and memory
+# limit (see credit_parser.isolation), so a malformed PDF cannot hang or kill
+# the server; results go through the shared cache.
+def parse_upload(memo, file_bytes, report_type, **options):
+    """The upload's Report, parsed once per upload.
+
+    A report that could not be parsed is shown as an error and stops the
+    page; one that needed the cheaper fallback path gets a warning.
+    """
+    result = memoised(memo, "parsed", lambda: default_cache().parse_isolated(file_bytes, report_type, **options))
+    if result.report is None:
+        st.error(f"❌ Could not parse this report ({result.error}).")
+        st.stop()
+    if result.fallback:
+        st.warning(f"⚠️ Parsed without tables after a {result.error.kind}; some sections may be missing.")
+    return result.report
+
+
+def isolated_sheets(func, file_bytes, names, **options):
+    """Sheets ``names`` of ``func(source, **options)`` (a {sheet: DataFrame}
+    function, see ``isolation.call_isolated``) run in its own child; a
+    one-cell "Error" frame stands in for each that could not be produced.
+    Safe to call from a download callable.
+    """
+    sheets, error = call_isolated(func, file_bytes, **options)
+    sheets = sheets or {}
+    return {name: sheets[name] if name in sheets else pd.DataFrame({"Error": [str(error)]}) for name in names}
+
+
+# ---------- Display ----------
+def show_table(df):
+    if len(df) > LAZY_ROWS:
+        st.caption(f"{len(df):,} rows")
+        st.dataframe(df, lazy=True)
+    else:
+        st.dataframe(df)
+
+
+def section_tabs(memo, sections, key):
+    """One tab per section; only the open tab's section is built and sent.
+
+    ``sections`` maps tab label -> callable returning a DataFrame (or a tuple
+    of DataFrames shown one under the other). Each is computed on first view
+    and kept in ``memo`` (see ``upload_memo``).
+    """
+    tabs = st.tabs(list(sections), key=key, on_change="rerun")
+    for (label, build), tab in zip(sections.items(), tabs):
+        if not tab.open:
+            continue
+        with tab:
+            frames = memoised(memo, f"{key}:{label}", build)
+            for df in frames if isinstance(frames, tuple) else (frames,):
+                show_table(df)
+
+
+# ---------- Excel export ----------
+def excel_download_button(label, build_sheets, file_name, skip_headers=()):
+    """Download button whose workbook is only written when it is clicked.
+
+    ``build_sheets`` returns the {name: DataFrame} (or (name, DataFrame)
+    pairs) to export; it runs on a separate thread, so it must not call Streamlit.
+    """
+    def workbook_bytes():
+        return write_workbook(BytesIO(), build_sheets(), skip_headers=skip_headers).getvalue()
+
+    st.download_button(label, data=workbook_bytes, file_name=file_name, mime=XLSX_MIME, on_click="ignore")
+
+
+# ---------- Multi-file groups ----------
+def parse_files(uploaded_files, report_type):
+    """Parse several uploads side by side with live per-file progress.
+
+    Returns ``[(file name, Report or None, error)]`` in upload order. Each
+    report gets its own child process, so one bad file only fails itself.
+    """
+    cache = default_cache()
+    results = [None] * len(uploaded_files)
+    status = st.status(f"Parsing {len(uploaded_files)} reports...", expanded=True)
+    progress = status.progress(0.0)
+    done = 0
+
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+        futures = {pool.submit(cache.parse_isolated, uploaded_file.getvalue(), report_type): (i, uploaded_file.name)
+                   for i, uploaded_file in enumerate(uploaded_files)}
+        for future in as_completed(futures):
+            i, name = futures[future]
+            result = future.result()
+            error = str(result.error) if result.report is None else None
+            results[i] = (name, result.report, error)
+            done += 1
+            progress.progress(done / len(results), text=f"{done}/{len(results)} reports")
+            if error:
+                status.write(f"❌ {name}: {error}")
+            elif result.fallback:
+                status.write(f"⚠️ {name} ({result.report.pages} pages, without tables after a {result.error.kind})")
+            else:
+                status.write(f"✅ {name} ({result.report.pages} pages)")
+
+    failed = sum(1 for _, report, _ in results if report is None)
+    status.update(label=f"Parsed {len(results) - failed}/{len(results)} reports",
+                  state="error" if failed else "complete", expanded=bool(failed))
+    return results
+
+
+def group_view(uploaded_files, report_type, file_name):
+    """Group summary, a lazy tab per borrower and one consolidated workbook for several reports."""
+    memo = upload_memo(uploaded_files)
+    results = memoised(memo, "group_results", lambda: parse_files(uploaded_files, report_type))
+    st.subheader("Group Summary")
+    show_table(memoised(memo, "group_summary", lambda: group_summary(results)))
+
+    parsed = [(name, report) for name, report, _ in results if report is not None]
+    if parsed:
+        # Tab labels must be unique; borrowers with several reports get the file name too
+        labels = [borrower_name(report) or name for name, report in parsed]
+        labels = [f"{label} ({name})" if labels.count(label) > 1 else label for label, (name, _) in zip(labels, parsed)]
+        section_tabs(memo, {label: (lambda report=report: facility_table(report))
+                            for label, (_, report) in zip(labels, parsed)}, key=f"{report_type}_group")
+    excel_download_button("📥 Download Group Workbook", lambda: group_sheets(results), file_name=file_name)
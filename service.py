@@ -0,0 +1,347 @@
+# --- HTTP parsing service: POST a PDF, get the parsed sheets back as JSON ---
+"""Local ASGI service for calling the parsers from other systems.
+
+    POST /parse/crif               raw PDF bytes in the request body
+                                   (?format=xlsx for a workbook instead of JSON)
+    POST /parse/cibil-consumer
+    POST /parse/cibil-commercial
+    POST /parse                    bureau/format auto-detected
+    POST /detect                   bureau, kind and layout only (first pages)
+    GET  /metrics                  Prometheus text format
+    GET  /health
+
+Parse and detect responses carry a Server-Timing header with the
+per-stage timings, which are also logged as JSON on the
+``credit_parser.timing`` logger.
+
+Parsing and detection are CPU-bound and run in a bounded process pool. At
+most ``max_pending`` reports are accepted at once (queued or running);
+beyond that requests get 429 so callers back off instead of piling up.
+Each parse or detection runs in an isolated child under ``timeout`` (see
+``credit_parser.isolation``), so a report that takes longer is killed and
+its request gets 504; a job still queued when its request times out is
+cancelled. If a pool worker dies the pool is replaced and the requests it
+held get 503.
+
+Run with ``python service.py --port 8000``. In-process (needs httpx2, see
+requirements.txt; tests/test_service.py drives it this way):
+
+    from starlette.testclient import TestClient
+    with TestClient(create_app(workers=1)) as client:
+        client.post("/parse/crif", content=pdf_bytes).json()
+"""
+import argparse
+import asyncio
+import bisect
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager
+from dataclasses import asdict
+
+from starlette.applications import Starlette
+from starlette.background import BackgroundTask
+from starlette.responses import FileResponse, JSONResponse, PlainTextResponse, Response
+from starlette.routing import Route
+
+from credit_parser.cache import default_cache
+from credit_parser.excel import write_workbook
+from credit_parser.isolation import TIMEOUT, classify_isolated
+from credit_parser.timing import instrument, stage, logger as timing_logger
+
+# URL slug -> report type (None: detect)
+ROUTES = {
+    "crif": "crif_commercial",
+    "cibil-consumer": "cibil_consumer",
+    "cibil-commercial": "cibil_commercial",
+    "auto": None,
+}
+
+MAX_UPLOAD_BYTES = 50 * 1024 * 1024
+
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+# ---------- Worker ----------
+class WorkerFailure(Exception):
+    """A job that failed in its isolated child; ``kind`` is a ``credit_parser.isolation`` failure kind."""
+
+    def __init__(self, kind, message):
+        super().__init__(kind, message)
+        self.kind = kind
+        self.message = message
+
+    def __str__(self):
+        return self.message
+
+    @classmethod
+    def from_record(cls, error):
+        """From an isolation ``ParseFailure``."""
+        return cls(error.kind, f"{error.error_type}: {error.message}" if error.error_type else error.message)
+
+
+def parse_report(file_bytes, report_type, timeout):
+    """Parse in a child process killed after ``timeout`` seconds, so a stuck report never holds a pool worker."""
+    result = default_cache().parse_isolated(file_bytes, report_type, timeout=timeout, max_rss_mb=None,
+                                            fallback=False)
+    if result.error:
+        raise WorkerFailure.from_record(result.error)
+    return result.report
+
+
+def parse_to_json(file_bytes, report_type=None, timeout=None):
+    """Runs in a pool process: parse and serialise there, return (JSON text, timings).
+
+    Shipping a string back is cheaper than pickling the DataFrames.
+    """
+    with instrument(report_type, log=False) as timings:
+        report = parse_report(file_bytes, report_type, timeout)
+        with stage("json"):
+            payload = json.dumps(report.to_dict())
+    return payload, timings.as_dict()
+
+
+def parse_to_xlsx(file_bytes, report_type=None, timeout=None):
+    """Runs in a pool process: stream the workbook to a temp file, return (path, timings)."""
+    with instrument(report_type, log=False) as timings:
+        report = parse_report(file_bytes, report_type, timeout)
+        with tempfile.NamedTemporaryFile(suffix=".xlsx", delete=False) as f:
+            write_workbook(f, report.sheets)
+    return f.name, timings.as_dict()
+
+
+def detect_to_dict(file_bytes, timeout=None):
+    """Runs in a pool process: detection in a child killed after ``timeout``, return (dict, timings)."""
+    with instrument("detect", log=False) as timings:
+        detection, error = classify_isolated(file_bytes, timeout=timeout, max_rss_mb=None)
+        if error:
+            raise WorkerFailure.from_record(error)
+    return asdict(detection), timings.as_dict()
+
+
+async def read_body(request, limit=MAX_UPLOAD_BYTES):
+    """The request body, or None as soon as it is known to be over ``limit`` bytes."""
+    declared = request.headers.get("content-length", "")
+    if declared.isdigit() and int(declared) > limit:
+        return None
+    chunks, size = [], 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > limit:
+            return None
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def server_timing(timings):
+    """Stage timings as a Server-Timing header (milliseconds)."""
+    return ", ".join(f"{name};dur={seconds * 1000:.1f}" for name, seconds in timings["stages"].items())
+
+
+# ---------- Metrics ----------
+class LatencyHistogram:
+    """Cumulative-bucket latency histogram in the Prometheus exposition format."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.total += seconds
+
+    def lines(self, name, labels):
+        cumulative = 0
+        for bound, count in zip(self.buckets + ("+Inf",), self.counts):
+            cumulative += count
+            yield f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}'
+        yield f"{name}_sum{{{labels}}} {self.total:.6f}"
+        yield f"{name}_count{{{labels}}} {cumulative}"
+
+
+class Metrics:
+    def __init__(self):
+        self.latency = {}    # route -> LatencyHistogram
+        self.responses = {}  # (route, status) -> count
+        self.pending = 0
+
+    def record(self, route, status, seconds):
+        self.latency.setdefault(route, LatencyHistogram()).observe(seconds)
+        self.responses[route, status] = self.responses.get((route, status), 0) + 1
+
+    def render(self, max_pending):
+        lines = [
+            "# TYPE credit_parser_request_seconds histogram",
+            *(line for route, hist in sorted(self.latency.items())
+              for line in hist.lines("credit_parser_request_seconds", f'route="{route}"')),
+            "# TYPE credit_parser_responses_total counter",
+            *(f'credit_parser_responses_total{{route="{route}",status="{status}"}} {count}'
+              for (route, status), count in sorted(self.responses.items())),
+            "# TYPE credit_parser_pending gauge",
+            f"credit_parser_pending {self.pending}",
+            "# TYPE credit_parser_max_pending gauge",
+            f"credit_parser_max_pending {max_pending}",
+        ]
+        return "\n".join(lines) + "\n"
+
+
+# ---------- App ----------
+def create_app(workers=None, max_pending=None, timeout=60.0):
+    """Build the Starlette app; the process pool lives for the app's lifespan."""
+    workers = workers or os.cpu_count()
+    max_pending = max_pending or workers * 4
+    metrics = Metrics()
+    state = {}
+
+    def release(_):
+        # A slot is freed when the worker finishes, even after a 504, so the
+        # limit counts the work the pool is really doing.
+        metrics.pending -= 1
+
+    def replace_pool(broken):
+        # Requests failing on the same dead pool replace it only once
+        if state["pool"] is broken:
+            state["pool"] = ProcessPoolExecutor(max_workers=workers)
+            broken.shutdown(wait=False, cancel_futures=True)
+
+    def error(status, message, **headers):
+        return status, JSONResponse({"error": message}, status_code=status, headers=headers or None)
+
+    async def run_job(request, job, *args, discard=None):
+        """Read the body and run ``job(body, *args)`` in the pool: (status, result or error response).
+
+        The slot is taken before the first await, so concurrent requests
+        cannot all pass the ``max_pending`` check. ``discard`` is called on
+        a result that arrives after its request timed out.
+        """
+        if metrics.pending >= max_pending:
+            return error(429, "too many reports in progress, retry later", **{"Retry-After": "1"})
+        metrics.pending += 1
+        future = None
+        try:
+            file_bytes = await read_body(request)
+            if file_bytes is None:
+                return error(413, "PDF too large")
+            if not file_bytes:
+                return error(400, "empty request body; send the PDF bytes")
+            pool = state["pool"]
+            try:
+                future = pool.submit(job, file_bytes, *args)
+            except BrokenProcessPool:
+                replace_pool(pool)
+                pool = state["pool"]
+                future = pool.submit(job, file_bytes, *args)
+            loop = asyncio.get_running_loop()
+            future.add_done_callback(lambda f: loop.call_soon_threadsafe(release, f))
+        finally:
+            if future is None:
+                metrics.pending -= 1
+        waiter = asyncio.wrap_future(future)
+        try:
+            return 200, await asyncio.wait_for(asyncio.shield(waiter), timeout)
+        except asyncio.TimeoutError:
+            future.cancel()  # still queued: never starts; running: the isolated child is killed at ``timeout``
+            waiter.add_done_callback(lambda w: w.cancelled() or w.exception())  # nobody awaits it now
+            if discard:
+                future.add_done_callback(lambda f: f.cancelled() or f.exception() or discard(f.result()))
+            return error(504, f"parsing took longer than {timeout:g}s")
+        except BrokenProcessPool:
+            replace_pool(pool)
+            return error(503, "parser worker crashed, retry", **{"Retry-After": "1"})
+        except WorkerFailure as e:
+            if e.kind == TIMEOUT:
+                return error(504, f"parsing took longer than {timeout:g}s")
+            return error(422, str(e))
+        except asyncio.CancelledError:
+            if not future.cancelled():
+                raise  # the request itself was cancelled
+            return error(503, "parser pool restarted, retry", **{"Retry-After": "1"})
+        except Exception as e:
+            return error(422, f"{type(e).__name__}: {e}")
+
+    async def parse_endpoint(request):
+        route = request.path_params.get("kind", "auto")
+        if route not in ROUTES:
+            return JSONResponse({"error": f"unknown report kind {route!r}; expected one of {sorted(ROUTES)}"},
+                                status_code=404)
+        started = time.perf_counter()
+        xlsx = request.query_params.get("format") == "xlsx"
+        status, response = await handle_parse(request, ROUTES[route], xlsx)
+        metrics.record(route, status, time.perf_counter() - started)
+        return response
+
+    async def handle_parse(request, report_type, xlsx=False):
+        if xlsx:
+            status, result = await run_job(request, parse_to_xlsx, report_type, timeout,
+                                           discard=lambda result: os.remove(result[0]))
+        else:
+            status, result = await run_job(request, parse_to_json, report_type, timeout)
+        if status != 200:
+            return status, result
+        payload, timings = result
+        timing_logger.info(json.dumps(timings))
+        if xlsx:
+            # Streamed from disk, then deleted
+            return 200, FileResponse(payload, media_type=XLSX_MEDIA_TYPE, filename="parsed_report.xlsx",
+                                     headers={"Server-Timing": server_timing(timings)},
+                                     background=BackgroundTask(os.remove, payload))
+        headers = {"Server-Timing": server_timing(timings)}
+        return 200, Response(payload, media_type="application/json", headers=headers)
+
+    async def detect_endpoint(request):
+        # Cheap (a page or two), but still PDF work: kept off the event loop
+        # and under the same timeout as a parse
+        started = time.perf_counter()
+        status, result = await run_job(request, detect_to_dict, timeout)
+        metrics.record("detect", status, time.perf_counter() - started)
+        if status != 200:
+            return result
+        detection, timings = result
+        timing_logger.info(json.dumps(timings))
+        return JSONResponse(detection, headers={"Server-Timing": server_timing(timings)})
+
+    async def metrics_endpoint(request):
+        return PlainTextResponse(metrics.render(max_pending), media_type="text/plain; version=0.0.4")
+
+    async def health(request):
+        return JSONResponse({"status": "ok", "pending": metrics.pending, "max_pending": max_pending})
+
+    @asynccontextmanager
+    async def lifespan(app):
+        state["pool"] = ProcessPoolExecutor(max_workers=workers)
+        try:
+            yield
+        finally:
+            state["pool"].shutdown(wait=False, cancel_futures=True)
+
+    return Starlette(routes=[
+        Route("/parse", parse_endpoint, methods=["POST"]),
+        Route("/parse/{kind}", parse_endpoint, methods=["POST"]),
+        Route("/detect", detect_endpoint, methods=["POST"]),
+        Route("/metrics", metrics_endpoint),
+        Route("/health", health),
+    ], lifespan=lifespan)
+
+
+# ---------- CLI ----------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the credit report parsers over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count(), help="parser processes (default: all cores)")
+    parser.add_argument("--max-pending", type=int, help="reports accepted at once before 429 (default: 4 per worker)")
+    parser.add_argument("--timeout", type=float, default=60.0, help="per-request parse timeout in seconds")
+    args = parser.parse_args(argv)
+
+    import uvicorn
+    uvicorn.run(create_app(args.workers, args.max_pending, args.timeout), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
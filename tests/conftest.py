@@ -0,0 +1,46 @@
+"""Shared fixtures: small synthetic reports (see ``benchmarks/synthetic.py``), parsed once per session."""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+import synthetic  # noqa: E402
+from credit_parser import Report, parse, report_id  # noqa: E402
+
+
+def with_pan(report, pan):
+    """Copy of a commercial ``report`` whose Borrower Details carry another PAN (another borrower)."""
+    sheets = dict(report.sheets)
+    details = sheets["Borrower Details"].copy()
+    details.loc["PAN"] = pan
+    sheets["Borrower Details"] = details
+    return Report(report.report_type, sheets, report.pages)
+
+
+@pytest.fixture(scope="session")
+def crif_pdf():
+    return synthetic.crif_report(6)
+
+
+@pytest.fixture(scope="session")
+def commercial_pdf():
+    return synthetic.cibil_commercial_report(4)
+
+
+@pytest.fixture(scope="session")
+def crif(crif_pdf):
+    return report_id(crif_pdf), parse(crif_pdf)
+
+
+@pytest.fixture(scope="session")
+def commercial(commercial_pdf):
+    rid, report = report_id(commercial_pdf), parse(commercial_pdf)
+    return rid, with_pan(report, "AAACS1234K")
+
+
+@pytest.fixture(scope="session")
+def consumer():
+    pdf = synthetic.cibil_consumer_report(3)
+    return report_id(pdf), parse(pdf)
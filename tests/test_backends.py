@@ -0,0 +1,44 @@
+import pytest
+
+from credit_parser import PDFSource, parse
+from credit_parser.backends import BACKENDS, open_backend
+from credit_parser.timing import instrument
+
+
+class TrackedSource(PDFSource):
+    """PDFSource that remembers every stream it hands out."""
+
+    def __init__(self, data):
+        super().__init__(data)
+        self.streams = []
+
+    def stream(self):
+        stream = super().stream()
+        self.streams.append(stream)
+        return stream
+
+
+@pytest.fixture(scope="module")
+def consumer_pdf():
+    import synthetic
+    return synthetic.cibil_consumer_report(4)
+
+
+@pytest.mark.parametrize("name", sorted(BACKENDS))
+def test_backends_agree_and_close_their_stream(name, consumer_pdf):
+    source = TrackedSource(consumer_pdf)
+    with instrument(log=False) as timings:
+        report = parse(source, "cibil_consumer", backend=name)
+    expected = parse(consumer_pdf, "cibil_consumer")
+    assert report["SYNTHETIC PERSON"].equals(expected["SYNTHETIC PERSON"])
+    assert report.pages == timings.counts["pages"] == source.document().page_count
+    assert len(source.streams) == (name in ("pypdf2", "pdfminer"))
+    assert all(stream.closed for stream in source.streams)
+
+
+def test_pdfminer_counts_pages_in_its_one_pass(consumer_pdf):
+    source = TrackedSource(consumer_pdf)
+    with open_backend("cibil_consumer", source, "pdfminer") as pages:
+        texts = list(pages.iter_pages())
+    assert pages.page_count == len(texts) == source.document().page_count
+    assert len(source.streams) == 1 and source.streams[0].closed
@@ -0,0 +1,32 @@
+import pandas as pd
+
+import batch
+
+
+def test_per_file_workbooks_are_written_in_the_worker(tmp_path, crif_pdf, crif):
+    pdf = tmp_path / "in" / "crif.pdf"
+    pdf.parent.mkdir()
+    (tmp_path / "out").mkdir()
+    pdf.write_bytes(crif_pdf)
+    result = batch.parse_file(str(pdf), output_dir=str(tmp_path / "out"))
+    assert result["error"] is None and result["sheets"] is None
+    assert result["output"] == str(tmp_path / "out" / "Parsed_crif.xlsx")
+    loans = pd.read_excel(result["output"], sheet_name="Loan Details")
+    assert len(loans) == len(crif[1]["Loan Details"])
+
+
+def test_sheets_come_back_without_an_output_dir(tmp_path, crif_pdf):
+    pdf = tmp_path / "crif.pdf"
+    pdf.write_bytes(crif_pdf)
+    result = batch.parse_file(str(pdf))
+    assert result["output"] is None and "Loan Details" in result["sheets"]
+
+
+def test_main_output_dir(tmp_path, crif_pdf, commercial_pdf, capsys):
+    (tmp_path / "in").mkdir()
+    (tmp_path / "in" / "crif.pdf").write_bytes(crif_pdf)
+    (tmp_path / "in" / "commercial.pdf").write_bytes(commercial_pdf)
+    (tmp_path / "in" / "broken.pdf").write_bytes(b"not a pdf")
+    assert batch.main([str(tmp_path / "in"), "-d", str(tmp_path / "out"), "-w", "2"]) == 1
+    assert sorted(p.name for p in (tmp_path / "out").iterdir()) == ["Parsed_commercial.xlsx", "Parsed_crif.xlsx"]
+    assert "Parsed 2/3 files (1 failed)" in capsys.readouterr().out
@@ -0,0 +1,47 @@
+from credit_parser import cache
+from credit_parser.cache import ReportCache, cache_key
+from credit_parser.timing import instrument
+
+
+def test_hit_and_miss(crif_pdf, crif):
+    reports = ReportCache()
+    first = reports.parse(crif_pdf)
+    with instrument(log=False) as timings:
+        again = reports.parse(crif_pdf)
+    assert again is first and timings.counts["cache_hits"] == 1 and "regex" not in timings.stages
+    assert (reports.hits, reports.misses) == (1, 1)
+    assert first["Loan Details"].equals(crif[1]["Loan Details"])
+
+
+def test_key_covers_report_type_and_output_options(commercial_pdf):
+    key = cache_key(commercial_pdf)
+    assert cache_key(commercial_pdf, "cibil_commercial") != key
+    assert cache_key(commercial_pdf, summary_tables=False) != key
+    assert cache_key(commercial_pdf, pdf_path="report.pdf") == key  # only says where to read from
+
+
+def test_lru_evicts_the_oldest(crif_pdf, commercial_pdf):
+    reports = ReportCache(max_entries=1)
+    reports.parse(crif_pdf)
+    reports.parse(commercial_pdf)
+    assert reports.get(cache_key(crif_pdf)) is None
+    assert reports.get(cache_key(commercial_pdf)) is not None
+
+
+def test_disk_store_outlives_the_process_cache(tmp_path, crif_pdf):
+    path = str(tmp_path / "cache.sqlite")
+    ReportCache(path=path).parse(crif_pdf)
+    restarted = ReportCache(path=path)
+    report = restarted.get(cache_key(crif_pdf))
+    assert report is not None and report.report_type == "crif_commercial"
+    assert (restarted.hits, restarted.misses) == (1, 0)
+
+
+def test_parser_version_invalidates(monkeypatch, tmp_path, crif_pdf):
+    path = str(tmp_path / "cache.sqlite")
+    ReportCache(path=path).parse(crif_pdf)
+    monkeypatch.setattr(cache, "PARSER_VERSION", "next")
+    reports = ReportCache(path=path)
+    with instrument(log=False) as timings:
+        reports.parse(crif_pdf)
+    assert "cache_hits" not in timings.counts and (reports.hits, reports.misses) == (0, 1)
@@ -0,0 +1,32 @@
+import pyarrow.dataset as ds
+
+from batch import write_dataset
+from credit_parser.dataset import append_reports, existing_report_ids, read_table
+
+
+def result(rid, report):
+    """A batch.parse_file result for an already parsed report."""
+    return {"report_id": rid, "report_type": report.report_type, "sheets": report.sheets, "pages": report.pages}
+
+
+def test_append_and_read_back(tmp_path, crif, commercial):
+    root = tmp_path / "dataset"
+    assert existing_report_ids(root) == set()
+    written = append_reports(root, [crif, commercial])
+    assert all(path.parent.parent.name.startswith("bureau=") for path in written)
+    assert existing_report_ids(root) == {crif[0], commercial[0]}
+    facilities = read_table(root, "facilities", filter=ds.field("bureau") == "CRIF")
+    assert len(facilities) == len(crif[1]["Loan Details"]) and set(facilities["report_id"]) == {crif[0]}
+    assert facilities["loan"].tolist() == list(range(len(facilities)))
+
+
+def test_append_skips_existing_report_ids(tmp_path, crif, commercial):
+    root = tmp_path / "dataset"
+    assert write_dataset([result(*crif)], root) == 1
+    files = sorted(root.rglob("*.parquet"))
+    # The CRIF report is already there; a repeat within the run is skipped too
+    assert write_dataset([result(*crif), result(*commercial), result(*commercial)], root) == 1
+    assert write_dataset([result(*crif), result(*commercial)], root) == 0
+    assert set(files) < set(root.rglob("*.parquet"))  # earlier files are never rewritten
+    borrowers = read_table(root, "borrowers")
+    assert sorted(borrowers["report_id"]) == sorted([crif[0], commercial[0]])
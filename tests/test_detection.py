@@ -0,0 +1,38 @@
+import pytest
+
+import synthetic
+from credit_parser import classify, detect
+from credit_parser.detection import COLAB, CORPORATE, STREAMLIT, Detection
+
+
+def pdf(*pages):
+    """A PDF with one page per list of lines."""
+    return synthetic.render([list(lines) for lines in pages]).tobytes()
+
+
+@pytest.mark.parametrize("make, expected", [
+    (lambda: synthetic.crif_report(2), Detection("CRIF", "commercial", None, "crif_commercial", 1)),
+    # Page 1 only mentions TransUnion CIBIL, so page 2 is read for consumer markers
+    (lambda: synthetic.cibil_commercial_report(2), Detection("CIBIL", "commercial", None, "cibil_commercial", 2)),
+    (lambda: synthetic.cibil_consumer_report(2), Detection("CIBIL", "consumer", COLAB, "cibil_consumer", 1)),
+    (lambda: synthetic.cibil_consumer_streamlit_report(2),
+     Detection("CIBIL", "consumer", STREAMLIT, "cibil_consumer", 1)),
+    (lambda: pdf(["CIBIL", "COMMERCIAL CREDIT INFORMATION REPORT", "SYNTHETIC LTD"]),
+     Detection("CIBIL", "commercial", CORPORATE, "cibil_consumer", 1)),
+], ids=["crif", "cibil_commercial", "consumer_colab", "consumer_streamlit", "corporate"])
+def test_each_bureau_and_layout(make, expected):
+    assert classify(make()) == expected
+
+
+def test_page_two_decides_an_open_question():
+    # Page 1 names a consumer report but not its layout; the account blocks start on page 2
+    detection = classify(pdf(synthetic.CONSUMER_HEADER, ["ACCOUNT INFORMATION", "ACCOUNT TYPE: Personal Loan"]))
+    assert detection.layout == COLAB and detection.pages_read == 2
+    # A bare CIBIL mention is only commercial if nothing more specific follows
+    detection = classify(pdf(["TransUnion CIBIL"], ["CONSUMER NAME: X", "STATUS", "ACCOUNT DATES"]))
+    assert (detection.kind, detection.layout, detection.pages_read) == ("consumer", STREAMLIT, 2)
+
+
+def test_only_the_first_two_pages_are_read():
+    assert classify(pdf(["Cover"], ["Contents"], ["Loan Terms For: ACC1"])) == Detection(pages_read=2)
+    assert detect(pdf(["Cover"], ["Contents"], ["Loan Terms For: ACC1"])) is None
@@ -0,0 +1,42 @@
+import io
+
+import openpyxl
+import pandas as pd
+import pytest
+
+from credit_parser.excel import MAX_SHEET_TITLE, _unique_title, sheet_title, write_workbook
+
+
+@pytest.mark.parametrize("name, expected", [
+    ("Loan Details", "Loan Details"),
+    ("DPD/Asset [Class]: *?", "DPD Asset  Class     "),
+    ("12 " + "x" * 40, "12 " + "x" * 28),
+])
+def test_sheet_title(name, expected):
+    assert sheet_title(name) == expected and len(expected) <= MAX_SHEET_TITLE
+
+
+def test_unique_title_stays_within_31_characters():
+    used = set()
+    long = "Credit Facility Details As Guarantor"
+    titles = [_unique_title(name, used) for name in [long, long, long.upper(), "Summary", "summary"]]
+    assert titles == [long[:31], long[:27] + " (2)", long.upper()[:27] + " (3)", "Summary", "summary (2)"]
+    assert all(len(title) <= MAX_SHEET_TITLE for title in titles)
+    assert len({title.lower() for title in titles}) == len(titles)
+
+
+def test_workbook_round_trip():
+    target = io.BytesIO()
+    write_workbook(target, iter([
+        ("Loan Details", pd.DataFrame({"Amount": [1.5, None], "Date": pd.to_datetime(["2024-01-31", None])})),
+        ("Borrower Details", pd.DataFrame({"Value": ["X LTD"]}, index=pd.Index(["Name"], name="Field"))),
+        ("Loan Details", pd.DataFrame({"Amount": [2]})),
+        ("Notes", pd.DataFrame([["free text"]])),
+    ]), skip_headers={"Notes"})
+    workbook = openpyxl.load_workbook(io.BytesIO(target.getvalue()))
+    assert workbook.sheetnames == ["Loan Details", "Borrower Details", "Loan Details (2)", "Notes"]
+    loans = [list(row) for row in workbook["Loan Details"].iter_rows(values_only=True)]
+    assert loans[0] == ["Amount", "Date"] and loans[1][0] == 1.5 and loans[1][1].year == 2024
+    assert len(loans) == 2  # the all-missing row is left blank
+    assert list(workbook["Borrower Details"].iter_rows(values_only=True)) == [("Field", "Value"), ("Name", "X LTD")]
+    assert list(workbook["Notes"].iter_rows(values_only=True)) == [("free text",)]
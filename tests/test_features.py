@@ -0,0 +1,76 @@
+import pandas as pd
+import pytest
+
+from credit_parser.features import FEATURE_COLUMNS, borrower_features, report_features
+
+
+def test_one_row_per_borrower(crif, commercial, consumer):
+    features = borrower_features([crif, commercial, consumer])
+    assert list(features.columns) == FEATURE_COLUMNS
+    assert sorted(features.index) == ["AAACS1234K", "AAAPZ9876K", "ABCDE1234F"]
+
+
+def test_crif_features(crif):
+    rid, report = crif
+    loans, history = report["Loan Details"], report["Payment History"]
+    row = borrower_features([crif]).loc["ABCDE1234F"]
+    assert row["report_id"] == rid and row["as_of"] == pd.Timestamp("2023-12-31")
+    assert row["facilities"] == row["live_facilities"] == len(loans)
+    assert row["sanctioned"] == pytest.approx(loans["Sanctioned Amount"].sum())
+    assert row["utilisation"] == pytest.approx(loans["Current Balance"].sum() / loans["Sanctioned Amount"].sum())
+    assert row["overdue_ratio"] == 0
+    assert row["max_dpd"] == history["DPD"].max()
+    recent = history[history["Year"] == 2023]
+    assert row["max_dpd_12m"] == recent["DPD"].max()
+    # Credit profile summary: Working Cap 1 enquiry < 3 months, Term Loan 1 in 3-6 months
+    assert row["enquiries_3m"] == 1 and row["enquiries_6m"] == 2
+
+
+def test_as_of_moves_the_dpd_windows(crif):
+    later = report_features([crif], as_of="2026-06-30").iloc[0]
+    assert pd.isna(later["max_dpd_12m"]) and pd.isna(later["max_dpd_24m"])
+    assert later["max_dpd"] == crif[1]["Payment History"]["DPD"].max()
+
+
+def test_latest_report_wins(crif):
+    rid, report = crif
+    older = type(report)(report.report_type, dict(report.sheets), report.pages)
+    older.sheets["Loan Details"] = report["Loan Details"].assign(**{"Info. as of": pd.Timestamp("2022-12-31")})
+    features = borrower_features([crif, ("older", older)])
+    assert features.loc["ABCDE1234F", "report_id"] == rid
+
+
+def test_consumer_reports_have_no_dated_dpd(consumer):
+    row = borrower_features([consumer]).iloc[0]
+    assert row["as_of"] == pd.Timestamp("2024-01-15")
+    assert pd.isna(row["max_dpd_12m"]) and pd.isna(row["enquiries_3m"])
+    assert row["facilities"] == len(consumer[1].sheets["SYNTHETIC PERSON"])
+
+
+def test_empty_batch():
+    assert list(borrower_features([]).columns) == FEATURE_COLUMNS
+
+
+def test_cibil_commercial_current_dpd(commercial):
+    loans = commercial[1]["Loan Details"]
+    # "STD" on its own line, the next line holding a date: not 31 days past due
+    assert loans["DPD/Asset Classification"].eq("STD").all()
+    assert loans["Current DPD"].eq(0).all()
+    row = borrower_features([commercial]).iloc[0]
+    assert row["max_dpd"] == row["max_dpd_12m"] == 0
+
+
+def test_repeated_report_counts_once(crif, commercial):
+    features = borrower_features([crif, commercial, crif])
+    assert len(features) == 2
+    assert features.loc["ABCDE1234F", "facilities"] == len(crif[1]["Loan Details"])
+
+
+def test_undated_report_is_never_the_latest(consumer):
+    rid, report = consumer
+    summary = report["Summary"].assign(**{"Report Date": None})
+    undated = type(report)(report.report_type, {**report.sheets, "Summary": summary})
+    features = report_features([("undated", undated), consumer])
+    assert pd.isna(features.loc["undated", "as_of"])
+    for reports in ([("undated", undated), consumer], [consumer, ("undated", undated)]):
+        assert borrower_features(reports).loc["AAAPZ9876K", "report_id"] == rid
@@ -0,0 +1,102 @@
+import pandas as pd
+import pytest
+
+from credit_parser.frames import dpd_days, format_dates, records_frame, stack_tables, to_amount, to_currency, to_dates
+from credit_parser.records import Facility
+
+
+def series(*values):
+    return pd.Series(values, dtype=object)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("5,00,000", 500000),
+    ("1,234 INR", 1234),
+    ("INR: 1,23,456", 123456),
+    ("12.5 Cr", 125000000),
+    ("4 L", 400000),
+    ("3.2 Lakhs", 320000),
+    ("500 K", 500000),
+    ("-1,000", -1000),
+    ("0", 0),
+    # A currency prefix's dot is not a decimal point, and trailing text is not part of the amount
+    ("Rs. 1,00,000", 100000),
+    ("Rs.500", 500),
+    ("Rs. 12 L", 1200000),
+    ("5,00,000 DATE REPORTED: 31/03/2024", 500000),
+])
+def test_to_amount(text, expected):
+    assert to_amount(series(text))[0] == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("text", ["", "-", "N/A", None])
+def test_to_amount_missing(text):
+    assert pd.isna(to_amount(series(text))[0])
+
+
+def test_to_amount_keeps_index_and_name():
+    s = pd.Series(["1,000", "2,000"], index=[7, 9], name="Overdue")
+    out = to_amount(s)
+    assert list(out.index) == [7, 9] and out.name == "Overdue" and out.dtype == float
+
+
+def test_to_currency():
+    assert list(to_currency(series("INR: 1,00,000", "5,000 usd", "1,000", "2 LAC", None)).fillna("")) == \
+        ["INR", "USD", "", "", ""]
+
+
+def test_to_dates_tries_each_format():
+    dates = to_dates(series("31-Dec-2023", "31/12/2023", "31-12-2023", "-", "", None))
+    assert list(dates[:3]) == [pd.Timestamp("2023-12-31")] * 3
+    assert dates[3:].isna().all()
+
+
+def test_to_dates_single_format():
+    dates = to_dates(series("31/12/2023", "31-Dec-2023"), "%d/%m/%Y")
+    assert dates[0] == pd.Timestamp("2023-12-31") and pd.isna(dates[1])
+
+
+def test_format_dates():
+    assert list(format_dates(to_dates(series("31-Dec-2023", "-")), "%d/%m/%Y").fillna("")) == ["31/12/2023", ""]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("030", 30), ("000/STD", 0), ("090/SUB", 90), ("STD", 0), ("SUB", 91), ("DBT", 456), ("LOS", 456),
+    # SMA sub-classes are buckets, not day counts; an explicit count still wins
+    ("SMA", 1), ("SMA-0", 0), ("SMA 1", 31), ("SMA-2", 61), ("SMA2", 61), ("030/SMA", 30), ("045/SMA-1", 45),
+])
+def test_dpd_days(text, expected):
+    assert dpd_days(series(text))[0] == expected
+
+
+@pytest.mark.parametrize("text", ["-", "", "XXX", None])
+def test_dpd_days_missing(text):
+    assert pd.isna(dpd_days(series(text))[0])
+
+
+def test_stack_tables():
+    frame, table, position = stack_tables([pd.DataFrame({"a": [1, 2]}), pd.DataFrame({"a": [3]})])
+    assert list(frame["a"]) == [1, 2, 3]
+    assert list(table) == [0, 0, 1] and list(position) == [0, 1, 0]
+
+
+def test_records_frame_normalised_columns_have_fixed_dtypes():
+    labels = {"type": "Type", "sanctioned_amount": "Sanctioned", "info_as_of": "As of",
+              "asset_classification": "DPD"}
+    kwargs = dict(amounts=["Sanctioned"], dates={"As of": "%d-%b-%Y"}, categories=["Type"],
+                  currencies={"Sanctioned": "Currency"}, dpd={"DPD": "Days"})
+    full = records_frame(Facility, [Facility(type="Term Loan", sanctioned_amount="INR: 5,00,000",
+                                             info_as_of="31-DEC-2023", asset_classification="030")],
+                         labels, **kwargs)
+    empty = records_frame(Facility, [Facility()], labels, **kwargs)
+    assert list(full.columns) == ["Type", "Sanctioned", "Currency", "As of", "DPD", "Days"]
+    normalised = ["Sanctioned", "Currency", "As of", "Days"]
+    assert list(full.dtypes[normalised]) == list(empty.dtypes[normalised])
+    assert full.loc[0, "Sanctioned"] == 500000 and full.loc[0, "Currency"] == "INR"
+    assert full.loc[0, "As of"] == pd.Timestamp("2023-12-31") and full.loc[0, "Days"] == 30
+
+
+def test_to_amount_leaves_numeric_columns_alone():
+    out = to_amount(pd.Series([1e16, 12.5, None], dtype=float))
+    assert out[0] == 1e16 and out[1] == 12.5 and pd.isna(out[2])
+    assert list(to_amount(pd.Series([5, 7], dtype="Int64"))) == [5.0, 7.0]
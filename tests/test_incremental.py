@@ -0,0 +1,55 @@
+import synthetic
+from credit_parser import parse
+from credit_parser.incremental import ADDED, CHANGED, REMOVED, BlockStore, diff_records, fingerprint
+from credit_parser.timing import instrument
+
+
+def crif_pull(accounts, printed, pages=4):
+    """The same borrower's CRIF report as printed on ``printed``: every page is headed by that date."""
+    return synthetic.crif_report(accounts, pages=pages,
+                                 page_header=[f"Date of Issue: {printed}", "Page {page} of {pages}"])
+
+
+def parse_counted(pdf, store):
+    with instrument(log=False) as timings:
+        report = parse(pdf, blocks=store)
+    return report, timings.counts
+
+
+def test_unchanged_facilities_are_reused_across_page_headers(tmp_path):
+    store = BlockStore(str(tmp_path / "blocks.sqlite"))
+    first, counts = parse_counted(crif_pull(6, "01-01-2024"), store)
+    assert counts["blocks_parsed"] == 6 and "blocks_reused" not in counts
+    assert (first.sheets["Changes"]["Change"] == ADDED).all()
+    # Another print date, and the page breaks (with their headers) fall after other facilities
+    second, counts = parse_counted(crif_pull(6, "01-02-2024", pages=5), store)
+    assert counts["blocks_reused"] == 6 and "blocks_parsed" not in counts
+    assert second.sheets["Changes"].empty
+    assert second.sheets["Loan Details"].equals(first.sheets["Loan Details"])
+
+
+def test_changes_sheet(tmp_path):
+    store = BlockStore(str(tmp_path / "blocks.sqlite"))
+    parse_counted(crif_pull(6, "01-01-2024"), store)
+    report, counts = parse_counted(crif_pull(7, "01-02-2024"), store)
+    assert counts["blocks_reused"] == 6 and counts["blocks_parsed"] == 1
+    assert report.sheets["Changes"].values.tolist() == [["ACC000006", ADDED, None, None, None]]
+    report, counts = parse_counted(crif_pull(6, "01-03-2024"), store)
+    assert counts["blocks_reused"] == 6 and "blocks_parsed" not in counts
+    assert report.sheets["Changes"].values.tolist() == [["ACC000006", REMOVED, None, None, None]]
+
+
+def test_changed_facility_gives_a_row_per_field():
+    previous = {"a": {"facility_no": "ACC1", "current_balance": "100", "amount_overdue": "0"}}
+    current = {"b": {"facility_no": "ACC1", "current_balance": "90", "amount_overdue": "0"},
+               "c": {"facility_no": "ACC2", "current_balance": "50", "amount_overdue": "0"}}
+    changes = diff_records(previous, current, ["facility_no"], {"current_balance": "Current Balance"})
+    assert changes.iloc[0].tolist() == ["ACC1", CHANGED, "Current Balance", "100", "90"]
+    assert changes.iloc[1].tolist()[:2] == ["ACC2", ADDED] and changes.iloc[1].isna().sum() == 3
+
+
+def test_fingerprint_leaves_out_running_lines_only():
+    block = "Loan Terms For: ACC1\nSanctioned Date: 01-01-2020\nAmount Overdue: 0\n"
+    assert fingerprint(block) == fingerprint(block + "\nDate of Issue: 01-02-2024\nPage 3 of 7\n\n")
+    assert fingerprint(block) != fingerprint(block.replace("01-01-2020", "01-01-2021"))
+    assert fingerprint("DATE OPENED: 01/02/2020") != fingerprint("DATE OPENED: 01/03/2020")
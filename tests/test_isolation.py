@@ -0,0 +1,110 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from credit_parser import isolation, parse
+from credit_parser.cibil_commercial import parse_summary_tables
+from credit_parser.isolation import ERROR, MEMORY, TIMEOUT, call_isolated, classify_isolated, parse_isolated
+from credit_parser.timing import instrument, stage
+
+
+# ---------- Misbehaving jobs (module level: the child imports them by name) ----------
+def hang(source, pid_file):
+    with open(pid_file, "w") as f:
+        f.write(str(os.getpid()))
+    with stage("extract"):
+        time.sleep(60)
+
+
+def hog(source, mb):
+    with stage("tables"):
+        ballast = b"x" * (mb << 20)  # written, so resident
+        time.sleep(60)
+    return len(ballast)
+
+
+def fail(source):
+    with stage("regex"):
+        raise ValueError("no facility header")
+
+
+def hang_unless_text_only(conn, source, report_type, options, label):
+    """Stands in for ``isolation._child``: hangs unless retried with the summary tables off."""
+    if options.get("summary_tables") is not False:
+        time.sleep(60)
+    isolation._child(conn, source, report_type, options, label)
+
+
+def gone(pid, seconds=5):
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def test_environment_is_left_alone(crif_pdf):
+    before = os.environ.get("PYTHONPATH")
+    assert parse_isolated(crif_pdf, timeout=60).error is None
+    assert os.environ.get("PYTHONPATH") == before
+
+
+def test_forked_process_starts_its_own_forkserver(commercial_pdf):
+    # The service's worker pool is forked after the parent may have used isolation
+    detection, error = classify_isolated(commercial_pdf, timeout=60)
+    assert error is None
+    with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("fork")) as pool:
+        detection, error = pool.submit(classify_isolated, commercial_pdf, 60).result()
+    assert error is None and detection.report_type == "cibil_commercial"
+
+
+def test_summary_tables_alone(commercial_pdf, commercial):
+    with instrument(log=False) as timings:
+        sheets, error = call_isolated(parse_summary_tables, commercial_pdf, timeout=60)
+    assert error is None
+    for name in ("Credit Summary", "Inquiry Summary"):
+        assert sheets[name].equals(commercial[1][name])
+    # Only the summary tables: no facility text was read or parsed
+    assert "regex" not in timings.stages and timings.counts.get("facilities") is None
+    lazy = parse(commercial_pdf, "cibil_commercial", summary_tables=False)
+    assert "Credit Summary" not in lazy.sheets
+
+
+def test_hanging_job_is_killed_at_the_timeout(crif_pdf, tmp_path):
+    pid_file = tmp_path / "pid"
+    started = time.monotonic()
+    value, error = call_isolated(hang, crif_pdf, str(pid_file), timeout=1)
+    assert time.monotonic() - started < 10
+    assert value is None
+    assert error.kind == TIMEOUT and error.stage == "extract" and error.seconds >= 1
+    assert gone(int(pid_file.read_text()))
+
+
+def test_memory_hungry_job_is_killed_past_the_limit(crif_pdf):
+    # A child starts well under 100 MiB (the parsers come preloaded)
+    value, error = call_isolated(hog, crif_pdf, 600, timeout=60, max_rss_mb=300)
+    assert value is None
+    assert error.kind == MEMORY and error.stage == "tables" and error.peak_rss_mb > 300
+
+
+def test_error_record(crif_pdf):
+    value, error = call_isolated(fail, crif_pdf, timeout=60)
+    assert value is None
+    record = error.as_dict()
+    assert record["kind"] == ERROR and record["stage"] == "regex"
+    assert record["error_type"] == "ValueError" and record["message"] == "no facility header"
+    assert str(error) == "error in regex: ValueError: no facility header"
+
+
+def test_timeout_is_retried_with_the_fallback_options(monkeypatch, commercial_pdf):
+    monkeypatch.setattr(isolation, "_child", hang_unless_text_only)
+    result = parse_isolated(commercial_pdf, "cibil_commercial", timeout=2)
+    assert result.fallback and result.error.kind == TIMEOUT  # the first failure is kept
+    assert "Loan Details" in result.report.sheets and "Credit Summary" not in result.report.sheets
+    # Report types without fallback options are not retried
+    result = parse_isolated(commercial_pdf, "crif_commercial", timeout=1)
+    assert not result.fallback and result.report is None and result.error.kind == TIMEOUT
@@ -0,0 +1,49 @@
+import fitz
+
+import synthetic
+from credit_parser.page_index import PageIndex, index_document
+
+PAGES = [
+    "Borrower Summary\nrow",                      # 0
+    "more rows\nCredit Profile Summary\nrow",     # 1
+    "row\nLoan Terms For: ACC1",                  # 2: first facility page, the last one kept
+    "Loan Terms For: ACC2",                       # 3
+    "Credit Profile Summary (repeated)",          # 4
+]
+MARKERS = ["Borrower Summary", "Credit Profile Summary", "Inquiries"]
+
+
+def scanned(keep_until="Loan Terms For:"):
+    index = PageIndex(MARKERS, keep_until=keep_until)
+    assert list(index.scan(iter(PAGES))) == PAGES  # passed through unchanged
+    return index
+
+
+def test_keep_until_keeps_the_leading_pages_only():
+    index = scanned()
+    assert index.page_count == 5 and index._texts == PAGES[:3]
+    # Markers are still found on pages that are not kept
+    assert index.found == {"Borrower Summary": [0], "Credit Profile Summary": [1, 4], "Inquiries": []}
+    assert index.text("Borrower Summary", "Credit Profile Summary") == "\n".join(PAGES[:2])
+    # A span past the kept pages gives only its kept part
+    assert index.text("Credit Profile Summary") == "\n".join(PAGES[1:3])
+
+
+def test_without_keep_until_no_text_is_kept():
+    index = scanned(keep_until=None)
+    assert index._texts == [] and index.text("Borrower Summary") == ""
+    assert index.span("Borrower Summary", "Credit Profile Summary") == range(0, 2)
+
+
+def test_span():
+    index = scanned()
+    assert index.span("Credit Profile Summary", "Borrower Summary") == range(1, 5)  # end never follows
+    assert index.span("Credit Profile Summary") == range(1, 5)
+    assert index.span("Inquiries") == range(0) and index.text("Inquiries") == ""
+    assert index.first("Credit Profile Summary", start=2) == 4 and not index.complete()
+
+
+def test_index_document_stops_once_every_marker_is_seen():
+    doc = fitz.open(stream=synthetic.render([["Borrower Summary"], ["Credit Profile Summary"], ["x"], ["y"]]).tobytes())
+    index = index_document(doc, ["Borrower Summary", "Credit Profile Summary"])
+    assert index.complete() and index.page_count == 2
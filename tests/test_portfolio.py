@@ -0,0 +1,123 @@
+import pandas as pd
+import pytest
+
+from credit_parser import Report
+from credit_parser.portfolio import PortfolioStore
+
+from .conftest import with_pan
+
+
+@pytest.fixture
+def store(tmp_path, crif, commercial):
+    store = PortfolioStore(str(tmp_path / "portfolio.sqlite"))
+    store.ingest([crif], group="Acme Group")
+    store.ingest([commercial])
+    return store
+
+
+def test_ingest_skips_known_reports(store, crif, commercial):
+    assert store.ingest([crif, commercial, crif]) == 0
+    assert len(store.reports()) == 2
+
+
+def test_reports_carry_borrower_identity_and_totals(store, crif):
+    rid, report = crif
+    row = store.reports(pan="ABCDE1234F").iloc[0]
+    loans = report["Loan Details"]
+    assert row["report_id"] == rid and row["bureau"] == "CRIF" and row["borrower"] == "ABCDE1234F"
+    assert row["report_date"] == "2023-12-31"
+    assert row["facilities"] == len(loans)
+    assert row["sanctioned"] == pytest.approx(loans["Sanctioned Amount"].sum())
+    assert row["max_dpd"] == loans["Max DPD"].max()
+
+
+def test_facilities_filters(store, crif, commercial):
+    facilities = store.facilities(pan="ABCDE1234F")
+    assert len(facilities) == len(crif[1]["Loan Details"])
+    assert list(facilities["position"]) == list(range(len(facilities)))
+    assert facilities["sanction_date"].eq("2020-01-01").all()
+    assert len(store.facilities(facility_type="Cash Credit")) == len(commercial[1]["Loan Details"])
+    assert store.facilities(since="2024-01-01").empty
+
+
+def test_delinquent_borrowers_window(store):
+    delinquent = store.delinquent_borrowers(min_dpd=90, months=6, as_of="2024-03-31")
+    assert "ABCDE1234F" in set(delinquent["borrower"])
+    assert store.delinquent_borrowers(min_dpd=90, months=6, as_of="2025-03-31").empty
+
+
+def test_delinquency_is_dated_by_month(tmp_path, crif):
+    rid, report = crif
+    store = PortfolioStore(str(tmp_path / "portfolio.sqlite"))
+    history = report["Payment History"]
+    recent = history["Year"] == 2023
+    cured = with_pan(report, "ABCDE1234F")
+    # 90+ DPD only in 2022; the report is dated 2023-12-31 with a Max DPD of 90
+    cured.sheets["Payment History"] = history.assign(
+        DPD=history["DPD"].mask(recent, 0), **{"Asset Class": history["Asset Class"].mask(recent, "STD")})
+    store.ingest([(rid, cured)])
+    assert store.reports()["max_dpd"].tolist() == [90]
+    assert store.delinquent_borrowers(min_dpd=90, months=6, as_of="2024-03-31").empty
+    delinquent = store.delinquent_borrowers(min_dpd=90, months=6, as_of="2023-03-31")
+    assert delinquent["borrower"].tolist() == ["ABCDE1234F"]
+    assert delinquent["last_delinquent_month"].tolist() == ["2022-12-01"]
+
+
+def test_latest_report_per_borrower(tmp_path, crif):
+    rid, report = crif
+    store = PortfolioStore(str(tmp_path / "portfolio.sqlite"))
+    older = with_pan(report, "ABCDE1234F")
+    older.sheets["Loan Details"] = report["Loan Details"].assign(**{"Info. as of": pd.Timestamp("2022-12-31")})
+    store.ingest([("older", older), crif])
+    borrower = store.query("SELECT * FROM borrowers").iloc[0]
+    assert borrower["latest_report_id"] == rid and borrower["report_date"] == "2023-12-31"
+    assert len(store.facilities(latest=True)) == len(report["Loan Details"])
+
+
+def test_exposure_by_group(store, crif, commercial):
+    exposure = store.exposure_by_group().set_index("borrower_group")
+    assert exposure.loc["Acme Group", "borrowers"] == 1
+    assert exposure.loc["Acme Group", "outstanding"] == pytest.approx(crif[1]["Loan Details"]["Current Balance"].sum())
+    store.set_group("AAACS1234K", "Acme Group")
+    exposure = store.exposure_by_group().set_index("borrower_group")
+    assert exposure.loc["Acme Group", "borrowers"] == 2
+
+
+def test_consumer_reports_are_keyed_by_pan_and_printed_date(tmp_path, consumer):
+    rid, report = consumer
+    store = PortfolioStore(str(tmp_path / "portfolio.sqlite"))
+    namesake = Report(report.report_type, {**report.sheets, "Summary": report["Summary"].assign(PAN="AAAPZ1111Q")})
+    store.ingest([(rid, report), ("namesake", namesake)])
+    reports = store.reports().set_index("report_id")
+    assert reports.loc[rid, "borrower"] == "AAAPZ9876K" and reports.loc["namesake", "borrower"] == "AAAPZ1111Q"
+    assert reports.loc[rid, "report_date"] == "2024-01-15"
+
+
+def test_undated_reports_stay_undated(tmp_path, consumer):
+    rid, report = consumer
+    undated = Report(report.report_type, {**report.sheets, "Summary": report["Summary"].assign(**{"Report Date": None})})
+    store = PortfolioStore(str(tmp_path / "portfolio.sqlite"))
+    store.ingest([(rid, undated)])
+    assert store.reports()["report_date"].isna().all()
+    assert store.reports(since="2000-01-01").empty and store.reports(until="2100-01-01").empty
+
+
+def test_cibil_commercial_dpd_comes_from_current_dpd(tmp_path, commercial):
+    rid, report = commercial
+    store = PortfolioStore(str(tmp_path / "portfolio.sqlite"))
+    overdue = with_pan(report, "AAACS1234K")
+    overdue.sheets["Loan Details"] = report["Loan Details"].assign(**{"Current DPD": pd.array([0, 120, 30, 0], dtype="Int16")})
+    store.ingest([(rid, overdue)])
+    assert store.reports()["max_dpd"].tolist() == [120]
+    assert store.facilities()["max_dpd"].tolist() == [0, 120, 30, 0]
+    assert store.delinquent_borrowers(min_dpd=90, as_of="2024-03-31")["borrower"].tolist() == ["AAACS1234K"]
+
+
+def test_numeric_amounts_are_stored_as_they_are(tmp_path, crif):
+    rid, report = crif
+    store = PortfolioStore(str(tmp_path / "portfolio.sqlite"))
+    large = with_pan(report, "ABCDE1234F")
+    large.sheets["Loan Details"] = report["Loan Details"].assign(**{"Sanctioned Amount": 1e16})
+    store.ingest([(rid, large)])
+    assert store.facilities()["sanctioned"].eq(1e16).all()
+    assert store.reports()["sanctioned"][0] == pytest.approx(1e16 * len(report["Loan Details"]))
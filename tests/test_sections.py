@@ -0,0 +1,64 @@
+import pytest
+
+from credit_parser.sections import HEAD, SECTION, split_sections, stream_sections
+
+MARKER = "Loan Terms For:"
+TEXT = "header\nLoan Terms For: A\nfirst\nLoan Terms For: B\nsecond\nLoan Terms For: C\nthird\n"
+
+
+def chunked(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def sliced(text, marker):
+    """Reference: the full text cut at every marker."""
+    starts = [i for i in range(len(text)) if text.startswith(marker, i)]
+    head = text[:starts[0]] if starts else text
+    return [(HEAD, head)] + [(SECTION, text[a:b]) for a, b in zip(starts, starts[1:] + [len(text)])]
+
+
+@pytest.mark.parametrize("size", [1, 3, len(MARKER) - 1, len(MARKER), 40, len(TEXT)])
+def test_any_chunking_matches_slicing(size):
+    assert list(stream_sections(chunked(TEXT, size), MARKER)) == sliced(TEXT, MARKER)
+
+
+def test_marker_split_across_chunks():
+    chunks = ["head Loan Ter", "ms For: A body Loan", " Terms For: B"]
+    assert list(stream_sections(chunks, MARKER)) == [
+        (HEAD, "head "), (SECTION, "Loan Terms For: A body "), (SECTION, "Loan Terms For: B")]
+
+
+def test_text_without_marker_is_all_head():
+    assert list(stream_sections(["no ", "sections ", "here"], MARKER)) == [(HEAD, "no sections here")]
+
+
+def test_head_is_yielded_once_even_when_empty():
+    parts = list(stream_sections([MARKER + " A", MARKER + " B"], MARKER))
+    assert parts[0] == (HEAD, "")
+    assert [kind for kind, _ in parts] == [HEAD, SECTION, SECTION]
+
+
+def test_no_chunks():
+    assert list(stream_sections([], MARKER)) == [(HEAD, "")]
+
+
+def test_sections_are_emitted_as_they_close():
+    seen = []
+
+    def chunks():
+        for chunk in chunked(TEXT, 10):
+            seen.append(chunk)
+            yield chunk
+
+    sections = stream_sections(chunks(), MARKER)
+    next(sections)  # head
+    first = next(sections)[1]
+    assert first == "Loan Terms For: A\nfirst\n"
+    assert "".join(seen) != TEXT  # the rest of the text has not been read yet
+
+
+def test_split_sections():
+    head, sections = split_sections(TEXT, MARKER)
+    assert head == "header\n"
+    assert [s.splitlines()[0] for s in sections] == ["Loan Terms For: A", "Loan Terms For: B", "Loan Terms For: C"]
+    assert head + "".join(sections) == TEXT
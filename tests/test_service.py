@@ -0,0 +1,86 @@
+import threading
+import time
+
+import pytest
+from starlette.testclient import TestClient
+
+import service
+
+SLOW_SECONDS = 1.5
+
+
+def slow_job(file_bytes, report_type=None, timeout=None):
+    """Stands in for ``service.parse_to_json`` in the pool: holds a worker, then returns empty JSON."""
+    time.sleep(SLOW_SECONDS)
+    return "{}", {"stages": {}}
+
+
+@pytest.fixture
+def client():
+    with TestClient(service.create_app(workers=1)) as client:
+        yield client
+
+
+def wait_for_pending(client, pending, seconds=5):
+    deadline = time.monotonic() + seconds
+    while client.get("/health").json()["pending"] != pending:
+        assert time.monotonic() < deadline, f"pending never reached {pending}"
+        time.sleep(0.02)
+
+
+def test_parse_json(client, crif_pdf, crif):
+    response = client.post("/parse/crif", content=crif_pdf)
+    assert response.status_code == 200
+    assert "json;dur=" in response.headers["Server-Timing"]
+    body = response.json()
+    assert body["report_type"] == "crif_commercial"
+    assert len(body["sheets"]["Loan Details"]["data"]) == len(crif[1]["Loan Details"])
+
+
+def test_bad_requests(client):
+    assert client.post("/parse/experian", content=b"%PDF").status_code == 404
+    assert client.post("/parse/crif", content=b"").status_code == 400
+    assert client.post("/parse/crif", content=b"not a pdf").status_code == 422
+
+
+def test_detect(client, commercial_pdf):
+    response = client.post("/detect", content=commercial_pdf)
+    assert response.status_code == 200
+    assert response.json()["report_type"] == "cibil_commercial"
+    assert "detect;dur=" in response.headers["Server-Timing"]
+
+
+def test_full_queue_gets_429(monkeypatch):
+    monkeypatch.setattr(service, "parse_to_json", slow_job)
+    with TestClient(service.create_app(workers=1, max_pending=1)) as client:
+        first = {}
+        thread = threading.Thread(target=lambda: first.update(response=client.post("/parse/crif", content=b"%PDF")))
+        thread.start()
+        wait_for_pending(client, 1)
+        response = client.post("/parse/crif", content=b"%PDF")
+        assert response.status_code == 429 and response.headers["Retry-After"] == "1"
+        thread.join()
+        assert first["response"].status_code == 200
+        wait_for_pending(client, 0)
+
+
+def test_slow_parse_gets_504_and_frees_its_slot(monkeypatch):
+    monkeypatch.setattr(service, "parse_to_json", slow_job)
+    with TestClient(service.create_app(workers=1, timeout=0.2)) as client:
+        response = client.post("/parse/crif", content=b"%PDF")
+        assert response.status_code == 504
+        assert client.get("/health").json()["pending"] == 1  # the worker is still busy
+        wait_for_pending(client, 0)
+
+
+def test_metrics(client, crif_pdf, commercial_pdf):
+    client.post("/parse/crif", content=crif_pdf)
+    client.post("/parse/crif", content=b"")
+    client.post("/detect", content=commercial_pdf)
+    text = client.get("/metrics").text
+    assert 'credit_parser_responses_total{route="crif",status="200"} 1' in text
+    assert 'credit_parser_responses_total{route="crif",status="400"} 1' in text
+    assert 'credit_parser_responses_total{route="detect",status="200"} 1' in text
+    assert 'credit_parser_request_seconds_count{route="crif"} 2' in text
+    assert 'credit_parser_request_seconds_bucket{route="detect",le="+Inf"} 1' in text
+    assert "credit_parser_pending 0" in text
@@ -0,0 +1,93 @@
+"""The PDF is read through one mapping / one buffer and one document, with no copies per stage."""
+import mmap
+import os
+
+import pytest
+
+from credit_parser import PDFSource, detect, parse, report_id
+from credit_parser.cache import ReportCache
+from credit_parser.isolation import parse_isolated
+from credit_parser.source import open_source, using_source
+from credit_parser.timing import instrument
+
+
+def counts(timings):
+    found = timings.as_dict()["counts"]
+    return found.get("bytes_copied", 0), found.get("documents_opened", 0)
+
+
+@pytest.fixture
+def crif_path(tmp_path, crif_pdf):
+    path = tmp_path / "crif.pdf"
+    path.write_bytes(crif_pdf)
+    return str(path)
+
+
+@pytest.fixture
+def commercial_path(tmp_path, commercial_pdf):
+    path = tmp_path / "commercial.pdf"
+    path.write_bytes(commercial_pdf)
+    return str(path)
+
+
+def test_path_is_mapped_once_and_shared_by_every_stage(crif_path, crif_pdf):
+    with instrument(log=False) as timings, PDFSource.from_path(crif_path) as source:
+        assert isinstance(source._mapped, mmap.mmap) and source.data.obj is source._mapped
+        assert report_id(source) == report_id(crif_pdf)
+        report_type = detect(source)
+        document = source.document()
+        report = parse(source, report_type)
+        assert source.document() is document
+    assert counts(timings) == (0, 1)
+    assert len(report["Loan Details"]) == 6
+
+
+def test_bytes_are_used_in_place(crif_pdf):
+    source = open_source(crif_pdf)
+    assert source.data.obj is crif_pdf
+    with instrument(log=False) as timings:
+        parse(crif_pdf)
+    assert counts(timings) == (0, 1)
+
+
+def test_source_opened_for_a_call_is_closed(crif_path):
+    with using_source(crif_path) as source:
+        source.document()
+    assert source._document is None and source._mapped is None
+    with PDFSource.from_path(crif_path) as own:
+        with using_source(own) as same:
+            assert same is own
+        assert own._mapped is not None  # the caller's source stays open
+
+
+def test_path_and_bytes_give_the_same_report_and_cache_key(crif_path, crif_pdf):
+    cache = ReportCache()
+    from_path = cache.parse(crif_path)
+    assert cache.parse(crif_pdf) is from_path and cache.hits == 1
+    assert from_path["Loan Details"].equals(parse(crif_pdf)["Loan Details"])
+
+
+def test_isolated_worker_gets_the_path_not_the_bytes(crif_path, crif_pdf):
+    with instrument(log=False) as timings:
+        result = parse_isolated(crif_path, timeout=None, max_rss_mb=None)
+    assert result.report is not None and counts(timings)[0] == 0
+    with instrument(log=False) as timings:
+        parse_isolated(crif_pdf, timeout=None, max_rss_mb=None)
+    assert counts(timings)[0] == len(crif_pdf)  # in-memory data: one copy through the pipe
+
+
+def test_camelot_reads_the_original_file(commercial_path, commercial_pdf, monkeypatch):
+    camelot = pytest.importorskip("camelot")
+    paths = []
+    read_pdf = camelot.read_pdf
+    monkeypatch.setattr(camelot, "read_pdf", lambda path, **kwargs: paths.append(path) or read_pdf(path, **kwargs))
+    with instrument(log=False) as timings:
+        report = parse(commercial_path, table_engine="camelot")
+    assert paths == [commercial_path] and counts(timings) == (0, 1)
+    assert report["Credit Summary"].shape == parse(commercial_pdf)["Credit Summary"].shape
+
+    # In-memory data is the one case camelot needs a file for: one copy, removed afterwards
+    with instrument(log=False) as timings:
+        parse(commercial_pdf, table_engine="camelot")
+    assert counts(timings) == (len(commercial_pdf), 1)
+    assert paths[1] != commercial_path and not os.path.exists(paths[1])